@@ -1,27 +1,75 @@
+import sys
+
+import click
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, jsonify, make_response, Response, request, stream_with_context
+from flask.logging import default_handler
 from werkzeug.exceptions import BadRequest, Unauthorized
 # from flask_cors import CORS
 
 from config import ProductionConfig
-from meal_max.db import db
+from meal_max.clients.mongo_client import mongo_client
+from meal_max.clients.cache_client import cache_client
+from meal_max.db import configure_sqlite, db
 from meal_max.models.battle_model import BattleModel
-from meal_max.models.kitchen_model import Meals
+from meal_max.models.kitchen_model import Meals, upgrade_meals_schema
+from meal_max.models.leaderboard_model import LeaderboardSnapshot
+from meal_max.models.meal_stats_model import MealStats, start_stats_reconciler
 from meal_max.models.mongo_session_model import login_user, logout_user
 from meal_max.models.user_model import Users
+from meal_max.utils.export_utils import EXPORT_FORMATS, export_meals
+from meal_max.utils.logger import configure_logger, set_log_level, set_sample_rate
+from meal_max.utils.query_profiler import QueryProfiler
 
 # Load environment variables from .env file
 load_dotenv()
 
-def create_app(config_class=ProductionConfig):
+def create_app(config_class=ProductionConfig, background_tasks: bool = True):
+    """
+    Build the meal_max app.
+
+    Args:
+        config_class (type, optional): The configuration object. Defaults to ProductionConfig.
+        background_tasks (bool, optional): Whether to start the background threads now.
+            A pre-forking server passes False and calls `start_background_tasks` in
+            each worker instead, since threads do not survive fork.
+
+    Returns:
+        Flask: The configured app.
+    """
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Route app.logger through the shared background log writer
+    app.logger.removeHandler(default_handler)
+    configure_logger(app.logger)
+    set_log_level(app.config.get('LOG_LEVEL', 'DEBUG'))
+    if 'LOG_SAMPLE_RATE' in app.config:
+        set_sample_rate(app.config['LOG_SAMPLE_RATE'])
+
     db.init_app(app)  # Initialize db with app
+    cache_client.init_app(app)
     with app.app_context():
+        configure_sqlite(db.engine, app.config.get('SQLITE_PRAGMAS', {}))
         db.create_all()  # Recreate all tables
+        upgrade_meals_schema()  # create_all leaves existing tables as they are
 
-    battle_model = BattleModel()
+    query_profiler = None
+    if app.config.get('SQL_PROFILING'):
+        query_profiler = QueryProfiler(
+            slow_query_ms=app.config.get('SQL_SLOW_QUERY_MS', 50.0),
+            n_plus_one_threshold=app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 3)
+        )
+        with app.app_context():
+            query_profiler.init_app(app, db.engine)
+
+    battle_model = BattleModel(ttl=app.config.get('COMBATANT_TTL', 60))
+    app.extensions['battle_model'] = battle_model
+    leaderboard_snapshot = LeaderboardSnapshot(max_staleness=app.config.get('LEADERBOARD_MAX_STALENESS', 0))
+    app.extensions['leaderboard_snapshot'] = leaderboard_snapshot
+
+    if background_tasks:
+        start_background_tasks(app)
 
     ####################################################
     #
@@ -287,7 +335,7 @@ def create_app(config_class=ProductionConfig):
     @app.route('/api/get-meal-by-id/<int:meal_id>', methods=['GET'])
     def get_meal_by_id(meal_id: int) -> Response:
         """
-        Route to get a meal by its ID.
+        Route to get a meal by its ID. The serialized response is cached until the meal changes.
 
         Path Parameter:
             - meal_id (int): The ID of the meal.
@@ -298,8 +346,15 @@ def create_app(config_class=ProductionConfig):
         try:
             app.logger.info(f"Retrieving meal by ID: {meal_id}")
 
+            version = Meals.get_meal_version(meal_id)
+            cached = Meals.get_cached_response(meal_id, version)
+            if cached:
+                return Response(cached, status=200, mimetype='application/json')
+
             meal = Meals.get_meal_by_id(meal_id)
-            return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+            response = make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+            Meals.cache_response(meal, response.get_data(), version)
+            return response
         except Exception as e:
             app.logger.error(f"Error retrieving meal by ID: {e}")
             return make_response(jsonify({'error': str(e)}), 500)
@@ -308,7 +363,7 @@ def create_app(config_class=ProductionConfig):
     @app.route('/api/get-meal-by-name/<string:meal_name>', methods=['GET'])
     def get_meal_by_name(meal_name: str) -> Response:
         """
-        Route to get a meal by its name.
+        Route to get a meal by its name. The serialized response is cached until the meal changes.
 
         Path Parameter:
             - meal_name (str): The name of the meal.
@@ -322,13 +377,111 @@ def create_app(config_class=ProductionConfig):
             if not meal_name:
                 return make_response(jsonify({'error': 'Meal name is required'}), 400)
 
-            meal = Meals.get_meal_by_name(meal_name)
-            return make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+            meal_id = Meals.get_meal_id(meal_name)
+            version = Meals.get_meal_version(meal_id)
+            cached = Meals.get_cached_response(meal_id, version)
+            if cached:
+                return Response(cached, status=200, mimetype='application/json')
+
+            meal = Meals.get_meal_by_id(meal_id, meal_name)
+            response = make_response(jsonify({'status': 'success', 'meal': meal}), 200)
+            Meals.cache_response(meal, response.get_data(), version)
+            return response
         except Exception as e:
             app.logger.error(f"Error retrieving meal by name: {e}")
             return make_response(jsonify({'error': str(e)}), 500)
 
 
+    @app.route('/api/search-meals', methods=['GET'])
+    def search_meals() -> Response:
+        """
+        Route to search meals by name and cuisine. Every term is matched as a prefix.
+
+        Query Parameters:
+            - q (str): The search text.
+            - limit (int): The maximum number of results. Default is 20.
+
+        Returns:
+            JSON response with the matching meals, best match first.
+        Raises:
+            400 error if the query is missing or invalid.
+            500 error if there is an issue searching the meals.
+        """
+        try:
+            query = request.args.get('q', '').strip()
+            limit = request.args.get('limit', 20, type=int)
+            app.logger.info("Searching meals for: %s", query)
+
+            if not query:
+                return make_response(jsonify({'error': 'Search query is required'}), 400)
+
+            try:
+                meals = Meals.search_meals(query, limit)
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 400)
+
+            return make_response(jsonify({'status': 'success', 'meals': meals}), 200)
+        except Exception as e:
+            app.logger.error(f"Error searching meals: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
+    @app.route('/api/meals', methods=['GET'])
+    def list_meals() -> Response:
+        """
+        Route to list one page of the meal catalog, cheapest first.
+
+        Pages are cached until the next meal write and tagged with an ETag, so a
+        client revalidating with If-None-Match gets a 304 without a page read.
+
+        Query Parameters:
+            - cuisine (str): Only include meals of this cuisine.
+            - difficulty (str): Only include meals of this difficulty ('LOW', 'MED', 'HIGH').
+            - min_price (float): Only include meals costing at least this much.
+            - max_price (float): Only include meals costing at most this much.
+            - page (int): The page number. Default is 1.
+            - per_page (int): The number of meals per page. Default is 20, at most 100.
+
+        Returns:
+            JSON response with the page of meals and the total number of matching meals,
+            or an empty 304 response if the client's copy is current.
+        Raises:
+            400 error if a parameter is invalid.
+            500 error if there is an issue listing the meals.
+        """
+        try:
+            params = {
+                'cuisine': request.args.get('cuisine'),
+                'difficulty': request.args.get('difficulty'),
+                'min_price': request.args.get('min_price', type=float),
+                'max_price': request.args.get('max_price', type=float),
+                'page': request.args.get('page', 1, type=int),
+                'per_page': request.args.get('per_page', 20, type=int)
+            }
+            app.logger.info("Listing meals: %s", params)
+
+            etag = Meals.catalog_etag(**params)
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                payload = Meals.get_cached_page(etag)
+                if payload is None:
+                    try:
+                        page = Meals.list_meals(**params)
+                    except ValueError as e:
+                        return make_response(jsonify({'error': str(e)}), 400)
+                    payload = jsonify({'status': 'success', **page}).get_data()
+                    Meals.cache_page(etag, payload)
+                response = Response(payload, status=200, mimetype='application/json')
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        except Exception as e:
+            app.logger.error(f"Error listing meals: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+
     @app.route('/api/init-db', methods=['POST'])
     def init_db():
         """
@@ -383,6 +536,35 @@ def create_app(config_class=ProductionConfig):
             app.logger.error(f"Battle error: {e}")
             return make_response(jsonify({'error': str(e)}), 500)
 
+    @app.route('/api/apply-results', methods=['POST'])
+    def apply_results() -> Response:
+        """
+        Route to apply a batch of battle results, e.g. from an offline simulation.
+
+        Expected JSON Input:
+            - results (list): Objects with 'winner_id' and 'loser_id'.
+
+        Returns:
+            JSON response with the number of results applied and meals updated.
+        Raises:
+            400 error if the batch is malformed or references a missing meal.
+            500 error if there is an issue applying the results.
+        """
+        try:
+            data = request.get_json(silent=True)
+            if not data or not isinstance(data.get('results'), list):
+                return make_response(jsonify({'error': 'A list of results is required'}), 400)
+
+            app.logger.info("Applying %d battle results", len(data['results']))
+            try:
+                applied = Meals.apply_results(data['results'])
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 400)
+            return make_response(jsonify({'status': 'results applied', **applied}), 200)
+        except Exception as e:
+            app.logger.error("Failed to apply results: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 500)
+
     @app.route('/api/clear-combatants', methods=['POST'])
     def clear_combatants() -> Response:
         """
@@ -418,6 +600,17 @@ def create_app(config_class=ProductionConfig):
             app.logger.error("Failed to get combatants: %s", str(e))
             return make_response(jsonify({'error': str(e)}), 500)
 
+    @app.route('/api/combatant-cache-stats', methods=['GET'])
+    def get_combatant_cache_stats() -> Response:
+        """
+        Route to get the combatant cache refresh counters.
+
+        Returns:
+            JSON response with the number of change events received and refreshes by cause.
+        """
+        app.logger.info('Getting combatant cache stats...')
+        return make_response(jsonify({'status': 'success', 'stats': battle_model.refresh_counts}), 200)
+
     @app.route('/api/prep-combatant', methods=['POST'])
     def prep_combatant() -> Response:
         """
@@ -467,11 +660,14 @@ def create_app(config_class=ProductionConfig):
         """
         Route to get the leaderboard of meals sorted by wins, battles, or win percentage.
 
+        The leaderboard is served from a snapshot at most LEADERBOARD_MAX_STALENESS
+        seconds old, so reads do not wait on battles being written.
+
         Query Parameters:
-            - sort (str): The field to sort by ('wins', 'battles', or 'win_pct'). Default is 'wins'.
+            - sort (str): The field to sort by ('wins', 'win_pct', or 'elo'). Default is 'wins'.
 
         Returns:
-            JSON response with a sorted leaderboard of meals.
+            JSON response with a sorted leaderboard of meals and the snapshot age in seconds.
         Raises:
             500 error if there is an issue generating the leaderboard.
         """
@@ -479,16 +675,199 @@ def create_app(config_class=ProductionConfig):
             sort_by = request.args.get('sort', 'wins')  # Default sort by wins
             app.logger.info("Generating leaderboard sorted by %s", sort_by)
 
-            leaderboard_data = Meals.get_leaderboard(sort_by)
+            leaderboard_data, snapshot_age = leaderboard_snapshot.get(sort_by)
 
-            return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
+            return make_response(jsonify({
+                'status': 'success',
+                'leaderboard': leaderboard_data,
+                'snapshot_age_s': round(snapshot_age, 3)
+            }), 200)
         except Exception as e:
             app.logger.error(f"Error generating leaderboard: {e}")
             return make_response(jsonify({'error': str(e)}), 500)
 
+    @app.route('/api/stats/cuisines', methods=['GET'])
+    def get_cuisine_stats() -> Response:
+        """
+        Route to get battles, wins and average price grouped by cuisine or difficulty.
+
+        Query Parameters:
+            - by (str): The field to group by ('cuisine' or 'difficulty'). Default is 'cuisine'.
+
+        Returns:
+            JSON response with the aggregated stats.
+        Raises:
+            400 error if the grouping field is invalid.
+            500 error if there is an issue retrieving the stats.
+        """
+        try:
+            dimension = request.args.get('by', 'cuisine')
+            app.logger.info("Retrieving meal stats by %s", dimension)
+
+            try:
+                stats = MealStats.get_stats(dimension)
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 400)
+
+            return make_response(jsonify({'status': 'success', 'stats': stats}), 200)
+        except Exception as e:
+            app.logger.error(f"Error retrieving meal stats: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+    @app.cli.command('recompute-elo')
+    @click.option('--k-factor', type=float, default=None, help='Defaults to ELO_K_FACTOR.')
+    def recompute_elo_command(k_factor):
+        """Rebuild every meal's Elo rating from the battle history."""
+        Meals.recompute_ratings(k_factor)
+
+    @app.cli.command('tune-elo')
+    @click.option('--k-factor', 'k_factors', type=float, multiple=True, default=(8, 16, 24, 32, 48, 64))
+    def tune_elo_command(k_factors):
+        """Print the log loss of each candidate K-factor over the battle history."""
+        for k_factor, log_loss in sorted(Meals.tune_k_factor(list(k_factors)).items(), key=lambda item: item[1]):
+            click.echo(f"K={k_factor:g}\tlog_loss={log_loss:.4f}")
+
+    @app.cli.command('archive-meals')
+    @click.option('--retention-days', type=int, default=None, help='Defaults to MEAL_ARCHIVE_RETENTION_DAYS.')
+    @click.option('--batch-size', type=int, default=500, show_default=True)
+    def archive_meals_command(retention_days, batch_size):
+        """Move soft-deleted meals past the retention window into meals_archive."""
+        if retention_days is None:
+            retention_days = app.config['MEAL_ARCHIVE_RETENTION_DAYS']
+        archived = Meals.archive_deleted_meals(retention_days, batch_size)
+        click.echo(f"Archived {archived} meals")
+
+    ############################################################
+    #
+    # Export
+    #
+    ############################################################
+
+    def parse_deleted_filter(value: str):
+        """Map the 'deleted' export filter ('false', 'true' or 'all') to Meals.iter_meal_batches."""
+        if value not in ('false', 'true', 'all'):
+            raise ValueError(f"Invalid deleted filter: {value}. Must be 'false', 'true' or 'all'.")
+        return None if value == 'all' else value == 'true'
+
+    @app.route('/api/export/meals', methods=['GET'])
+    def export_meals_route() -> Response:
+        """
+        Route to stream every meal, including unbattled ones, for analytics.
+
+        Query Parameters:
+            - format (str): 'csv', 'ndjson' or 'parquet' (requires pyarrow). Default is 'csv'.
+            - deleted (str): 'false' (default), 'true' or 'all'.
+            - min_battles (int): Only export meals with at least this many battles. Default is 0.
+
+        Returns:
+            A streamed response with the exported meals.
+        Raises:
+            400 error if a parameter is invalid.
+            500 error if there is an issue starting the export.
+        """
+        try:
+            fmt = request.args.get('format', 'csv')
+            min_battles = request.args.get('min_battles', 0, type=int)
+            app.logger.info("Exporting meals as %s", fmt)
+
+            try:
+                deleted = parse_deleted_filter(request.args.get('deleted', 'false'))
+                chunks = export_meals(fmt, deleted=deleted, min_battles=min_battles)
+                first_chunk = next(chunks, b'')  # Surface parameter errors before streaming starts
+            except ValueError as e:
+                return make_response(jsonify({'error': str(e)}), 400)
+
+            def generate():
+                yield first_chunk
+                yield from chunks
+
+            response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+            response.headers['Content-Disposition'] = f'attachment; filename=meals.{fmt}'
+            return response
+        except Exception as e:
+            app.logger.error(f"Error exporting meals: {e}")
+            return make_response(jsonify({'error': str(e)}), 500)
+
+    @app.cli.command('export-meals')
+    @click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='csv')
+    @click.option('--deleted', type=click.Choice(['false', 'true', 'all']), default='false')
+    @click.option('--min-battles', type=int, default=0)
+    @click.option('--output', type=click.Path(dir_okay=False), default=None, help='Defaults to stdout.')
+    def export_meals_command(fmt, deleted, min_battles, output):
+        """Export the meals table as CSV, NDJSON or Parquet."""
+        chunks = export_meals(fmt, deleted=parse_deleted_filter(deleted), min_battles=min_battles)
+        fh = open(output, 'wb') if output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                fh.write(chunk)
+        finally:
+            if output:
+                fh.close()
+
+    ############################################################
+    #
+    # Debug
+    #
+    ############################################################
+
+    if query_profiler is not None:
+        @app.route('/api/debug/queries', methods=['GET', 'DELETE'])
+        def debug_queries() -> Response:
+            """
+            Route to view (GET) or reset (DELETE) the recorded per-request SQL profiles.
+
+            Only registered when SQL_PROFILING is enabled.
+
+            Returns:
+                JSON response with the most recent request profiles, newest first.
+            """
+            if request.method == 'DELETE':
+                query_profiler.clear()
+                return make_response(jsonify({'status': 'profiles cleared'}), 200)
+            return make_response(jsonify({'status': 'success', 'requests': query_profiler.get_profiles()}), 200)
+
     return app
 
 
+def start_background_tasks(app: Flask) -> None:
+    """
+    Start the background threads of an app built by `create_app`.
+
+    These are the meal stats reconciler, the combatant cache subscriber and
+    the leaderboard snapshot refresher.
+
+    Args:
+        app (Flask): The app whose background threads to start.
+    """
+    if app.config.get('STATS_RECONCILE_INTERVAL'):
+        start_stats_reconciler(app, app.config['STATS_RECONCILE_INTERVAL'])
+    if app.config.get('COMBATANT_PUBSUB'):
+        app.extensions['battle_model'].subscribe(cache_client)
+    if app.config.get('LEADERBOARD_MAX_STALENESS'):
+        app.extensions['leaderboard_snapshot'].start_refresher(app)
+
+def shutdown_app(app: Flask) -> None:
+    """
+    Release an app's connections when its process is about to exit.
+
+    Stops the combatant cache subscriber and the leaderboard refresher, and
+    closes the cache, MongoDB and database connection pools. Cache and session
+    writes are synchronous, so nothing else is buffered in the process; queued
+    log records are flushed by the log writer at interpreter exit.
+
+    Args:
+        app (Flask): The app to shut down.
+    """
+    app.extensions['battle_model'].unsubscribe()
+    app.extensions['leaderboard_snapshot'].stop_refresher()
+    cache_client.close()
+    mongo_client.close()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    app.logger.info("Connections closed for shutdown")
+
+
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
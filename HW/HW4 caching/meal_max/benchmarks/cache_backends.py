@@ -0,0 +1,119 @@
+"""
+Per-call cost of the Redis and in-process cache backends.
+
+Times the raw cache calls the models make (get, hgetall, hset and a
+three-command pipeline) and the cached read paths built on them
+(Meals.get_meal_by_id on a cache hit and a cached leaderboard), and reports
+microseconds per call for each backend as JSON.
+
+Without --redis-url the Redis backend is served by fakeredis, which runs in
+process and so has no network hop: its numbers are a lower bound for a real
+Redis server.
+
+Usage:
+    python benchmarks/cache_backends.py --iterations 20000 --redis-url redis://localhost:6379/0
+
+Requires the packages in benchmarks/requirements.txt.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_test import FakeRedisCache  # noqa: E402
+from app import create_app  # noqa: E402
+from config import TestConfig  # noqa: E402
+from meal_max.clients.cache_backends import RedisCache  # noqa: E402
+from meal_max.clients.cache_client import cache_client  # noqa: E402
+from meal_max.db import db  # noqa: E402
+from meal_max.models.kitchen_model import Meals  # noqa: E402
+
+
+MEAL_HASH = {"id": "1", "meal": "Spaghetti", "cuisine": "Italian", "price": "12.5",
+             "difficulty": "MED", "battles": "10", "wins": "7", "deleted": "False"}
+
+
+def time_calls(call, iterations: int) -> float:
+    """
+    Times repeated calls.
+
+    Args:
+        call (Callable): The call to time.
+        iterations (int): The number of calls.
+
+    Returns:
+        float: Microseconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def bench_raw(iterations: int) -> dict[str, float]:
+    cache_client.set("bench:key", "value")
+    cache_client.hset("bench:hash", mapping=MEAL_HASH)
+
+    def pipeline():
+        pipe = cache_client.pipeline()
+        pipe.set("bench:a", "1")
+        pipe.set("bench:b", "2")
+        pipe.unlink("bench:c")
+        pipe.execute()
+
+    return {
+        "get_us": time_calls(lambda: cache_client.get("bench:key"), iterations),
+        "hgetall_us": time_calls(lambda: cache_client.hgetall("bench:hash"), iterations),
+        "hset_us": time_calls(lambda: cache_client.hset("bench:hash", mapping=MEAL_HASH), iterations),
+        "pipeline_us": time_calls(pipeline, iterations),
+    }
+
+def bench_models(app, iterations: int) -> dict[str, float]:
+    with app.app_context():
+        for i in range(50):
+            Meals.create_meal(f"Meal {i}", "Italian", 10 + i, "MED", battles=10, wins=i % 10)
+        Meals.get_meal_by_id(1)
+        Meals.get_leaderboard()
+        return {
+            "get_meal_by_id_hit_us": time_calls(lambda: Meals.get_meal_by_id(1), iterations),
+            "leaderboard_hit_us": time_calls(lambda: Meals.get_leaderboard(), iterations),
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--redis-url", default=None, help="Benchmark a real Redis server instead of fakeredis")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    redis_backend = RedisCache.from_url(args.redis_url) if args.redis_url else FakeRedisCache()
+    report = {"iterations": args.iterations, "redis": "server" if args.redis_url else "fakeredis", "backends": {}}
+
+    for name in ("memory", "redis"):
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                mock.patch("meal_max.clients.cache_client.redis_client", redis_backend):
+            config = type("BenchConfig", (TestConfig,), {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+                "CACHE_BACKEND": name,
+            })
+            app = create_app(config)
+            cache_client.flushall()
+            results = bench_raw(args.iterations)
+            results.update(bench_models(app, args.iterations))
+            cache_client.flushall()
+            with app.app_context():
+                db.engine.dispose()
+        report["backends"][name] = {key: round(value, 2) for key, value in results.items()}
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
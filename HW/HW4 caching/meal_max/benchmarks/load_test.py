@@ -0,0 +1,249 @@
+"""
+Offline load test for the meal_max service.
+
+Drives create_app() through Flask test clients under configurable concurrency,
+with fakeredis (or the in-process cache backend), mongomock and a local random
+source standing in for Redis, MongoDB and random.org, and reports per-route
+latency percentiles and throughput as JSON.
+
+The app has one BattleModel shared by every client, so operations that change
+the combatants (prep, battle, login) hold a lock while they run. Each battle
+preps its own two combatants, untimed, first, so battles exercise the real
+battle path, and any error response counts as a failure.
+
+Usage:
+    python benchmarks/load_test.py --requests 5000 --concurrency 8 --output bench.json
+
+Requires the packages in benchmarks/requirements.txt.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import fakeredis
+import mongomock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import ProductionConfig, TestConfig  # noqa: E402
+from meal_max.clients.cache_backends import RedisCache  # noqa: E402
+from meal_max.db import db  # noqa: E402
+
+
+CUISINES = ["Italian", "Mexican", "Chinese", "Indian", "French", "Thai", "Greek", "Japanese"]
+DIFFICULTIES = ["LOW", "MED", "HIGH"]
+
+# Relative weights of each operation in the replayed traffic
+DEFAULT_MIX = {"create": 1, "prep": 3, "battle": 2, "leaderboard": 3, "login": 1}
+
+
+class FakeRedisCache(fakeredis.FakeStrictRedis, RedisCache):
+    """The Redis cache backend over fakeredis."""
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """
+    Computes a percentile of a list of samples by nearest rank.
+
+    Args:
+        samples (list[float]): The samples.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0.0 for no samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+class LoadTest:
+    """
+    Replays a weighted mix of meal_max operations against an app with local stand-ins.
+
+    Attributes:
+        concurrency (int): The number of concurrent client threads.
+        mix (dict[str, int]): The relative weight of each operation.
+        meals (int): The number of meals seeded before the run.
+        seed (int): The seed for the traffic and the random source.
+        cache_backend (str): 'redis' (served by fakeredis) or 'memory'.
+        leaderboard_staleness (float): The leaderboard snapshot's maximum staleness in seconds.
+    """
+
+    def __init__(self, concurrency: int = 4, mix: dict[str, int] = None, meals: int = 200, seed: int = 42,
+                 cache_backend: str = "redis", leaderboard_staleness: float = ProductionConfig.LEADERBOARD_MAX_STALENESS):
+        self.concurrency = concurrency
+        self.mix = mix or DEFAULT_MIX
+        self.meals = meals
+        self.seed = seed
+        self.cache_backend = cache_backend
+        self.leaderboard_staleness = leaderboard_staleness
+        self._created = 0
+        self._lock = threading.Lock()
+        self._arena_lock = threading.Lock()  # Serializes operations on the shared combatants
+
+    def run(self, total_requests: int) -> dict:
+        """
+        Runs the load test.
+
+        Args:
+            total_requests (int): The number of requests to send across all threads.
+
+        Returns:
+            dict: Per-route latency percentiles (ms), request counts, errors and requests/sec.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir, self._stand_ins():
+            config = type("LoadTestConfig", (TestConfig,), {
+                "TESTING": False,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+                "CACHE_BACKEND": self.cache_backend,
+                "SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+                "LEADERBOARD_MAX_STALENESS": self.leaderboard_staleness,
+            })
+            app = create_app(config)
+            self._seed(app)
+
+            rng = random.Random(self.seed)
+            operations = rng.choices(list(self.mix), weights=list(self.mix.values()), k=total_requests)
+            chunks = [operations[i::self.concurrency] for i in range(self.concurrency)]
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                results = list(pool.map(lambda args: self._worker(app, *args), enumerate(chunks)))
+            elapsed = time.perf_counter() - start
+
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+        routes: dict[str, dict] = {}
+        for worker_results in results:
+            for operation, latency, ok in worker_results:
+                route = routes.setdefault(operation, {"latencies": [], "errors": 0})
+                route["latencies"].append(latency)
+                route["errors"] += 0 if ok else 1
+
+        report = {
+            "cache_backend": self.cache_backend,
+            "leaderboard_staleness_s": self.leaderboard_staleness,
+            "concurrency": self.concurrency,
+            "requests": total_requests,
+            "elapsed_s": round(elapsed, 3),
+            "requests_per_sec": round(total_requests / elapsed, 1),
+            "routes": {}
+        }
+        for operation, route in sorted(routes.items()):
+            latencies = route["latencies"]
+            report["routes"][operation] = {
+                "requests": len(latencies),
+                "errors": route["errors"],
+                "requests_per_sec": round(len(latencies) / elapsed, 1),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+            }
+        return report
+
+    @contextmanager
+    def _stand_ins(self):
+        """Patch Redis, MongoDB and random.org with local implementations."""
+        sessions = mongomock.MongoClient()["meal_max"]["sessions"]
+        rng = random.Random(self.seed)
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch("meal_max.clients.cache_client.redis_client", FakeRedisCache()))
+            stack.enter_context(mock.patch("meal_max.models.mongo_session_model.sessions_collection", sessions))
+            stack.enter_context(mock.patch("meal_max.models.battle_model.get_random", lambda: round(rng.random(), 2)))
+            yield
+
+    def _seed(self, app) -> None:
+        """Create the benchmark user and the initial meals."""
+        client = app.test_client()
+        client.post("/api/create-user", json={"username": "bench", "password": "bench"})
+        for _ in range(self.meals):
+            self._create_meal(client)
+
+    def _create_meal(self, client):
+        with self._lock:
+            self._created += 1
+            number = self._created
+        return client.post("/api/create-meal", json={
+            "meal": f"Meal {number}",
+            "cuisine": CUISINES[number % len(CUISINES)],
+            "price": round(5 + (number * 7919) % 2000 / 100, 2),
+            "difficulty": DIFFICULTIES[number % len(DIFFICULTIES)],
+        })
+
+    def _worker(self, app, worker_id: int, operations: list[str]) -> list[tuple[str, float, bool]]:
+        client = app.test_client()
+        rng = random.Random(self.seed + worker_id + 1)
+        results = []
+        for operation in operations:
+            start = time.perf_counter()
+            if operation == "create":
+                response = self._create_meal(client)
+            elif operation == "leaderboard":
+                response = client.get(f"/api/leaderboard?sort={rng.choice(['wins', 'win_pct', 'elo'])}")
+            else:
+                with self._arena_lock:
+                    if operation == "prep":
+                        if len(client.get("/api/get-combatants").get_json()["combatants"]) >= 2:
+                            client.post("/api/clear-combatants")
+                        start = time.perf_counter()
+                        response = client.post("/api/prep-combatant", json={"meal": f"Meal {rng.randint(1, self.meals)}"})
+                    elif operation == "battle":
+                        client.post("/api/clear-combatants")
+                        for number in rng.sample(range(1, self.meals + 1), 2):
+                            client.post("/api/prep-combatant", json={"meal": f"Meal {number}"})
+                        start = time.perf_counter()
+                        response = client.get("/api/battle")
+                    else:
+                        response = client.post("/api/login", json={"username": "bench", "password": "bench"})
+            latency = (time.perf_counter() - start) * 1000
+            results.append((operation, latency, response.status_code < 400))
+        return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of concurrent clients")
+    parser.add_argument("--meals", type=int, default=200, help="Meals seeded before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", type=json.loads, default=None,
+                        help=f"Operation weights as JSON, default {json.dumps(DEFAULT_MIX)}")
+    parser.add_argument("--cache-backend", choices=["redis", "memory"], default="redis",
+                        help="Cache backend; redis is served by fakeredis")
+    parser.add_argument("--leaderboard-staleness", type=float, default=ProductionConfig.LEADERBOARD_MAX_STALENESS,
+                        help="Maximum leaderboard snapshot age in seconds, 0 to disable snapshots")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="Suppress application logs below WARNING")
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        logging.disable(logging.INFO)
+
+    report = LoadTest(concurrency=args.concurrency, mix=args.mix, meals=args.meals, seed=args.seed,
+                      cache_backend=args.cache_backend, leaderboard_staleness=args.leaderboard_staleness).run(args.requests)
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(report_json + "\n")
+    else:
+        print(report_json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
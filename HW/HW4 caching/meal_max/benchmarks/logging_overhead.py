@@ -0,0 +1,115 @@
+"""
+Per-battle logging overhead of BattleModel.battle().
+
+Runs the same battles with logging disabled, with the previous synchronous
+StreamHandler setup, and with the queue-based writer with and without hot-path
+sampling. Reports microseconds per battle as JSON. Log output goes to /dev/null
+in every mode so only the cost on the calling thread is compared.
+
+Usage:
+    python benchmarks/logging_overhead.py --battles 20000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Send every handler created during import to /dev/null
+_stderr, sys.stderr = sys.stderr, open(os.devnull, "w")
+
+from meal_max.models import battle_model  # noqa: E402
+from meal_max.utils import logger as logging_utils  # noqa: E402
+from meal_max.utils import random_utils  # noqa: E402
+
+
+SAMPLE_MEALS = {
+    1: {"id": 1, "meal": "Spaghetti", "cuisine": "Italian", "price": 12.5, "difficulty": "MED"},
+    2: {"id": 2, "meal": "Pizza", "cuisine": "Italian", "price": 15.0, "difficulty": "LOW"},
+}
+HOT_PATH_LOGGERS = [battle_model.logger, random_utils.logger]
+
+
+def time_battles(battles: int) -> float:
+    """
+    Times a number of battles with the database and random.org stubbed out.
+
+    Args:
+        battles (int): The number of battles to run.
+
+    Returns:
+        float: Microseconds per battle.
+    """
+    model = battle_model.BattleModel(ttl=3600)
+    with mock.patch.object(battle_model.Meals, "record_battle"), \
+            mock.patch.object(battle_model, "get_random", return_value=0.5):
+        start = time.perf_counter()
+        for _ in range(battles):
+            model.combatants = [1, 2]
+            model.meals_cache.update(SAMPLE_MEALS)
+            model.combatant_ttls = {1: time.time() + 3600, 2: time.time() + 3600}
+            model.battle()
+        elapsed = time.perf_counter() - start
+    return elapsed / battles * 1e6
+
+
+def legacy_logging():
+    """Swap the hot-path loggers to the previous setup: one synchronous stderr handler, no sampling."""
+    saved = [(lg, lg.handlers[:], lg.filters[:], lg.level) for lg in HOT_PATH_LOGGERS]
+    for lg in HOT_PATH_LOGGERS:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        lg.handlers, lg.filters = [handler], []
+        lg.setLevel(logging.DEBUG)
+    return saved
+
+
+def restore_logging(saved) -> None:
+    for lg, handlers, filters, level in saved:
+        lg.handlers, lg.filters = handlers, filters
+        lg.setLevel(level)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=10.0, help="Sampled records per second, per statement")
+    args = parser.parse_args(argv)
+
+    # Keep the battles' own stdlib logging from reaching the root logger
+    for lg in HOT_PATH_LOGGERS:
+        lg.propagate = False
+
+    results = {}
+    logging.disable(logging.CRITICAL)
+    results["disabled_us"] = time_battles(args.battles)
+    logging.disable(logging.NOTSET)
+
+    saved = legacy_logging()
+    results["sync_stream_handler_us"] = time_battles(args.battles)
+    restore_logging(saved)
+
+    logging_utils.set_log_level("INFO")
+    logging_utils.set_sample_rate(float("inf"))
+    results["queue_handler_unsampled_us"] = time_battles(args.battles)
+
+    logging_utils.set_sample_rate(args.sample_rate)
+    results["queue_handler_sampled_us"] = time_battles(args.battles)
+
+    report = {"battles": args.battles, "sample_rate": args.sample_rate}
+    report.update({key: round(value, 2) for key, value in results.items()})
+    for key in ("sync_stream_handler_us", "queue_handler_unsampled_us", "queue_handler_sampled_us"):
+        report[key.replace("_us", "_overhead_us")] = round(results[key] - results["disabled_us"], 2)
+
+    sys.stderr = _stderr
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
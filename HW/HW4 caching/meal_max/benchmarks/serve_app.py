@@ -0,0 +1,65 @@
+"""
+The meal_max app with the load test's local stand-ins, for serving over real HTTP.
+
+Used by wsgi_throughput.py to start each server under test:
+
+    python benchmarks/serve_app.py --port 5001                                 # Flask dev server
+    gunicorn -c gunicorn.conf.py --pythonpath benchmarks serve_app:app         # gunicorn
+
+The database file is taken from BENCH_DB and seeded on first use. Every process
+gets its own fakeredis and mongomock, which is fine for the read-only routes the
+throughput benchmark drives.
+"""
+import argparse
+from contextlib import ExitStack
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import LoadTest  # noqa: E402
+from config import TestConfig  # noqa: E402
+
+
+BENCH_DB = os.getenv("BENCH_DB", os.path.join(tempfile.gettempdir(), "meal_max_bench.db"))
+BENCH_MEALS = int(os.getenv("BENCH_MEALS", 200))
+
+
+def build_app():
+    """
+    Builds the app with the stand-ins patched in for the life of the process.
+
+    Returns:
+        Flask: The app, seeded with BENCH_MEALS meals if its database is new.
+    """
+    load_test = LoadTest(meals=BENCH_MEALS)
+    stack = ExitStack()
+    stack.enter_context(load_test._stand_ins())
+
+    from app import create_app
+
+    seed = not os.path.exists(BENCH_DB)
+    config = type("BenchConfig", (TestConfig,), {
+        "TESTING": False,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{BENCH_DB}",
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO"),
+        "CACHE_BACKEND": os.getenv("CACHE_BACKEND", "redis"),
+    })
+    app = create_app(config, background_tasks=False)
+    if seed:
+        load_test._seed(app)
+    app.extensions["bench_stand_ins"] = stack
+    return app
+
+
+app = build_app()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+    # What the Dockerfile ran before: the threaded dev server with the debugger, minus the reloader process
+    app.run(debug=True, use_reloader=False, host="127.0.0.1", port=args.port)
@@ -0,0 +1,168 @@
+"""
+Throughput of the meal_max app under the Flask dev server and under gunicorn.
+
+Starts each server in turn on serve_app.py (the app with local stand-ins for
+Redis, MongoDB and random.org), drives it over HTTP with a read-only mix of
+routes from concurrent clients for a fixed duration, and reports requests/sec
+and latency percentiles per server as JSON.
+
+Usage:
+    python benchmarks/wsgi_throughput.py --duration 10 --concurrency 16 --workers 1 4
+
+Requires gunicorn and the packages in benchmarks/requirements.txt.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from load_test import percentile
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Read-only routes, so every request is valid whichever worker serves it
+ROUTES = [
+    "/api/health",
+    "/api/leaderboard?sort=wins",
+    "/api/get-meal-by-id/{meal_id}",
+    "/api/get-meal-by-name/Meal%20{meal_id}",
+    "/api/search-meals?q=Meal%20{meal_id}",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """
+    Polls the health check until the server answers.
+
+    Raises:
+        RuntimeError: If the server exits or does not answer within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become healthy in time")
+
+def drive(base_url: str, duration: float, concurrency: int, meals: int, seed: int) -> dict:
+    """
+    Sends requests from concurrent clients until the duration elapses.
+
+    Args:
+        base_url (str): The server's base URL.
+        duration (float): Seconds to drive the server.
+        concurrency (int): The number of concurrent clients, each with a keep-alive session.
+        meals (int): The number of seeded meals to pick from.
+        seed (int): The seed for the route and meal choices.
+
+    Returns:
+        dict: Request and error counts, requests/sec and latency percentiles (ms).
+    """
+    def client(worker_id: int) -> tuple[list[float], int]:
+        rng = random.Random(seed + worker_id)
+        latencies, errors = [], 0
+        with requests.Session() as session:
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                path = rng.choice(ROUTES).format(meal_id=rng.randint(1, meals))
+                start = time.perf_counter()
+                try:
+                    ok = session.get(base_url + path, timeout=10).status_code < 400
+                except requests.RequestException:
+                    ok = False
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += 0 if ok else 1
+        return latencies, errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+
+    latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "requests_per_sec": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+def run_server(name: str, command: list[str], env: dict, args) -> dict:
+    """Starts one server, drives it, and stops it with SIGTERM."""
+    port = env["PORT"]
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_healthy(base_url, process)
+        drive(base_url, min(2.0, args.duration), args.concurrency, args.meals, args.seed)  # Warm up
+        result = drive(base_url, args.duration, args.concurrency, args.meals, args.seed)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+    print(f"{name}: {result['requests_per_sec']} req/s", file=sys.stderr)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive each server")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent clients")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="gunicorn worker counts to compare")
+    parser.add_argument("--threads", type=int, default=None, help="gunicorn threads per worker (default from gunicorn.conf.py)")
+    parser.add_argument("--meals", type=int, default=200, help="Meals seeded before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {"duration_s": args.duration, "concurrency": args.concurrency, "servers": {}}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = dict(os.environ, BENCH_DB=os.path.join(tmpdir, "bench.db"), BENCH_MEALS=str(args.meals))
+
+        port = str(free_port())
+        report["servers"]["flask_dev_server"] = run_server(
+            "flask_dev_server",
+            [sys.executable, "benchmarks/serve_app.py", "--port", port],
+            dict(env, PORT=port), args
+        )
+        for workers in args.workers:
+            port = str(free_port())
+            server_env = dict(env, PORT=port, GUNICORN_WORKERS=str(workers))
+            if args.threads:
+                server_env["GUNICORN_THREADS"] = str(args.threads)
+            name = f"gunicorn_{workers}_workers"
+            report["servers"][name] = run_server(
+                name,
+                [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--pythonpath", "benchmarks", "serve_app:app"],
+                server_env, args
+            )
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(report_json + "\n")
+    else:
+        print(report_json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,37 @@ class ProductionConfig():
                                            # But we are doing unnecessarily complicated Redis
                                            # write-throughs
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "DATABASE_URL=sqlite:////app/db/app.db")  # Production database URI from environment
+    STATS_RECONCILE_INTERVAL = int(os.getenv('STATS_RECONCILE_INTERVAL', 300))  # Seconds between stats reconciliations, 0 disables
+    COMBATANT_TTL = int(os.getenv('TTL', 600))  # Safety net only; changes are pushed over Redis pub/sub
+    COMBATANT_PUBSUB = True
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 10))  # Hot-path log lines per second, per statement
+    SQL_PROFILING = os.getenv('SQL_PROFILING', 'false').lower() == 'true'  # Record per-request SQL at /api/debug/queries
+    SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', 50))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 3))
+    MEAL_ARCHIVE_RETENTION_DAYS = int(os.getenv('MEAL_ARCHIVE_RETENTION_DAYS', 30))  # Used by `flask archive-meals`
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis')  # 'redis', or 'memory' for a single process
+    # WAL lets leaderboard reads proceed while battles commit; writers wait up to the busy timeout
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KB', 16384)),
+        'temp_store': 'MEMORY',
+    }
+    LEADERBOARD_MAX_STALENESS = float(os.getenv('LEADERBOARD_MAX_STALENESS', 5))  # Seconds; 0 reads the database every time
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    STATS_RECONCILE_INTERVAL = 0  # Tests reconcile explicitly
+    COMBATANT_TTL = 60
+    COMBATANT_PUBSUB = False  # No Redis server in tests
+    LOG_LEVEL = 'DEBUG'
+    SQL_PROFILING = False
+    MEAL_ARCHIVE_RETENTION_DAYS = 30
+    CACHE_BACKEND = 'memory'  # No Redis server in tests
+    SQLITE_PRAGMAS = {'busy_timeout': 5000}
+    LEADERBOARD_MAX_STALENESS = 0  # Tests read the leaderboard right after writing
@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for meal_max, loaded automatically from the working directory.
+
+    gunicorn wsgi:app
+
+The app is imported once in the master (`preload_app`) and forked into the
+workers, which then reinitialize everything that must not be shared across
+processes. Sizing and timeouts are read from the environment.
+"""
+import multiprocessing
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Combatants live in each worker's BattleModel, so a battle has to be served by the
+# worker that prepped its combatants. Scale with threads, and only raise the worker
+# count for read-heavy traffic or behind sticky routing.
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 2 * multiprocessing.cpu_count()))
+worker_class = 'gthread'
+
+if os.getenv('CACHE_BACKEND', 'redis') == 'memory' and workers > 1:
+    raise RuntimeError("CACHE_BACKEND=memory keeps a separate cache in each worker; use one worker or the redis backend")
+
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))  # Time for in-flight requests on shutdown
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG')  # e.g. '-' for stdout; unset disables
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def post_fork(server, worker):
+    """
+    Reinitialize the clients and background threads a worker inherits from the master.
+
+    Threads (the log writer, the stats reconciler and the combatant subscriber)
+    do not survive fork, and pooled connections opened by the master must not be
+    shared, so the worker restarts the former and drops its references to the latter.
+    The MongoDB client connects lazily and has not connected in the master.
+    """
+    from app import start_background_tasks
+    from meal_max.clients.cache_client import cache_client
+    from meal_max.db import db
+    from meal_max.utils.logger import restart_log_writer
+
+    restart_log_writer()
+    cache_client.after_fork()
+
+    app = server.app.wsgi()
+    with app.app_context():
+        # Leave the master's connections open for the master
+        db.engine.dispose(close=False)
+    start_background_tasks(app)
+
+
+def worker_exit(server, worker):
+    """
+    Close the worker's connections once it has finished its in-flight requests.
+    """
+    from app import shutdown_app
+
+    shutdown_app(server.app.wsgi())
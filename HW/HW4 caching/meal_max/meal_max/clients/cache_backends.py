@@ -0,0 +1,298 @@
+from abc import ABC, abstractmethod
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import redis
+
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CacheBackend(ABC):
+    """
+    The subset of the Redis client API that meal_max uses for caching and change events.
+
+    Values are returned as bytes, and hash fields as a dict of bytes to bytes,
+    whichever backend is in use.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        pass
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        pass
+
+    @abstractmethod
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        pass
+
+    @abstractmethod
+    def hset(self, key: str, mapping: dict) -> int:
+        pass
+
+    @abstractmethod
+    def delete(self, *keys: str) -> int:
+        pass
+
+    @abstractmethod
+    def unlink(self, *keys: str) -> int:
+        pass
+
+    @abstractmethod
+    def publish(self, channel: str, message: Any) -> int:
+        pass
+
+    @abstractmethod
+    def pipeline(self):
+        """Returns a pipeline that queues the calls above until `execute()`."""
+
+    @abstractmethod
+    def pubsub(self, ignore_subscribe_messages: bool = False):
+        """Returns a pub/sub object supporting `subscribe(**handlers)` and `run_in_thread()`."""
+
+    @abstractmethod
+    def after_fork(self) -> None:
+        """Drops any state that must not be shared with the parent of a forked process."""
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class RedisCache(redis.StrictRedis, CacheBackend):
+    """
+    The Redis backend: a Redis client, shared by every process that points at the server.
+    """
+
+    def after_fork(self) -> None:
+        self.connection_pool.reset()
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a value the way the Redis client does before sending it."""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    return str(value).encode()
+
+
+class MemoryCache(CacheBackend):
+    """
+    An in-process, thread-safe backend for single-process deployments and tests.
+
+    Every call takes one lock, and a pipeline applies its queued calls under a
+    single acquisition. Expired keys are dropped when they are next read.
+    Pub/sub messages are delivered to subscribers of the same process only.
+
+    Attributes:
+        hits (int): Reads that found a live key.
+        misses (int): Reads that found no key.
+    """
+
+    def __init__(self):
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+        self._subscribers: dict[str, list["_MemoryPubSub"]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: str) -> Any:
+        key = _encode(key).decode()
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._lookup(key)
+            return value if isinstance(value, bytes) else None
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._lookup(key) is not None:
+                return None
+            key = _encode(key).decode()
+            self._data[key] = _encode(value)
+            if ex is None:
+                self._expires.pop(key, None)
+            else:
+                self._expires[key] = time.monotonic() + ex
+        return True
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = self._lookup(key)
+            value = int(value) + amount if isinstance(value, bytes) else amount
+            self._data[_encode(key).decode()] = _encode(value)
+            return value
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        with self._lock:
+            value = self._lookup(key)
+            return dict(value) if isinstance(value, dict) else {}
+
+    def hset(self, key: str, mapping: dict) -> int:
+        key = _encode(key).decode()
+        with self._lock:
+            fields = self._data.get(key)
+            if not isinstance(fields, dict):
+                fields = self._data[key] = {}
+            added = 0
+            for field, value in mapping.items():
+                field = _encode(field)
+                added += field not in fields
+                fields[field] = _encode(value)
+            return added
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                key = _encode(key).decode()
+                self._expires.pop(key, None)
+                removed += self._data.pop(key, None) is not None
+            return removed
+
+    def unlink(self, *keys: str) -> int:
+        return self.delete(*keys)
+
+    def publish(self, channel: str, message: Any) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber._deliver(channel, _encode(message))
+        return len(subscribers)
+
+    def pipeline(self) -> "_MemoryPipeline":
+        return _MemoryPipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> "_MemoryPubSub":
+        return _MemoryPubSub(self)
+
+    def after_fork(self) -> None:
+        # The lock may have been held by another thread of the parent at fork time
+        self._lock = threading.RLock()
+
+    def close(self) -> None:
+        pass
+
+    def flushall(self) -> None:
+        """Removes every key."""
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+
+
+class _MemoryPipeline:
+    """Queues MemoryCache calls and applies them under one lock acquisition."""
+
+    def __init__(self, cache: MemoryCache):
+        self._cache = cache
+        self._calls: list[tuple[Callable, tuple, dict]] = []
+
+    def _queue(self, method: Callable, *args, **kwargs) -> "_MemoryPipeline":
+        self._calls.append((method, args, kwargs))
+        return self
+
+    def get(self, key):
+        return self._queue(self._cache.get, key)
+
+    def set(self, key, value, ex=None, nx=False):
+        return self._queue(self._cache.set, key, value, ex=ex, nx=nx)
+
+    def incr(self, key, amount=1):
+        return self._queue(self._cache.incr, key, amount)
+
+    def hgetall(self, key):
+        return self._queue(self._cache.hgetall, key)
+
+    def hset(self, key, mapping):
+        return self._queue(self._cache.hset, key, mapping=mapping)
+
+    def delete(self, *keys):
+        return self._queue(self._cache.delete, *keys)
+
+    def unlink(self, *keys):
+        return self._queue(self._cache.unlink, *keys)
+
+    def publish(self, channel, message):
+        return self._queue(self._cache.publish, channel, message)
+
+    def execute(self) -> list:
+        with self._cache._lock:
+            results = [method(*args, **kwargs) for method, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+class _MemoryPubSub:
+    """Delivers MemoryCache messages to handlers on a background thread, like redis-py's PubSub."""
+
+    def __init__(self, cache: MemoryCache):
+        self._cache = cache
+        self._handlers: dict[str, Callable] = {}
+        self._messages: queue.SimpleQueue = queue.SimpleQueue()
+
+    def subscribe(self, **handlers: Callable) -> None:
+        with self._cache._lock:
+            for channel, handler in handlers.items():
+                self._handlers[channel] = handler
+                self._cache._subscribers.setdefault(channel, []).append(self)
+
+    def _deliver(self, channel: str, data: bytes) -> None:
+        self._messages.put({"type": "message", "pattern": None, "channel": channel.encode(), "data": data})
+
+    def run_in_thread(self, sleep_time: float = 0, daemon: bool = False) -> "_MemoryPubSubThread":
+        thread = _MemoryPubSubThread(self, daemon=daemon)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        with self._cache._lock:
+            for channel in self._handlers:
+                self._cache._subscribers[channel].remove(self)
+            self._handlers = {}
+
+
+class _MemoryPubSubThread(threading.Thread):
+    def __init__(self, pubsub: _MemoryPubSub, daemon: bool = False):
+        super().__init__(name="memory-cache-pubsub", daemon=daemon)
+        self.pubsub = pubsub
+
+    def run(self) -> None:
+        while True:
+            message = self.pubsub._messages.get()
+            if message is None:
+                break
+            handler = self.pubsub._handlers.get(message["channel"].decode())
+            if handler is None:
+                continue
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error("Pub/sub handler failed for %s: %s", message["channel"], str(e))
+
+    def stop(self) -> None:
+        self.pubsub.close()
+        self.pubsub._messages.put(None)
@@ -0,0 +1,80 @@
+import logging
+import os
+
+from meal_max.clients.cache_backends import CacheBackend, MemoryCache
+from meal_max.clients.redis_client import redis_client
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+CACHE_BACKENDS = ("redis", "memory")
+
+
+class CacheClient:
+    """
+    The cache used by the models, backed by Redis or by an in-process store.
+
+    Like `db`, the client is created at import time and bound to a backend by
+    `init_app`, which reads CACHE_BACKEND from the app config. Until then it
+    uses the backend named by the CACHE_BACKEND environment variable. Every
+    other attribute is looked up on the backend (see CacheBackend).
+
+    Attributes:
+        backend (CacheBackend): The backend calls are forwarded to.
+    """
+
+    def __init__(self, backend: CacheBackend = None):
+        self.backend = backend
+
+    def init_app(self, app) -> None:
+        """
+        Selects the backend named by the app's CACHE_BACKEND setting.
+
+        Args:
+            app (Flask): The application being configured.
+
+        Raises:
+            ValueError: If CACHE_BACKEND names an unknown backend.
+        """
+        self.use(create_backend(app.config.get('CACHE_BACKEND', 'redis')))
+
+    def use(self, backend: CacheBackend) -> None:
+        """
+        Forwards calls to the given backend from now on.
+
+        Args:
+            backend (CacheBackend): The backend to use.
+        """
+        self.backend = backend
+        logger.info("Using the %s cache backend", type(backend).__name__)
+
+    def __getattr__(self, name):
+        if self.backend is None:
+            self.use(create_backend(os.getenv('CACHE_BACKEND', 'redis')))
+        return getattr(self.backend, name)
+
+
+def create_backend(name: str) -> CacheBackend:
+    """
+    Builds the cache backend with the given name.
+
+    Args:
+        name (str): 'redis' for the shared Redis client, or 'memory' for a new in-process cache.
+
+    Returns:
+        CacheBackend: The backend.
+
+    Raises:
+        ValueError: If the name is not one of CACHE_BACKENDS.
+    """
+    if name == "redis":
+        return redis_client
+    if name == "memory":
+        return MemoryCache()
+    raise ValueError(f"Invalid cache backend: {name}. Must be one of {', '.join(CACHE_BACKENDS)}.")
+
+
+cache_client = CacheClient()
@@ -14,6 +14,7 @@ MONGO_HOST = os.environ.get('MONGO_HOST', 'localhost')
 MONGO_PORT = int(os.environ.get('MONGO_PORT', 27017))
 
 logger.info("Connecting to MongoDB at %s:%d", MONGO_HOST, MONGO_PORT)
-mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT)
+# Connect lazily, so a client created before a pre-forking server forks is safe to use in its workers
+mongo_client = MongoClient(host=MONGO_HOST, port=MONGO_PORT, connect=False)
 db = mongo_client['meal_max']
 sessions_collection = db['sessions']
\ No newline at end of file
@@ -1,8 +1,7 @@
 import logging
 import os
 
-import redis
-
+from meal_max.clients.cache_backends import RedisCache
 from meal_max.utils.logger import configure_logger
 
 
@@ -15,4 +14,4 @@ REDIS_PORT = os.environ.get('REDIS_PORT', 6379)
 REDIS_DB = os.environ.get('REDIS_DB', 0)
 
 logger.info("Connecting to Redis at %s:%s", REDIS_HOST, REDIS_PORT)
-redis_client = redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
+redis_client = RedisCache(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
@@ -1,3 +1,47 @@
+from typing import Any
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
+
+
+def configure_sqlite(engine, pragmas: dict[str, Any]) -> None:
+    """
+    Apply PRAGMA settings to every new connection of a SQLite engine.
+
+    Does nothing for other databases.
+
+    Args:
+        engine (Engine): The engine to configure, before its first connection.
+        pragmas (dict[str, Any]): PRAGMA names and values, e.g. {'journal_mode': 'WAL'}.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def begin_write(session) -> None:
+    """
+    Take the write lock for the session's transaction before it reads.
+
+    pysqlite only issues BEGIN before the first write, so the reads of a
+    read-modify-write run outside the transaction and another writer can
+    commit before the write. On SQLite this starts the transaction with
+    BEGIN IMMEDIATE instead, unless a write already holds the lock. Other
+    databases start transactions before reads; lock the rows read with
+    `with_for_update()` there.
+
+    Args:
+        session (Session): The session whose transaction is about to read.
+    """
+    connection = session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
@@ -1,10 +1,11 @@
 import logging
 import os
+import threading
 import time
 from typing import Any, List
 
-from meal_max.models.kitchen_model import Meals
-from meal_max.utils.logger import configure_logger
+from meal_max.models.kitchen_model import MEAL_UPDATES_CHANNEL, Meals
+from meal_max.utils.logger import SAMPLED, configure_logger
 from meal_max.utils.random_utils import get_random
 
 
@@ -12,24 +13,74 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-TTL = os.getenv("TTL", 60)  # Default TTL is 60 seconds
+TTL = int(os.getenv("TTL", 60))  # Default TTL is 60 seconds
 
 
 class BattleModel:
     """
     A class to manage the battle between two combatants.
 
+    Cached combatant data is refreshed when a meal-change event arrives for it
+    (see `subscribe`), or when its TTL lapses as a safety net for missed events.
+
     Attributes:
         combatants (List[dict[str, Any]]): The list of combatants in the battle.
         combatant_ttls (dict[int, int]): A dictionary to store TTL for each combatant.
         meals_cache (dict[int, dict[str, Any]]): A dictionary to cache meal data by ID.
+        ttl (int): Seconds a cached combatant is trusted without a change event.
+        stale_combatants (set[int]): Cached combatants that changed since they were cached.
+        refresh_counts (dict[str, int]): Counts of change events and of refreshes by cause.
     """
 
-    def __init__(self):
+    def __init__(self, ttl: int = TTL):
         """Initializes the BattleManager with an empty list of combatants and TTL."""
         self.combatants: List[int] = []  # List of active combatants
         self.combatant_ttls: dict[int, int] = {}  # Dictionary to store TTL for each combatant
         self.meals_cache: dict[int, dict[str, Any]] = {}  # Cache of meal data by ID
+        self.ttl = ttl
+        self.stale_combatants: set[int] = set()
+        self.refresh_counts = {"events": 0, "event_refreshes": 0, "ttl_refreshes": 0}
+        self._lock = threading.Lock()
+        self._subscriber = None
+
+    def subscribe(self, cache_client) -> threading.Thread:
+        """
+        Subscribes to meal-change events so cached combatants are refreshed only when they change.
+
+        Args:
+            cache_client (CacheClient): The cache whose pub/sub carries MEAL_UPDATES_CHANNEL.
+
+        Returns:
+            threading.Thread: The background thread dispatching events to `handle_meal_update`.
+        """
+        pubsub = cache_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{MEAL_UPDATES_CHANNEL: lambda message: self.handle_meal_update(message["data"])})
+        logger.info("Subscribed to meal updates on channel %s", MEAL_UPDATES_CHANNEL)
+        self._subscriber = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        return self._subscriber
+
+    def unsubscribe(self) -> None:
+        """
+        Stops the meal-change subscriber thread started by `subscribe`, if any.
+        """
+        if self._subscriber is not None:
+            self._subscriber.stop()
+            self._subscriber = None
+            logger.info("Unsubscribed from meal updates on channel %s", MEAL_UPDATES_CHANNEL)
+
+    def handle_meal_update(self, meal_id) -> None:
+        """
+        Marks a cached combatant as stale after its meal changed.
+
+        Args:
+            meal_id (int | bytes | str): The ID of the meal that changed.
+        """
+        meal_id = int(meal_id)
+        with self._lock:
+            if meal_id in self.meals_cache:
+                logger.debug("Meal ID %s changed, marking cached combatant stale.", meal_id)
+                self.stale_combatants.add(meal_id)
+                self.refresh_counts["events"] += 1
 
     def battle(self) -> str:
         """
@@ -48,14 +99,19 @@ class BattleModel:
             logger.error("Not enough combatants to start a battle.")
             raise ValueError("Two combatants must be prepped for a battle.")
 
-        # Refresh combatants' data if TTLs have expired
+        # Refresh combatants' data if they changed or their TTLs have expired
         for meal_id in self.combatants:
-            if time.time() > self.combatant_ttls.get(meal_id, 0):  # Check TTL expiration
+            with self._lock:
+                changed = meal_id in self.stale_combatants
+                self.stale_combatants.discard(meal_id)
+            expired = time.time() > self.combatant_ttls.get(meal_id, 0)  # Check TTL expiration
+            if changed or expired:
                 # Fetch latest data and update cache
-                logger.info("Cache expired for meal ID %s, refreshing cache.", meal_id)
+                logger.info("Cache %s for meal ID %s, refreshing cache.", "invalidated" if changed else "expired", meal_id)
                 updated_meal = Meals.get_meal_by_id(meal_id)
-                self.combatant_ttls[meal_id] = time.time() + TTL  # Reset TTL
+                self.combatant_ttls[meal_id] = time.time() + self.ttl  # Reset TTL
                 self.meals_cache[meal_id] = updated_meal
+                self.refresh_counts["event_refreshes" if changed else "ttl_refreshes"] += 1
 
         combatant_1 = self.meals_cache[self.combatants[0]]
         combatant_2 = self.meals_cache[self.combatants[1]]
@@ -68,20 +124,20 @@ class BattleModel:
         score_2 = self.get_battle_score(combatant_2)
 
         # Log the scores for both combatants
-        logger.info("Score for %s: %.3f", combatant_1["meal"], score_1)
-        logger.info("Score for %s: %.3f", combatant_2["meal"], score_2)
+        logger.info("Score for %s: %.3f", combatant_1["meal"], score_1, extra=SAMPLED)
+        logger.info("Score for %s: %.3f", combatant_2["meal"], score_2, extra=SAMPLED)
 
         # Compute the delta and normalize between 0 and 1
         delta = abs(score_1 - score_2) / 100
 
         # Log the delta and normalized delta
-        logger.info("Delta between scores: %.3f", delta)
+        logger.info("Delta between scores: %.3f", delta, extra=SAMPLED)
 
         # Get random number from random.org
         random_number = get_random()
 
         # Log the random number
-        logger.info("Random number from random.org: %.3f", random_number)
+        logger.info("Random number from random.org: %.3f", random_number, extra=SAMPLED)
 
         # Determine the winner based on the normalized delta
         if delta > random_number:
@@ -94,12 +150,11 @@ class BattleModel:
         # Log the winner
         logger.info("The winner is: %s", winner["meal"])
 
-        # Update stats for both combatants
-        Meals.update_meal_stats(winner["id"], 'win')
-        Meals.update_meal_stats(loser["id"], 'loss')
+        # Update stats and ratings for both combatants in one transaction
+        Meals.record_battle(winner["id"], loser["id"])
 
         # Remove the losing combatant from combatants
-        self.combatants.remove(loser["id"])
+        self.combatants.remove(int(loser["id"]))
 
         return winner["meal"]
 
@@ -128,13 +183,13 @@ class BattleModel:
 
         # Log the calculation process
         logger.info("Calculating battle score for %s: price=%.3f, cuisine=%s, difficulty=%s",
-                    combatant["meal"], combatant["price"], combatant["cuisine"], combatant["difficulty"])
+                    combatant["meal"], combatant["price"], combatant["cuisine"], combatant["difficulty"], extra=SAMPLED)
 
         # Calculate score
         score = (combatant["price"] * len(combatant["cuisine"])) - difficulty_modifier[combatant["difficulty"]]
 
         # Log the calculated score
-        logger.info("Battle score for %s: %.3f", combatant["meal"], score)
+        logger.info("Battle score for %s: %.3f", combatant["meal"], score, extra=SAMPLED)
 
         return score
 
@@ -165,10 +220,10 @@ class BattleModel:
         # Log the addition of the combatant
         logger.info("Adding combatant '%s' to combatants list", combatant_data["meal"])
 
-        id = combatant_data["id"]
+        id = int(combatant_data["id"])
         self.combatants.append(id)
         self.meals_cache[id] = combatant_data
-        self.combatant_ttls[id] = time.time() + TTL
+        self.combatant_ttls[id] = time.time() + self.ttl
 
         # Log the current state of combatants
         logger.info("Current combatants list: %s", [self.meals_cache[combatant]["meal"] for combatant in self.combatants])
\ No newline at end of file
@@ -1,12 +1,20 @@
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import logging
-from typing import Any, List
+import os
+import time
+from typing import Any, Iterator, List, Optional
 
-from sqlalchemy import event
+import numpy as np
+from sqlalchemy import DDL, case, delete, event, insert, inspect, or_, text, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import object_session
 
-from meal_max.clients.redis_client import redis_client
-from meal_max.db import db
+from meal_max.clients.cache_client import cache_client
+from meal_max.db import begin_write, db
+from meal_max.utils.elo_utils import INITIAL_RATING, replay_ratings, update_ratings
 from meal_max.utils.logger import configure_logger
 
 
@@ -14,6 +22,52 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+ELO_K_FACTOR = float(os.getenv("ELO_K_FACTOR", 32))  # Maximum rating change per battle
+MEAL_UPDATES_CHANNEL = "meal_updates"  # Cache pub/sub channel announcing changed meal IDs
+LEADERBOARD_SORTS = ("wins", "win_pct", "elo")
+APPLY_RESULTS_CHUNK_SIZE = 500  # Meals per UPDATE ... CASE statement, well under SQLite's bound-parameter limit
+MEAL_CATALOG_VERSION_KEY = "meal_catalog_version"  # Bumped after every committed meal write
+MEAL_PAGE_CACHE_TTL = int(os.getenv("MEAL_PAGE_CACHE_TTL", 300))  # Pages of superseded versions expire on their own
+MEAL_PAGE_MAX_SIZE = 100
+LEADERBOARD_CACHE_TTL = int(os.getenv("LEADERBOARD_CACHE_TTL", 300))  # Leaderboards of superseded versions expire on their own
+MEAL_RESPONSE_CACHE_TTL = int(os.getenv("MEAL_RESPONSE_CACHE_TTL", 300))  # Responses of superseded versions expire on their own
+
+
+class BattleResults(db.Model):
+    """
+    An append-only log of battle outcomes, used to recompute ratings.
+
+    The meal IDs are not foreign keys because the history outlives meals that
+    are compacted into meals_archive.
+    """
+    __tablename__ = 'battle_results'
+
+    id = db.Column(db.Integer, primary_key=True)
+    winner_id = db.Column(db.Integer, nullable=False)
+    loser_id = db.Column(db.Integer, nullable=False)
+
+
+class MealsArchive(db.Model):
+    """
+    Soft-deleted meals moved out of the hot meals table by `Meals.archive_deleted_meals`.
+
+    Rows keep their original ID. Names are not unique here, because a name is
+    free to be reused on the hot table once its meal has been archived.
+    """
+    __tablename__ = 'meals_archive'
+
+    id = db.Column(db.Integer, primary_key=True)
+    meal = db.Column(db.String(80), nullable=False, index=True)
+    cuisine = db.Column(db.String(50))
+    price = db.Column(db.Float, nullable=False)
+    difficulty = db.Column(db.String(10), nullable=False)
+    battles = db.Column(db.Integer)
+    wins = db.Column(db.Integer)
+    elo = db.Column(db.Float)
+    deleted_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+
 @dataclass
 class Meals(db.Model):
     __tablename__ = 'meals'
@@ -26,6 +80,19 @@ class Meals(db.Model):
     battles: int = db.Column(db.Integer, default=0)
     wins: int = db.Column(db.Integer, default=0)
     deleted: bool = db.Column(db.Boolean, default=False)
+    # Not dataclass fields, so they stay out of the cached meal hash
+    elo = db.Column(db.Float, nullable=False, default=INITIAL_RATING, index=True)
+    deleted_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # Only live meals are ever ranked, so the leaderboard index skips deleted rows
+        db.Index('ix_meals_live_wins', 'wins', sqlite_where=text('deleted = 0'), postgresql_where=text('NOT deleted')),
+        # Catalog listing filters: equality on cuisine and/or difficulty, then a price range that also orders the page
+        db.Index('ix_meals_live_cuisine_difficulty_price', 'cuisine', 'difficulty', 'price',
+                 sqlite_where=text('deleted = 0'), postgresql_where=text('NOT deleted')),
+        db.Index('ix_meals_live_difficulty_price', 'difficulty', 'price',
+                 sqlite_where=text('deleted = 0'), postgresql_where=text('NOT deleted')),
+    )
 
     def __post_init__(self):
         if self.price < 0:
@@ -91,17 +158,83 @@ class Meals(db.Model):
             raise ValueError(f"Meal with ID {meal_id} has been deleted")
 
         meal.deleted = True
+        meal.deleted_at = datetime.now(timezone.utc)
         db.session.commit()
         logger.info("Meal with ID %s marked as deleted.", meal_id)
 
+    @classmethod
+    def archive_deleted_meals(cls, retention_days: int = 30, batch_size: int = 500) -> int:
+        """
+        Move soft-deleted meals older than the retention window into meals_archive.
+
+        Meals are moved in batches, each in its own transaction, and their cache
+        keys are removed once the batch commits. Meals deleted before deletion
+        times were recorded are treated as past the retention window.
+
+        Args:
+            retention_days (int, optional): Keep deleted meals this many days before archiving. Defaults to 30.
+            batch_size (int, optional): The number of meals moved per transaction. Defaults to 500.
+
+        Returns:
+            int: The number of meals archived.
+
+        Raises:
+            ValueError: If retention_days or batch_size is invalid.
+        """
+        if retention_days < 0:
+            raise ValueError(f"Invalid retention_days: {retention_days}. Must be zero or greater.")
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size: {batch_size}. Must be a positive number.")
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        columns = [cls.id, cls.meal, cls.cuisine, cls.price, cls.difficulty, cls.battles, cls.wins, cls.elo, cls.deleted_at]
+        archived = 0
+        while True:
+            rows = db.session.execute(
+                db.select(*columns)
+                .where(cls.deleted.is_(True), or_(cls.deleted_at.is_(None), cls.deleted_at < cutoff))
+                .order_by(cls.id)
+                .limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+
+            now = datetime.now(timezone.utc)
+            ids = [row["id"] for row in rows]
+            try:
+                db.session.execute(insert(MealsArchive), [dict(row, archived_at=now) for row in rows])
+                db.session.execute(delete(cls).where(cls.id.in_(ids)))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("Database error while archiving meals: %s", str(e))
+                raise
+
+            pipe = cache_client.pipeline()
+            for row in rows:
+                pipe.unlink(f"meal_{row['id']}", f"meal:{row['id']}", f"meal_name:{row['meal']}")
+                bump_meal_version(pipe, row['id'])
+            pipe.execute()
+
+            archived += len(rows)
+            logger.info("Archived %d deleted meals (%d total)", len(rows), archived)
+
+        logger.info("Archival complete: %d meals archived", archived)
+        return archived
+
     @classmethod
     def get_leaderboard(cls, sort_by: str = "wins") -> List[dict[str, Any]]:
         """
         Retrieve the leaderboard of meals based on wins or win percentage.
 
+        Leaderboards are cached per sort order and catalog version, so a meal
+        write moves readers to a new entry. The version is read before the
+        query, so a leaderboard computed before a write commits is cached under
+        the old version and never served afterwards.
+
         Args:
             sort_by (str, optional): Specifies the sorting method for the leaderboard.
-                                     Options are 'wins' (default) or 'win_pct'.
+                                     Options are 'wins' (default), 'win_pct' or 'elo'.
 
         Returns:
             List[dict]: A list of meals with stats for leaderboard display.
@@ -109,15 +242,23 @@ class Meals(db.Model):
         Raises:
             ValueError: If an invalid sort_by parameter is provided.
         """
-        if sort_by not in ["wins", "win_pct"]:
+        if sort_by not in LEADERBOARD_SORTS:
             logger.error("Invalid sort_by parameter: %s", sort_by)
             raise ValueError(f"Invalid sort_by parameter: {sort_by}")
 
+        cache_key = f"leaderboard:{sort_by}:{cls.get_catalog_version()}"
+        cached_leaderboard = cache_client.get(cache_key)
+        if cached_leaderboard:
+            logger.info("Leaderboard retrieved from cache")
+            return json.loads(cached_leaderboard)
+
         query = cls.query.filter_by(deleted=False).filter(cls.battles > 0)
         if sort_by == "win_pct":
             query = query.order_by((cls.wins * 1.0 / cls.battles).desc())
         elif sort_by == "wins":
             query = query.order_by(cls.wins.desc())
+        elif sort_by == "elo":
+            query = query.order_by(cls.elo.desc())
 
         leaderboard = [
             {
@@ -128,10 +269,12 @@ class Meals(db.Model):
                 'difficulty': meal.difficulty,
                 'battles': meal.battles,
                 'wins': meal.wins,
-                'win_pct': round((meal.wins / meal.battles) * 100, 1) if meal.battles > 0 else 0
+                'win_pct': round((meal.wins / meal.battles) * 100, 1) if meal.battles > 0 else 0,
+                'elo': round(meal.elo, 1)
             }
             for meal in query.all()
         ]
+        cache_client.set(cache_key, json.dumps(leaderboard), ex=LEADERBOARD_CACHE_TTL)
         logger.info("Leaderboard retrieved successfully")
         return leaderboard
 
@@ -152,7 +295,7 @@ class Meals(db.Model):
         """
         logger.info("Retrieving meal by ID: %s", meal_id)
         cache_key = f"meal_{meal_id}"
-        cached_meal = redis_client.hgetall(cache_key)
+        cached_meal = cache_client.hgetall(cache_key)
         if cached_meal:
             logger.info("Meal retrieved from cache: %s", meal_id)
             meal_data = {k.decode(): v.decode() for k, v in cached_meal.items()}
@@ -170,7 +313,7 @@ class Meals(db.Model):
         # Convert the meal object to a dictionary and cache it
         logger.info("Meal retrieved from database and cached: %s", meal_id)
         meal_dict = asdict(meal)
-        redis_client.hset(cache_key, mapping={k: str(v) for k, v in meal_dict.items()})
+        cache_client.hset(cache_key, mapping={k: str(v) for k, v in meal_dict.items()})
         return meal_dict
 
     @classmethod
@@ -188,14 +331,30 @@ class Meals(db.Model):
             ValueError: If the meal does not exist or is deleted.
         """
         logger.info("Retrieving meal by name: %s", meal_name)
+        # Use get_meal_by_id to retrieve the full meal data from ID
+        return cls.get_meal_by_id(cls.get_meal_id(meal_name), meal_name)
+
+    @classmethod
+    def get_meal_id(cls, meal_name: str) -> int:
+        """
+        Retrieve the ID of a meal by its name, using a cached association between name and ID.
+
+        Args:
+            meal_name (str): The name of the meal.
+
+        Returns:
+            int: The ID of the meal.
+
+        Raises:
+            ValueError: If the meal does not exist or is deleted.
+        """
         cache_key = f"meal_name:{meal_name}"
 
         # Check if name-to-ID association is cached
-        meal_id = redis_client.get(cache_key)
+        meal_id = cache_client.get(cache_key)
         if meal_id:
             logger.info("Meal ID %s retrieved from cache for name: %s", meal_id.decode(), meal_name)
-            # Use get_meal_by_id to retrieve the full meal data from ID
-            return cls.get_meal_by_id(int(meal_id.decode()), meal_name)
+            return int(meal_id.decode())
 
         # Fallback to database if cache miss
         meal = cls.query.filter_by(meal=meal_name).first()
@@ -203,11 +362,284 @@ class Meals(db.Model):
             logger.info("Meal with name %s not found", meal_name)
             raise ValueError(f"Meal {meal_name} not found")
 
-        # Cache the name-to-ID association and retrieve the full meal data
+        # Cache the name-to-ID association
         # TODO: This should happen when a meal is created, not here
         logger.info("Caching meal ID %s for name: %s", meal.id, meal_name)
-        redis_client.set(cache_key, str(meal.id))
-        return cls.get_meal_by_id(meal.id, meal_name)
+        cache_client.set(cache_key, str(meal.id))
+        return meal.id
+
+    @classmethod
+    def get_meal_version(cls, meal_id: int) -> int:
+        """
+        Retrieve a meal's version, which changes after every committed write to the meal.
+
+        Read it before reading the meal: a response built afterwards is then
+        cached under a version that was current when its data was read, and a
+        write committed in between moves readers to a new version instead of
+        leaving the stale response in place. A missing version is restarted
+        from the clock, like the catalog version.
+
+        Args:
+            meal_id (int): The ID of the meal.
+
+        Returns:
+            int: The meal's current version.
+        """
+        cache_key = f"meal_version:{meal_id}"
+        version = cache_client.get(cache_key)
+        if version is None:
+            cache_client.set(cache_key, time.time_ns(), nx=True)
+            version = cache_client.get(cache_key)
+        return int(version)
+
+    @classmethod
+    def get_cached_response(cls, meal_id: int, version: int) -> Optional[bytes]:
+        """
+        Retrieve the pre-serialized single-meal response body for a version of a meal, if it is cached.
+
+        Args:
+            meal_id (int): The ID of the meal.
+            version (int): The meal's version, from get_meal_version.
+
+        Returns:
+            bytes: The cached response body, or None on a cache miss.
+        """
+        cache_key = f"meal_response:{meal_id}:{version}"
+        payload = cache_client.get(cache_key)
+        if payload:
+            logger.info("Meal response retrieved from cache: %s", cache_key)
+        return payload
+
+    @classmethod
+    def cache_response(cls, meal: dict[str, Any], payload: bytes, version: int) -> None:
+        """
+        Cache the serialized single-meal response body under the meal's ID and version.
+
+        The lookups by ID and by name share the entry. Entries for superseded
+        versions are never read again and expire after MEAL_RESPONSE_CACHE_TTL.
+
+        Args:
+            meal (dict): The meal data the response was built from.
+            payload (bytes): The serialized response body.
+            version (int): The meal's version, read before the meal data.
+        """
+        cache_client.set(f"meal_response:{meal['id']}:{version}", payload, ex=MEAL_RESPONSE_CACHE_TTL)
+        logger.info("Meal response cached for ID %s at version %s", meal['id'], version)
+
+    @classmethod
+    def list_meals(cls, cuisine: str = None, difficulty: str = None, min_price: float = None, max_price: float = None,
+                   page: int = 1, per_page: int = 20) -> dict[str, Any]:
+        """
+        Retrieve one page of the live meal catalog, cheapest first.
+
+        Args:
+            cuisine (str, optional): Only include meals of this cuisine.
+            difficulty (str, optional): Only include meals of this difficulty ('LOW', 'MED', 'HIGH').
+            min_price (float, optional): Only include meals costing at least this much.
+            max_price (float, optional): Only include meals costing at most this much.
+            page (int, optional): The page number, starting at 1. Defaults to 1.
+            per_page (int, optional): The number of meals per page, at most MEAL_PAGE_MAX_SIZE. Defaults to 20.
+
+        Returns:
+            dict: The page's meals, the page number and size, and the total number of matching meals.
+
+        Raises:
+            ValueError: If a filter or the pagination is invalid.
+        """
+        if difficulty is not None and difficulty not in ['LOW', 'MED', 'HIGH']:
+            logger.error("Invalid difficulty level: %s", difficulty)
+            raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            logger.error("Invalid price range: %s to %s", min_price, max_price)
+            raise ValueError(f"Invalid price range: min_price {min_price} is greater than max_price {max_price}.")
+        if page < 1:
+            logger.error("Invalid page: %s", page)
+            raise ValueError(f"Invalid page: {page}. Must be a positive number.")
+        if not 1 <= per_page <= MEAL_PAGE_MAX_SIZE:
+            logger.error("Invalid per_page: %s", per_page)
+            raise ValueError(f"Invalid per_page: {per_page}. Must be between 1 and {MEAL_PAGE_MAX_SIZE}.")
+
+        query = cls.query.filter_by(deleted=False)
+        if cuisine is not None:
+            query = query.filter(cls.cuisine == cuisine)
+        if difficulty is not None:
+            query = query.filter(cls.difficulty == difficulty)
+        if min_price is not None:
+            query = query.filter(cls.price >= min_price)
+        if max_price is not None:
+            query = query.filter(cls.price <= max_price)
+
+        total = query.count()
+        meals = query.order_by(cls.price, cls.id).limit(per_page).offset((page - 1) * per_page).all()
+        logger.info("Listed page %d of the meal catalog: %d of %d meals", page, len(meals), total)
+        return {
+            'meals': [asdict(meal) for meal in meals],
+            'page': page,
+            'per_page': per_page,
+            'total': total
+        }
+
+    @classmethod
+    def get_catalog_version(cls) -> int:
+        """
+        Retrieve the meal catalog version, which changes after every committed meal write.
+
+        A missing version (e.g. after the cache was flushed) is restarted from the
+        clock rather than from zero, so it cannot repeat a version issued before.
+
+        Returns:
+            int: The current catalog version.
+        """
+        version = cache_client.get(MEAL_CATALOG_VERSION_KEY)
+        if version is None:
+            cache_client.set(MEAL_CATALOG_VERSION_KEY, time.time_ns(), nx=True)
+            version = cache_client.get(MEAL_CATALOG_VERSION_KEY)
+        return int(version)
+
+    @classmethod
+    def catalog_etag(cls, **params: Any) -> str:
+        """
+        Build the entity tag of a catalog page from the catalog version and the page's parameters.
+
+        The tag doubles as the cache key of the page, so a meal write moves every
+        page to a new key and a client holding the current tag can be answered
+        without reading the page at all.
+
+        Args:
+            params: The list_meals arguments that select the page.
+
+        Returns:
+            str: The entity tag.
+        """
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+        return f"{cls.get_catalog_version()}-{digest}"
+
+    @classmethod
+    def get_cached_page(cls, etag: str) -> Optional[bytes]:
+        """
+        Retrieve a pre-serialized catalog page response body, if it is cached.
+
+        Args:
+            etag (str): The page's entity tag, from catalog_etag.
+
+        Returns:
+            bytes: The cached response body, or None on a cache miss.
+        """
+        payload = cache_client.get(f"meals_page:{etag}")
+        if payload:
+            logger.info("Catalog page retrieved from cache: %s", etag)
+        return payload
+
+    @classmethod
+    def cache_page(cls, etag: str, payload: bytes) -> None:
+        """
+        Cache a serialized catalog page response body under its entity tag.
+
+        Args:
+            etag (str): The page's entity tag, from catalog_etag.
+            payload (bytes): The serialized response body.
+        """
+        cache_client.set(f"meals_page:{etag}", payload, ex=MEAL_PAGE_CACHE_TTL)
+        logger.info("Catalog page cached: %s", etag)
+
+    @classmethod
+    def iter_meal_batches(cls, deleted: Optional[bool] = False, min_battles: int = 0, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """
+        Stream the meals table in batches using a server-side cursor.
+
+        Rows are fetched `batch_size` at a time and never materialized as ORM
+        objects, so memory use does not grow with the size of the table.
+
+        Args:
+            deleted (bool, optional): Only include meals with this deleted flag, or all meals if None.
+                                      Defaults to False.
+            min_battles (int, optional): Only include meals with at least this many battles. Defaults to 0.
+            batch_size (int, optional): The number of rows per batch. Defaults to 1000.
+
+        Yields:
+            List[tuple]: Rows of (id, meal, cuisine, price, difficulty, battles, wins, deleted), ordered by ID.
+
+        Raises:
+            ValueError: If min_battles or batch_size is invalid.
+        """
+        if min_battles < 0:
+            raise ValueError(f"Invalid min_battles: {min_battles}. Must be zero or greater.")
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch_size: {batch_size}. Must be a positive number.")
+
+        query = db.select(
+            cls.id, cls.meal, cls.cuisine, cls.price, cls.difficulty, cls.battles, cls.wins, cls.deleted
+        ).order_by(cls.id)
+        if deleted is not None:
+            query = query.where(cls.deleted.is_(deleted))
+        if min_battles:
+            query = query.where(cls.battles >= min_battles)
+
+        logger.info("Streaming meals (deleted=%s, min_battles=%d)", deleted, min_battles)
+        result = db.session.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    @classmethod
+    def search_meals(cls, query: str, limit: int = 20) -> List[dict[str, Any]]:
+        """
+        Search meals by name and cuisine using the full-text search index.
+
+        Every term in the query is treated as a prefix, so 'spag ital' matches
+        'Spaghetti' in the 'Italian' cuisine. Results are ranked by relevance (bm25).
+
+        Args:
+            query (str): The search text.
+            limit (int, optional): The maximum number of results to return. Defaults to 20.
+
+        Returns:
+            List[dict]: The matching meals, best match first.
+
+        Raises:
+            ValueError: If the query contains no searchable terms or the limit is invalid.
+        """
+        terms = [term.replace('"', '""') for term in query.split()]
+        if not terms:
+            logger.error("Empty search query: %r", query)
+            raise ValueError("Search query must contain at least one term")
+        if limit <= 0:
+            logger.error("Invalid search limit: %s", limit)
+            raise ValueError(f"Invalid limit: {limit}. Limit must be a positive number.")
+
+        if db.engine.dialect.name != 'sqlite':
+            # The FTS5 index only exists on SQLite; elsewhere every term must appear in the name or cuisine
+            logger.info("Searching meals without a full-text index for: %s", terms)
+            statement = db.select(cls.id, cls.meal, cls.cuisine, cls.price, cls.difficulty, cls.battles, cls.wins) \
+                .where(cls.deleted.is_(False))
+            for term in query.split():
+                statement = statement.where(or_(cls.meal.ilike(f"%{term}%"), cls.cuisine.ilike(f"%{term}%")))
+            rows = db.session.execute(statement.order_by(cls.meal).limit(limit)).all()
+        else:
+            match_expr = " ".join(f'"{term}"*' for term in terms)
+            logger.info("Searching meals for: %s", match_expr)
+            rows = db.session.execute(
+                text(
+                    "SELECT m.id, m.meal, m.cuisine, m.price, m.difficulty, m.battles, m.wins "
+                    "FROM meals_fts JOIN meals AS m ON m.id = meals_fts.rowid "
+                    "WHERE meals_fts MATCH :match ORDER BY meals_fts.rank LIMIT :limit"
+                ),
+                {"match": match_expr, "limit": limit}
+            ).all()
+
+        results = [
+            {
+                'id': row.id,
+                'meal': row.meal,
+                'cuisine': row.cuisine,
+                'price': row.price,
+                'difficulty': row.difficulty,
+                'battles': row.battles,
+                'wins': row.wins
+            }
+            for row in rows
+        ]
+        logger.info("Search for %r returned %d meals", query, len(results))
+        return results
 
     @classmethod
     def update_meal(cls, meal_id: int, **kwargs) -> None:
@@ -247,6 +679,212 @@ class Meals(db.Model):
         db.session.commit()
         logger.info("Meal with ID %s updated successfully", meal_id)
 
+    @classmethod
+    def record_battle(cls, winner_id: int, loser_id: int) -> None:
+        """
+        Record a battle's outcome in one transaction: both meals' stats, their Elo ratings and the battle history.
+
+        Either everything is recorded or, if either meal is missing or deleted, nothing is.
+
+        Args:
+            winner_id (int): The ID of the winning meal.
+            loser_id (int): The ID of the losing meal.
+
+        Raises:
+            ValueError: If either meal is not found or has been deleted (the winner is checked first).
+        """
+        winner = cls.query.filter_by(id=winner_id).first()
+        loser = cls.query.filter_by(id=loser_id).first()
+        for meal_id, meal in ((winner_id, winner), (loser_id, loser)):
+            if not meal:
+                logger.info("Meal with ID %s not found", meal_id)
+                raise ValueError(f"Meal {meal_id} not found")
+            if meal.deleted:
+                logger.info("Meal with ID %s has been deleted", meal_id)
+                raise ValueError(f"Meal {meal_id} has been deleted")
+
+        try:
+            winner.battles += 1
+            winner.wins += 1
+            loser.battles += 1
+            winner.elo, loser.elo = update_ratings(winner.elo, loser.elo, ELO_K_FACTOR)
+            db.session.add(BattleResults(winner_id=winner_id, loser_id=loser_id))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while recording battle: %s", str(e))
+            raise
+        logger.info("Battle recorded: %s beat %s, ratings %.1f and %.1f", winner_id, loser_id, winner.elo, loser.elo)
+
+    @classmethod
+    def apply_results(cls, batch: List[dict[str, int]], chunk_size: int = APPLY_RESULTS_CHUNK_SIZE) -> dict[str, int]:
+        """
+        Apply a batch of battle results, e.g. from an offline simulation, in one transaction.
+
+        Stat deltas are aggregated per meal in memory and ratings are replayed in
+        batch order, then every meal is written with one UPDATE ... CASE per chunk.
+        The results are appended to the battle history, the per-cuisine and
+        per-difficulty totals are updated in the same transaction (see
+        meal_stats_model), and the cache entries are refreshed in a single
+        pipeline once the transaction commits. The write lock is taken before
+        the meals are read, since their ratings are written back as absolute
+        values.
+
+        Args:
+            batch (List[dict[str, int]]): The results, each with 'winner_id' and 'loser_id'.
+            chunk_size (int, optional): The number of meals written per UPDATE statement.
+
+        Returns:
+            dict: The number of results applied and of meals updated.
+
+        Raises:
+            ValueError: If a result is malformed, or a meal is not found or has been deleted
+                        (including while the batch is written). Nothing is applied in that case.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk_size: {chunk_size}. Must be a positive number.")
+
+        pairs = []
+        for index, result in enumerate(batch):
+            try:
+                winner_id, loser_id = int(result["winner_id"]), int(result["loser_id"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Invalid result at index {index}: expected integer 'winner_id' and 'loser_id'.")
+            if winner_id == loser_id:
+                raise ValueError(f"Invalid result at index {index}: a meal cannot battle itself.")
+            pairs.append((winner_id, loser_id))
+        if not pairs:
+            return {"results": 0, "meals": 0}
+
+        ids = sorted({meal_id for pair in pairs for meal_id in pair})
+        begin_write(db.session)
+        try:
+            meals = {}
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                query = db.select(cls.__table__).where(cls.id.in_(chunk)).with_for_update()
+                for row in db.session.execute(query).mappings():
+                    meals[row["id"]] = dict(row)
+            for meal_id in ids:
+                if meal_id not in meals or meals[meal_id]["deleted"]:
+                    logger.info("Meal with ID %s not found", meal_id)
+                    raise ValueError(f"Meal {meal_id} not found")
+
+            battles = dict.fromkeys(ids, 0)
+            wins = dict.fromkeys(ids, 0)
+            elo = {meal_id: meals[meal_id]["elo"] for meal_id in ids}
+            for winner_id, loser_id in pairs:
+                battles[winner_id] += 1
+                battles[loser_id] += 1
+                wins[winner_id] += 1
+                elo[winner_id], elo[loser_id] = update_ratings(elo[winner_id], elo[loser_id], ELO_K_FACTOR)
+
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                written = db.session.execute(
+                    update(cls)
+                    .where(cls.id.in_(chunk), cls.deleted.is_(False))
+                    .values(
+                        battles=cls.battles + case({meal_id: battles[meal_id] for meal_id in chunk}, value=cls.id, else_=0),
+                        wins=cls.wins + case({meal_id: wins[meal_id] for meal_id in chunk}, value=cls.id, else_=0),
+                        elo=case({meal_id: elo[meal_id] for meal_id in chunk}, value=cls.id, else_=cls.elo)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if written.rowcount != len(chunk):
+                    logger.info("Meals deleted while applying results, nothing applied")
+                    raise ValueError("Meals were deleted while applying results. Nothing was applied.")
+            db.session.execute(insert(BattleResults), [{"winner_id": w, "loser_id": l} for w, l in pairs])
+            # Picked up at commit by the meal stats totals and the change publisher
+            db.session.info.setdefault("meal_stat_deltas", []).extend(
+                {"cuisine": meals[meal_id]["cuisine"] or "", "difficulty": meals[meal_id]["difficulty"],
+                 "battles": battles[meal_id], "wins": wins[meal_id]}
+                for meal_id in ids
+            )
+            db.session.info.setdefault("changed_meals", set()).update(ids)
+            db.session.info["meals_written"] = True
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error while applying results: %s", str(e))
+            raise
+
+        pipe = cache_client.pipeline()
+        for meal_id in ids:
+            meal = meals[meal_id]
+            meal["battles"] += battles[meal_id]
+            meal["wins"] += wins[meal_id]
+            pipe.unlink(f"meal_{meal_id}")
+            pipe.hset(f"meal:{meal_id}", mapping={field.name.encode(): str(meal[field.name]).encode() for field in fields(cls)})
+        pipe.execute()
+
+        logger.info("Applied %d battle results to %d meals", len(pairs), len(ids))
+        return {"results": len(pairs), "meals": len(ids)}
+
+    @classmethod
+    def _replay_history(cls, k_factors: List[float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Replay the full battle history for the given K-factors.
+
+        Returns:
+            tuple: The meal IDs, the ratings per K-factor (one column per meal ID), and
+                   the mean log loss per K-factor.
+        """
+        history = np.array(
+            db.session.execute(db.select(BattleResults.winner_id, BattleResults.loser_id).order_by(BattleResults.id)).all(),
+            dtype=np.int64
+        ).reshape(-1, 2)
+        meal_ids = np.array(db.session.execute(db.select(cls.id)).scalars().all(), dtype=np.int64)
+        # Archived meals only appear in the history; map every ID to a dense column index
+        meal_ids = np.union1d(meal_ids, history.ravel())
+        winners = np.searchsorted(meal_ids, history[:, 0])
+        losers = np.searchsorted(meal_ids, history[:, 1])
+        ratings, log_loss = replay_ratings(winners, losers, len(meal_ids), k_factors)
+        return meal_ids, ratings, log_loss
+
+    @classmethod
+    def recompute_ratings(cls, k_factor: float = None) -> None:
+        """
+        Rebuild every meal's Elo rating from the battle history.
+
+        Args:
+            k_factor (float, optional): The K-factor to replay with. Defaults to ELO_K_FACTOR.
+        """
+        k_factor = ELO_K_FACTOR if k_factor is None else k_factor
+        meal_ids, ratings, _ = cls._replay_history([k_factor])
+        # Archived meals are replayed for their opponents' sake but have no row left to update
+        live_ids = set(db.session.execute(db.select(cls.id)).scalars().all())
+        mappings = [{"id": int(meal_id), "elo": float(rating)}
+                    for meal_id, rating in zip(meal_ids, ratings[0]) if meal_id in live_ids]
+        db.session.execute(update(cls), mappings)
+        db.session.commit()
+        logger.info("Recomputed ratings for %d meals with K=%.1f", len(mappings), k_factor)
+
+    @classmethod
+    def tune_k_factor(cls, k_factors: List[float]) -> dict[float, float]:
+        """
+        Score candidate K-factors by how well they predict the battle history.
+
+        Each battle is predicted from the ratings before it, so a lower log loss
+        means a better-calibrated K-factor. Ratings are not modified.
+
+        Args:
+            k_factors (List[float]): The candidate K-factors.
+
+        Returns:
+            dict: The mean log loss for each K-factor.
+
+        Raises:
+            ValueError: If no K-factors are given or any is not positive.
+        """
+        if not k_factors or any(k <= 0 for k in k_factors):
+            raise ValueError(f"Invalid K-factors: {k_factors}. Must be positive numbers.")
+        _, _, log_loss = cls._replay_history(k_factors)
+        return {k: float(loss) for k, loss in zip(k_factors, log_loss)}
+
     @classmethod
     def update_meal_stats(cls, meal_id: int, result: str) -> None:
         """
@@ -280,11 +918,11 @@ class Meals(db.Model):
 
 def update_cache_for_meal(mapper, connection, target):
     """
-    Update the Redis cache for a meal entry after an update or delete operation.
+    Update the cache for a meal entry after an update or delete operation.
 
     This function is intended to be used as an SQLAlchemy event listener for the
     `after_update` and `after_delete` events on the Meals model. When a meal is
-    updated or deleted, this function will either update the corresponding Redis
+    updated or deleted, this function will either update the corresponding
     cache entry with the new meal details or remove the entry if the meal has
     been marked as deleted.
 
@@ -298,19 +936,199 @@ def update_cache_for_meal(mapper, connection, target):
 
     Side-effects:
         - If the meal is marked as deleted (`target.deleted` is True), the function
-          removes the corresponding cache entry from Redis.
-        - If the meal is not marked as deleted, the function updates the Redis cache
+          removes the corresponding cache entry.
+        - If the meal is not marked as deleted, the function updates the cache
           entry with the latest meal data using the `hset` command.
+        - The read-side hash and pre-serialized responses for the meal are
+          dropped after the commit instead (see publish_changed_meals), since a
+          reader could re-cache the old row before the commit.
     """
     cache_key = f"meal:{target.id}"
     if target.deleted:
-        redis_client.delete(cache_key)
+        cache_client.delete(cache_key)
     else:
-        redis_client.hset(
+        cache_client.hset(
             cache_key,
             mapping={k.encode(): str(v).encode() for k, v in asdict(target).items()}
         )
 
+def track_changed_meal(mapper, connection, target):
+    """
+    Remember a changed meal so its ID can be published once the transaction commits.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The instance of the Meals model that was updated or deleted.
+    """
+    object_session(target).info.setdefault("changed_meals", set()).add(target.id)
+
+def bump_meal_version(client, meal_id: int) -> None:
+    """
+    Move a meal to a new version, superseding its cached responses.
+
+    A missing version is seeded from the clock first, so versions do not
+    repeat after the cache loses the key.
+
+    Args:
+        client: The cache client, or a pipeline of it.
+        meal_id (int): The ID of the meal.
+    """
+    client.set(f"meal_version:{meal_id}", time.time_ns(), nx=True)
+    client.incr(f"meal_version:{meal_id}")
+
+def publish_changed_meals(session):
+    """
+    Drop the cached hashes of the meals changed in a committed transaction, bump their versions
+    and publish their IDs on MEAL_UPDATES_CHANNEL.
+
+    Doing this after the commit (rather than during the flush) guarantees that a
+    reader or subscriber refreshing from the database sees the new data, and that
+    a hash re-cached from the old row before the commit is not kept. The hash is
+    dropped before the version is bumped, so a response cached under the new
+    version is never built from it.
+
+    Args:
+        session (Session): The session that committed.
+    """
+    for meal_id in session.info.pop("changed_meals", ()):
+        cache_client.unlink(f"meal_{meal_id}")
+        bump_meal_version(cache_client, meal_id)
+        cache_client.publish(MEAL_UPDATES_CHANNEL, meal_id)
+
+def discard_changed_meals(session):
+    """
+    Forget the changed meals of a transaction that was rolled back.
+
+    Args:
+        session (Session): The session that rolled back.
+    """
+    session.info.pop("changed_meals", None)
+    session.info.pop("meals_written", None)
+
+def mark_meals_written(mapper, connection, target):
+    """
+    Remember that a transaction wrote a meal, so the cached listings are invalidated when it commits.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The instance of the Meals model that was written.
+    """
+    object_session(target).info["meals_written"] = True
+
+def invalidate_meal_listings(session):
+    """
+    Bump the catalog version after a transaction that wrote meals commits, superseding the cached
+    leaderboards and catalog pages.
+
+    Args:
+        session (Session): The session that committed.
+    """
+    if session.info.pop("meals_written", False):
+        # Seed a missing version from the clock, as get_catalog_version does, so incr cannot restart it at 1
+        cache_client.set(MEAL_CATALOG_VERSION_KEY, time.time_ns(), nx=True)
+        cache_client.incr(MEAL_CATALOG_VERSION_KEY)
+
 # Register the listener for update and delete events
 event.listen(Meals, 'after_update', update_cache_for_meal)
-event.listen(Meals, 'after_delete', update_cache_for_meal)
\ No newline at end of file
+event.listen(Meals, 'after_delete', update_cache_for_meal)
+event.listen(Meals, 'after_update', track_changed_meal)
+event.listen(Meals, 'after_delete', track_changed_meal)
+event.listen(db.session, 'after_commit', publish_changed_meals)
+event.listen(db.session, 'after_rollback', discard_changed_meals)
+event.listen(Meals, 'after_insert', mark_meals_written)
+event.listen(Meals, 'after_update', mark_meals_written)
+event.listen(Meals, 'after_delete', mark_meals_written)
+event.listen(db.session, 'after_commit', invalidate_meal_listings)
+
+def update_search_index_for_meal(mapper, connection, target):
+    """
+    Keep the full-text search index in sync after a meal is inserted or updated.
+
+    Registered for the `after_insert` and `after_update` events on the Meals model.
+    The index row shares its rowid with the meal ID, so the old entry is removed
+    and re-added only if the meal has not been soft deleted. Updates that leave
+    the name, cuisine and deleted flag alone, such as battle stats, skip the index.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush, so the
+                                 index write happens in the same transaction.
+        target (Meals): The instance of the Meals model that was written.
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    attrs = inspect(target).attrs
+    if not (attrs.meal.history.has_changes() or attrs.cuisine.history.has_changes() or attrs.deleted.history.has_changes()):
+        return
+    connection.execute(text("DELETE FROM meals_fts WHERE rowid = :id"), {"id": target.id})
+    if not target.deleted:
+        connection.execute(
+            text("INSERT INTO meals_fts (rowid, meal, cuisine) VALUES (:id, :meal, :cuisine)"),
+            {"id": target.id, "meal": target.meal, "cuisine": target.cuisine or ""}
+        )
+
+def remove_meal_from_search_index(mapper, connection, target):
+    """
+    Remove a hard-deleted meal from the full-text search index.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The instance of the Meals model that was deleted.
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+    connection.execute(text("DELETE FROM meals_fts WHERE rowid = :id"), {"id": target.id})
+
+# The search index is an FTS5 virtual table with prefix indexes so that short
+# autocomplete queries don't have to scan the full term list
+CREATE_MEALS_FTS = "CREATE VIRTUAL TABLE IF NOT EXISTS meals_fts USING fts5(meal, cuisine, prefix='2 3')"
+
+event.listen(Meals.__table__, 'after_create', DDL(CREATE_MEALS_FTS).execute_if(dialect='sqlite'))
+event.listen(
+    Meals.__table__,
+    'after_drop',
+    DDL("DROP TABLE IF EXISTS meals_fts").execute_if(dialect='sqlite')
+)
+event.listen(Meals, 'after_insert', update_search_index_for_meal)
+event.listen(Meals, 'after_update', update_search_index_for_meal)
+event.listen(Meals, 'after_delete', remove_meal_from_search_index)
+
+def upgrade_meals_schema() -> None:
+    """
+    Bring an existing database up to the current Meals model. Safe to run on every startup.
+
+    `db.create_all()` only creates missing tables, so a database created by an
+    older version (e.g. on a persistent volume) is upgraded here: columns added
+    to meals since are added (existing meals start at the initial Elo rating),
+    missing indexes are created, the search index is created if missing and
+    any live meal not yet in it is indexed.
+    """
+    with db.engine.begin() as connection:
+        table = Meals.__table__
+        existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+        added_columns = {
+            # NOT NULL needs a default to fill the existing rows
+            "elo": f"FLOAT NOT NULL DEFAULT {INITIAL_RATING}",
+            "deleted_at": table.c.deleted_at.type.compile(dialect=connection.dialect),
+        }
+        for name, definition in added_columns.items():
+            if name not in existing:
+                logger.info("Adding column meals.%s", name)
+                connection.execute(text(f"ALTER TABLE meals ADD COLUMN {name} {definition}"))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text(CREATE_MEALS_FTS))
+            indexed = connection.execute(
+                text(
+                    "INSERT INTO meals_fts (rowid, meal, cuisine) "
+                    "SELECT id, meal, COALESCE(cuisine, '') FROM meals "
+                    "WHERE deleted = 0 AND id NOT IN (SELECT rowid FROM meals_fts)"
+                )
+            ).rowcount
+            if indexed:
+                logger.info("Added %d existing meals to the search index", indexed)
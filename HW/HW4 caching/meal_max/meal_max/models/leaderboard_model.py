@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from typing import Any, List
+
+from meal_max.models.kitchen_model import LEADERBOARD_SORTS, Meals
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class LeaderboardSnapshot:
+    """
+    In-process snapshots of the leaderboard, so reads never wait on the database.
+
+    Each sort order has its own snapshot, served until it is older than
+    `max_staleness` seconds and then rebuilt from `Meals.get_leaderboard` by the
+    first reader to notice. A refresher thread (see `start_refresher`) rebuilds
+    the snapshots that have been read before they go stale, so under steady
+    traffic readers do not rebuild at all. A staleness of 0 disables snapshots.
+
+    Attributes:
+        max_staleness (float): The oldest snapshot, in seconds, a reader may be served.
+        rebuilds (int): The number of snapshots built so far.
+    """
+
+    def __init__(self, max_staleness: float = 0.0):
+        self.max_staleness = max_staleness
+        self.rebuilds = 0
+        self._snapshots: dict[str, tuple[List[dict[str, Any]], float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def get(self, sort_by: str = "wins") -> tuple[List[dict[str, Any]], float]:
+        """
+        Retrieve the leaderboard from the current snapshot, rebuilding it if it is too old.
+
+        Args:
+            sort_by (str, optional): 'wins' (default), 'win_pct' or 'elo'.
+
+        Returns:
+            tuple: The leaderboard and the age of its snapshot in seconds.
+
+        Raises:
+            ValueError: If an invalid sort_by parameter is provided.
+        """
+        if sort_by not in LEADERBOARD_SORTS:
+            logger.error("Invalid sort_by parameter: %s", sort_by)
+            raise ValueError(f"Invalid sort_by parameter: {sort_by}")
+        if self.max_staleness <= 0:
+            return Meals.get_leaderboard(sort_by), 0.0
+
+        snapshot = self._snapshots.get(sort_by)
+        if snapshot is None or time.monotonic() - snapshot[1] > self.max_staleness:
+            with self._lock:
+                # Another reader may have rebuilt it while this one waited
+                snapshot = self._snapshots.get(sort_by)
+                if snapshot is None or time.monotonic() - snapshot[1] > self.max_staleness:
+                    snapshot = self._rebuild(sort_by)
+        leaderboard, built_at = snapshot
+        return leaderboard, time.monotonic() - built_at
+
+    def _rebuild(self, sort_by: str) -> tuple[List[dict[str, Any]], float]:
+        """Build and publish a new snapshot for one sort order."""
+        built_at = time.monotonic()
+        snapshot = (Meals.get_leaderboard(sort_by), built_at)
+        self._snapshots[sort_by] = snapshot
+        self.rebuilds += 1
+        logger.debug("Leaderboard snapshot rebuilt for %s", sort_by)
+        return snapshot
+
+    def refresh(self) -> None:
+        """
+        Rebuild every snapshot that has been read, regardless of its age.
+        """
+        for sort_by in list(self._snapshots):
+            with self._lock:
+                self._rebuild(sort_by)
+
+    def start_refresher(self, app, interval: float = None) -> threading.Thread:
+        """
+        Start a daemon thread that refreshes the snapshots before they go stale.
+
+        Args:
+            app (Flask): The application whose context the rebuilds run in.
+            interval (float, optional): Seconds between refreshes. Defaults to half of max_staleness.
+
+        Returns:
+            threading.Thread: The started refresher thread.
+        """
+        interval = interval or self.max_staleness / 2
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                with app.app_context():
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        logger.error("Leaderboard snapshot refresh failed: %s", str(e))
+
+        thread = threading.Thread(target=run, name="leaderboard-refresher", daemon=True)
+        thread.start()
+        logger.info("Leaderboard refresher started with a %.1f second interval", interval)
+        return thread
+
+    def stop_refresher(self) -> None:
+        """
+        Stop the refresher thread started by `start_refresher`, if any.
+        """
+        self._stop.set()
@@ -0,0 +1,319 @@
+import logging
+import threading
+import time
+from typing import Any, List
+
+from sqlalchemy import event, func, insert, inspect, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from meal_max.db import begin_write, db
+from meal_max.models.kitchen_model import Meals
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+DIMENSIONS = ("cuisine", "difficulty")
+
+
+class MealStats(db.Model):
+    """
+    Running totals of live (non-deleted) meals grouped by cuisine and by difficulty.
+
+    Each row holds the totals for one value of one dimension, e.g.
+    ('cuisine', 'Italian') or ('difficulty', 'HIGH'). Rows are maintained
+    incrementally by the Meals mapper listeners below, so reads never have to
+    aggregate the meals table.
+    """
+    __tablename__ = 'meal_stats'
+
+    dimension = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(50), primary_key=True)
+    meals = db.Column(db.Integer, nullable=False, default=0)
+    battles = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    price_total = db.Column(db.Float, nullable=False, default=0.0)
+
+    @classmethod
+    def get_stats(cls, dimension: str = "cuisine") -> List[dict[str, Any]]:
+        """
+        Retrieve the aggregated meal stats for every value of a dimension.
+
+        Args:
+            dimension (str, optional): 'cuisine' (default) or 'difficulty'.
+
+        Returns:
+            List[dict]: One entry per value with meal count, battles, wins,
+                        average price and win percentage.
+
+        Raises:
+            ValueError: If an invalid dimension is provided.
+        """
+        if dimension not in DIMENSIONS:
+            logger.error("Invalid stats dimension: %s", dimension)
+            raise ValueError(f"Invalid dimension: {dimension}. Must be 'cuisine' or 'difficulty'.")
+
+        rows = cls.query.filter_by(dimension=dimension).filter(cls.meals > 0).order_by(cls.value).all()
+        stats = [
+            {
+                dimension: row.value,
+                'meals': row.meals,
+                'battles': row.battles,
+                'wins': row.wins,
+                'avg_price': round(row.price_total / row.meals, 2),
+                'win_pct': round((row.wins / row.battles) * 100, 1) if row.battles > 0 else 0
+            }
+            for row in rows
+        ]
+        logger.info("Meal stats retrieved by %s", dimension)
+        return stats
+
+    @classmethod
+    def reconcile(cls) -> int:
+        """
+        Check the running totals against a full aggregate of the meals table.
+
+        Any row that has drifted (or is missing, or no longer has meals) is
+        rewritten from the SQL aggregate. The write lock is taken before the
+        aggregate, so no delta can commit between the read and the rewrite.
+
+        Returns:
+            int: The number of rows that had to be corrected.
+        """
+        begin_write(db.session)
+        actual = {(row.dimension, row.value): row for row in cls.query.with_for_update().all()}
+        expected = {}
+        for dimension in DIMENSIONS:
+            column = getattr(Meals, dimension)
+            query = db.session.query(
+                column,
+                func.count(Meals.id),
+                func.coalesce(func.sum(Meals.battles), 0),
+                func.coalesce(func.sum(Meals.wins), 0),
+                func.coalesce(func.sum(Meals.price), 0.0)
+            ).filter(Meals.deleted.is_(False)).group_by(column)
+            for value, meals, battles, wins, price_total in query:
+                expected[(dimension, value or "")] = (meals, battles, wins, price_total)
+
+        corrections = 0
+        for key in expected.keys() | actual.keys():
+            meals, battles, wins, price_total = expected.get(key, (0, 0, 0, 0.0))
+            row = actual.get(key)
+            if row is None:
+                row = cls(dimension=key[0], value=key[1])
+                db.session.add(row)
+            elif (row.meals, row.battles, row.wins) == (meals, battles, wins) \
+                    and abs(row.price_total - price_total) < 1e-6:
+                continue
+            logger.warning("Meal stats drift for %s=%s, correcting", key[0], key[1])
+            row.meals, row.battles, row.wins, row.price_total = meals, battles, wins, price_total
+            corrections += 1
+
+        db.session.commit()
+        logger.info("Meal stats reconciled with %d corrections", corrections)
+        return corrections
+
+
+def start_stats_reconciler(app, interval: int) -> threading.Thread:
+    """
+    Start a daemon thread that reconciles the meal stats every `interval` seconds.
+
+    The first reconciliation runs immediately, which also backfills the totals
+    for a database that predates the meal_stats table.
+
+    Args:
+        app (Flask): The application whose context the reconciler runs in.
+        interval (int): Seconds to wait between reconciliations.
+
+    Returns:
+        threading.Thread: The started reconciler thread.
+    """
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    MealStats.reconcile()
+                except Exception as e:
+                    logger.error("Meal stats reconciliation failed: %s", str(e))
+                    db.session.rollback()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="meal-stats-reconciler", daemon=True)
+    thread.start()
+    logger.info("Meal stats reconciler started with a %d second interval", interval)
+    return thread
+
+
+def _contribution(target: Meals, old: bool) -> dict[str, Any]:
+    """
+    Compute what a meal adds to the running totals, before or after a flush.
+
+    Args:
+        target (Meals): The meal being written.
+        old (bool): Whether to use the values from before the pending change.
+
+    Returns:
+        dict: The meal's dimension values and counters, or None if it contributes nothing.
+    """
+    state = inspect(target)
+
+    def value(key):
+        history = state.attrs[key].history
+        if old and history.deleted:
+            return history.deleted[0]
+        if old and history.added:
+            # The attribute had no loaded value before this flush
+            return None
+        return getattr(target, key)
+
+    if value("deleted"):
+        return None
+    return {
+        "cuisine": value("cuisine") or "",
+        "difficulty": value("difficulty"),
+        "meals": 1,
+        "battles": value("battles") or 0,
+        "wins": value("wins") or 0,
+        "price_total": value("price") or 0.0
+    }
+
+def _upsert_statement(dialect_name: str, dimension: str, value: str, counters: dict[str, Any]):
+    """
+    Build a statement that adds counters to a totals row, creating the row if it is missing.
+
+    Args:
+        dialect_name (str): The name of the database dialect, e.g. 'sqlite'.
+        dimension (str): The dimension of the row.
+        value (str): The dimension value of the row.
+        counters (dict): The amounts to add, by column.
+
+    Returns:
+        Insert: The upsert, or None if the dialect has no upsert construct.
+    """
+    table = MealStats.__table__
+    if dialect_name in ('sqlite', 'postgresql'):
+        dialect = sqlite if dialect_name == 'sqlite' else postgresql
+        stmt = dialect.insert(table).values(dimension=dimension, value=value, **counters)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.dimension, table.c.value],
+            set_={key: table.c[key] + stmt.excluded[key] for key in counters}
+        )
+    if dialect_name in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table).values(dimension=dimension, value=value, **counters)
+        return stmt.on_duplicate_key_update({key: table.c[key] + stmt.inserted[key] for key in counters})
+    return None
+
+def _apply(connection, contribution: dict[str, Any], sign: int) -> None:
+    """
+    Add (or subtract) a meal's contribution to the running totals of every dimension.
+
+    Args:
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        contribution (dict): The output of `_contribution`.
+        sign (int): 1 to add the contribution, -1 to remove it.
+    """
+    table = MealStats.__table__
+    counters = {key: sign * contribution[key] for key in ("meals", "battles", "wins", "price_total")}
+    for dimension in DIMENSIONS:
+        value = contribution[dimension]
+        stmt = _upsert_statement(connection.dialect.name, dimension, value, counters)
+        if stmt is not None:
+            connection.execute(stmt)
+            continue
+        # Without an upsert, add to the row and create it if the update matched nothing
+        result = connection.execute(
+            update(table)
+            .where(table.c.dimension == dimension, table.c.value == value)
+            .values({key: table.c[key] + counters[key] for key in counters})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(dimension=dimension, value=value, **counters))
+
+def update_stats_on_insert(mapper, connection, target):
+    """
+    Add a newly created meal to the running totals.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The meal that was inserted.
+    """
+    contribution = _contribution(target, old=False)
+    if contribution:
+        _apply(connection, contribution, 1)
+
+def update_stats_on_update(mapper, connection, target):
+    """
+    Move a meal's contribution from its old values to its new values.
+
+    This covers stat updates, edits to cuisine, difficulty or price, and soft deletes.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The meal that was updated.
+    """
+    before = _contribution(target, old=True)
+    after = _contribution(target, old=False)
+    if before == after:
+        return
+    if before:
+        _apply(connection, before, -1)
+    if after:
+        _apply(connection, after, 1)
+
+def update_stats_on_delete(mapper, connection, target):
+    """
+    Remove a hard-deleted meal from the running totals.
+
+    Args:
+        mapper (Mapper): The SQLAlchemy Mapper object (automatically passed by SQLAlchemy).
+        connection (Connection): The SQLAlchemy Connection used for the flush.
+        target (Meals): The meal that was deleted.
+    """
+    contribution = _contribution(target, old=True)
+    if contribution:
+        _apply(connection, contribution, -1)
+
+def apply_bulk_stat_deltas(session):
+    """
+    Add the stat deltas queued by `Meals.apply_results` to the running totals before commit.
+
+    The bulk path writes meals with Core UPDATEs, which bypass the mapper
+    listeners, so the deltas are aggregated per (cuisine, difficulty) and
+    applied in the same transaction instead.
+
+    Args:
+        session (Session): The session about to commit.
+    """
+    deltas = session.info.pop("meal_stat_deltas", None)
+    if not deltas:
+        return
+    totals: dict[tuple[str, str], list[int]] = {}
+    for delta in deltas:
+        total = totals.setdefault((delta["cuisine"], delta["difficulty"]), [0, 0])
+        total[0] += delta["battles"]
+        total[1] += delta["wins"]
+
+    connection = session.connection()
+    for (cuisine, difficulty), (battles, wins) in totals.items():
+        contribution = {"cuisine": cuisine, "difficulty": difficulty, "meals": 0,
+                        "battles": battles, "wins": wins, "price_total": 0.0}
+        _apply(connection, contribution, 1)
+
+def discard_bulk_stat_deltas(session):
+    """
+    Forget the queued stat deltas of a transaction that was rolled back.
+
+    Args:
+        session (Session): The session that rolled back.
+    """
+    session.info.pop("meal_stat_deltas", None)
+
+event.listen(Meals, 'after_insert', update_stats_on_insert)
+event.listen(Meals, 'after_update', update_stats_on_update)
+event.listen(Meals, 'after_delete', update_stats_on_delete)
+event.listen(db.session, 'before_commit', apply_bulk_stat_deltas)
+event.listen(db.session, 'after_rollback', discard_bulk_stat_deltas)
@@ -1,6 +1,9 @@
+import json
 import logging
+import os
 from typing import Any, List
 
+from meal_max.clients.cache_client import cache_client
 from meal_max.clients.mongo_client import sessions_collection
 from meal_max.utils.logger import configure_logger
 
@@ -9,6 +12,19 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", 3600))  # Seconds a cached session outlives its last write
+
+
+def cache_session(user_id: int, combatants: List[Any]) -> None:
+    """
+    Cache a user's saved combatants in front of MongoDB.
+
+    Args:
+        user_id (int): The ID of the user.
+        combatants (List[Any]): The combatants stored in the user's session document.
+    """
+    cache_client.set(f"session:{user_id}", json.dumps(combatants), ex=SESSION_CACHE_TTL)
+
 def login_user(user_id: int, battle_model) -> None:
     """
     Load the user's combatants from MongoDB into the BattleModel's combatants list.
@@ -20,13 +36,23 @@ def login_user(user_id: int, battle_model) -> None:
     If no session is found, it creates a new session document for the user
     with an empty combatants list in MongoDB.
 
+    Sessions are cached (see `cache_session`), so a repeat login within
+    SESSION_CACHE_TTL does not query MongoDB.
+
     Args:
         user_id (int): The ID of the user whose session is to be loaded.
         battle_model (BattleModel): An instance of `BattleModel` where the user's combatants
                                     will be loaded.
     """
     logger.info("Attempting to log in user with ID %d.", user_id)
-    session = sessions_collection.find_one({"user_id": user_id})
+    cached_combatants = cache_client.get(f"session:{user_id}")
+    if cached_combatants:
+        logger.info("Session for user ID %d retrieved from cache.", user_id)
+        session = {"user_id": user_id, "combatants": json.loads(cached_combatants)}
+    else:
+        session = sessions_collection.find_one({"user_id": user_id})
+        if session:
+            cache_session(user_id, session.get("combatants", []))
 
     if session:
         logger.info("Session found for user ID %d. Loading combatants into BattleModel.", user_id)
@@ -38,6 +64,7 @@ def login_user(user_id: int, battle_model) -> None:
     else:
         logger.info("No session found for user ID %d. Creating a new session with empty combatants list.", user_id)
         sessions_collection.insert_one({"user_id": user_id, "combatants": []})
+        cache_session(user_id, [])
         logger.info("New session created for user ID %d.", user_id)
 
 def logout_user(user_id: int, battle_model) -> None:
@@ -72,6 +99,7 @@ def logout_user(user_id: int, battle_model) -> None:
     if result.matched_count == 0:
         logger.error("No session found for user ID %d. Logout failed.", user_id)
         raise ValueError(f"User with ID {user_id} not found for logout.")
+    cache_session(user_id, combatants_data)
 
     logger.info("Combatants successfully saved for user ID %d. Clearing BattleModel combatants.", user_id)
     battle_model.clear_combatants()
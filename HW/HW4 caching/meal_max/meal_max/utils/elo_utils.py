@@ -0,0 +1,79 @@
+import logging
+from typing import Sequence
+
+import numpy as np
+
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+INITIAL_RATING = 1500.0
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    """
+    Computes the probability that a meal beats its opponent under the Elo model.
+
+    Args:
+        rating (float): The meal's rating.
+        opponent_rating (float): The opponent's rating.
+
+    Returns:
+        float: The expected score between 0 and 1.
+    """
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400.0))
+
+def update_ratings(winner_rating: float, loser_rating: float, k_factor: float) -> tuple[float, float]:
+    """
+    Applies a single battle result to a pair of ratings.
+
+    Args:
+        winner_rating (float): The winner's rating before the battle.
+        loser_rating (float): The loser's rating before the battle.
+        k_factor (float): The maximum rating change per battle.
+
+    Returns:
+        tuple: The new (winner_rating, loser_rating).
+    """
+    delta = k_factor * (1.0 - expected_score(winner_rating, loser_rating))
+    return winner_rating + delta, loser_rating - delta
+
+def replay_ratings(winners: np.ndarray, losers: np.ndarray, num_meals: int, k_factors: Sequence[float],
+                   initial_rating: float = INITIAL_RATING) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Recomputes ratings from a battle history for several K-factors at once.
+
+    Battles are applied in order, but every K-factor is updated in the same
+    vectorized step, so tuning K costs a single pass over the history. The
+    log loss of each K-factor's predictions (made before each battle) is
+    returned alongside the ratings to compare them.
+
+    Args:
+        winners (np.ndarray): Winner indexes into the ratings array, one per battle.
+        losers (np.ndarray): Loser indexes into the ratings array, one per battle.
+        num_meals (int): The size of the ratings array.
+        k_factors (Sequence[float]): The K-factors to evaluate.
+        initial_rating (float, optional): The starting rating of every meal.
+
+    Returns:
+        tuple: The final ratings with shape (len(k_factors), num_meals) and the
+               mean log loss per K-factor with shape (len(k_factors),).
+    """
+    k = np.asarray(k_factors, dtype=np.float64)
+    ratings = np.full((len(k), num_meals), initial_rating, dtype=np.float64)
+    log_loss = np.zeros(len(k), dtype=np.float64)
+
+    for winner, loser in zip(winners.tolist(), losers.tolist()):
+        expected = 1.0 / (1.0 + 10 ** ((ratings[:, loser] - ratings[:, winner]) / 400.0))
+        log_loss -= np.log(np.maximum(expected, 1e-12))
+        delta = k * (1.0 - expected)
+        ratings[:, winner] += delta
+        ratings[:, loser] -= delta
+
+    if len(winners):
+        log_loss /= len(winners)
+    logger.info("Replayed %d battles for %d K-factors", len(winners), len(k))
+    return ratings, log_loss
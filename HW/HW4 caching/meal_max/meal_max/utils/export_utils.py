@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+import logging
+from typing import Iterator, Optional
+
+from meal_max.models.kitchen_model import Meals
+from meal_max.utils.logger import configure_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+EXPORT_COLUMNS = ["id", "meal", "cuisine", "price", "difficulty", "battles", "wins", "deleted"]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_meals(fmt: str = "csv", deleted: Optional[bool] = False, min_battles: int = 0,
+                 batch_size: int = 1000) -> Iterator[bytes]:
+    """
+    Serialize the meals table as a stream of byte chunks.
+
+    Each chunk covers one batch of rows from `Meals.iter_meal_batches`, so
+    memory use stays constant regardless of the number of meals.
+
+    Args:
+        fmt (str, optional): 'csv' (default), 'ndjson' or 'parquet'.
+        deleted (bool, optional): Only export meals with this deleted flag, or all meals if None.
+        min_battles (int, optional): Only export meals with at least this many battles.
+        batch_size (int, optional): The number of rows per chunk. Defaults to 1000.
+
+    Returns:
+        Iterator[bytes]: The serialized export.
+
+    Raises:
+        ValueError: If the format is unknown, or Parquet is requested without pyarrow installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        logger.error("Invalid export format: %s", fmt)
+        raise ValueError(f"Invalid format: {fmt}. Must be one of {', '.join(EXPORT_FORMATS)}.")
+    if fmt == "parquet" and pa is None:
+        logger.error("Parquet export requested but pyarrow is not installed")
+        raise ValueError("Parquet export requires pyarrow to be installed.")
+
+    batches = Meals.iter_meal_batches(deleted=deleted, min_battles=min_battles, batch_size=batch_size)
+    logger.info("Exporting meals as %s", fmt)
+    if fmt == "csv":
+        return _export_csv(batches)
+    if fmt == "ndjson":
+        return _export_ndjson(batches)
+    return _export_parquet(batches)
+
+def _export_csv(batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _export_ndjson(batches) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in batch).encode()
+
+class _StreamSink(io.RawIOBase):
+    """
+    A write-only file that hands its bytes off in chunks.
+
+    Unlike a BytesIO that is truncated between reads, the reported position keeps
+    growing, which the Parquet writer relies on for the offsets in the footer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _export_parquet(batches) -> Iterator[bytes]:
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("meal", pa.string()),
+        ("cuisine", pa.string()),
+        ("price", pa.float64()),
+        ("difficulty", pa.string()),
+        ("battles", pa.int64()),
+        ("wins", pa.int64()),
+        ("deleted", pa.bool_()),
+    ])
+    sink = _StreamSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            ))
+            # Hand off each row group as soon as it is written
+            yield sink.drain()
+    yield sink.drain()
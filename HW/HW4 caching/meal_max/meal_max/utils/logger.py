@@ -1,26 +1,141 @@
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
 import sys
+import threading
+import time
 
 from flask import current_app, has_request_context
 
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 10))  # Sampled records per second, per statement
+
+# Pass as `extra=SAMPLED` on hot-path log statements to rate-limit them
+SAMPLED = {"sampled": True}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits log records marked with `extra=SAMPLED`.
+
+    Each sampled statement (identified by logger name and message template) gets
+    a token bucket refilled at `rate` records per second. Unmarked records always pass.
+
+    Attributes:
+        rate (float): The number of records per second allowed for each statement.
+        suppressed (int): The number of records dropped so far.
+    """
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+        self.suppressed = 0
+        self._buckets: dict[tuple[str, str], tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True
+            self._buckets[key] = (tokens, now)
+            self.suppressed += 1
+            return False
+
+
+_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+_sampling_filter = SamplingFilter()
+_configured_loggers: list[logging.Logger] = []
+
+
+def _get_queue_handler() -> QueueHandler:
+    """
+    Returns the shared queue handler, starting the background writer on first use.
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+    Records are formatted on the calling thread and written to stderr by a single
+    QueueListener thread, which is stopped (and drained) at interpreter exit.
+    """
+    global _queue_handler, _listener
+    with _lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            # Create a console handler that logs to stderr, with a timestamp
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+            _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+            _queue_handler = QueueHandler(log_queue)
+        return _queue_handler
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+
+def restart_log_writer() -> None:
+    """
+    Starts a fresh background writer in a forked child process.
+
+    The listener thread does not survive fork, so without this a worker forked
+    by a pre-forking server (see gunicorn.conf.py) would queue records that
+    are never written.
+    """
+    global _listener
+    with _lock:
+        if _queue_handler is None:
+            return
+        atexit.unregister(_listener.stop)
+        _queue_handler.queue = queue.SimpleQueue()
+        _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def configure_logger(logger):
+    logger.setLevel(LOG_LEVEL)
+
+    # All loggers share one queue handler, so calling this twice never duplicates output
+    handler = _get_queue_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    if _sampling_filter not in logger.filters:
+        logger.addFilter(_sampling_filter)
+    if logger not in _configured_loggers:
+        _configured_loggers.append(logger)
 
     if has_request_context():
         app_logger = current_app.logger
         for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
+
+
+def set_log_level(level: str) -> None:
+    """
+    Sets the level of every logger configured through `configure_logger`.
+
+    Args:
+        level (str): The level name, e.g. 'INFO'.
+    """
+    for logger in _configured_loggers:
+        logger.setLevel(level.upper())
+
+
+def set_sample_rate(rate: float) -> None:
+    """
+    Sets the per-statement rate limit for sampled log records.
+
+    Args:
+        rate (float): Sampled records allowed per second for each statement.
+    """
+    _sampling_filter.rate = rate
@@ -0,0 +1,148 @@
+from collections import deque
+import logging
+import re
+import threading
+import time
+from typing import Any, List
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Normalize a SQL statement so that repeats of the same query compare equal.
+
+    Inline string and number literals are replaced with '?' and whitespace is collapsed.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement.
+    """
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+class QueryProfiler:
+    """
+    Records the SQL statements issued by each request.
+
+    Hooks the SQLAlchemy `before_cursor_execute` / `after_cursor_execute` events
+    of the app's engine. For every request it keeps the statement count, the
+    per-statement durations grouped by normalized SQL, N+1 candidates (the same
+    normalized statement executed `n_plus_one_threshold` or more times) and slow
+    queries along with their EXPLAIN output.
+
+    Attributes:
+        slow_query_ms (float): Statements slower than this are logged with their plan.
+        n_plus_one_threshold (int): Repeats of one statement that flag an N+1 candidate.
+        profiles (deque): The most recent request profiles, newest last.
+    """
+
+    def __init__(self, slow_query_ms: float = 50.0, n_plus_one_threshold: int = 3, history: int = 100):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.profiles: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask, engine) -> None:
+        """
+        Attach the profiler to an app and its SQLAlchemy engine.
+
+        Args:
+            app (Flask): The application whose requests are profiled.
+            engine (Engine): The engine whose statements are recorded.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        logger.info("SQL profiling enabled (slow query threshold %.1f ms)", self.slow_query_ms)
+
+    def get_profiles(self) -> List[dict[str, Any]]:
+        """
+        Retrieve the recorded request profiles.
+
+        Returns:
+            List[dict]: The most recent request profiles, newest first.
+        """
+        with self._lock:
+            return list(reversed(self.profiles))
+
+    def clear(self) -> None:
+        """
+        Discards all recorded request profiles.
+        """
+        with self._lock:
+            self.profiles.clear()
+
+    def _start_request(self) -> None:
+        g.sql_queries = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if conn.info.get("profiler_explaining") or not has_request_context() or "sql_queries" not in g:
+            return
+
+        query = {"sql": normalize_sql(statement), "ms": elapsed_ms}
+        if elapsed_ms >= self.slow_query_ms:
+            query["plan"] = self._explain(conn, statement, parameters)
+            logger.warning("Slow query (%.1f ms): %s\nPlan: %s", elapsed_ms, query["sql"], query["plan"])
+        g.sql_queries.append(query)
+
+    def _explain(self, conn, statement: str, parameters) -> List[str]:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return []
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        conn.info["profiler_explaining"] = True
+        try:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+            return [" ".join(str(column) for column in row) for row in rows]
+        except Exception as e:
+            logger.debug("Could not explain query: %s", str(e))
+            return []
+        finally:
+            conn.info["profiler_explaining"] = False
+
+    def _finish_request(self, response):
+        queries = g.pop("sql_queries", None)
+        if queries is None:
+            return response
+
+        statements: dict[str, dict[str, Any]] = {}
+        for query in queries:
+            entry = statements.setdefault(query["sql"], {"sql": query["sql"], "count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += query["ms"]
+
+        n_plus_one = [entry["sql"] for entry in statements.values() if entry["count"] >= self.n_plus_one_threshold]
+        for sql in n_plus_one:
+            logger.warning("Possible N+1 on %s %s: %s", request.method, request.path, sql)
+
+        profile = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "statement_count": len(queries),
+            "total_ms": round(sum(query["ms"] for query in queries), 3),
+            "statements": sorted(statements.values(), key=lambda entry: entry["total_ms"], reverse=True),
+            "n_plus_one": n_plus_one,
+            "slow_queries": [query for query in queries if "plan" in query]
+        }
+        with self._lock:
+            self.profiles.append(profile)
+        return response
@@ -1,7 +1,7 @@
 import logging
 import requests
 
-from meal_max.utils.logger import configure_logger
+from meal_max.utils.logger import SAMPLED, configure_logger
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
@@ -22,7 +22,7 @@ def get_random() -> float:
 
     try:
         # Log the request to random.org
-        logger.info("Fetching random number from %s", url)
+        logger.info("Fetching random number from %s", url, extra=SAMPLED)
 
         response = requests.get(url, timeout=5)
 
@@ -36,7 +36,7 @@ def get_random() -> float:
         except ValueError:
             raise ValueError("Invalid response from random.org: %s" % random_number_str)
 
-        logger.info("Received random number: %.3f", random_number)
+        logger.info("Received random number: %.3f", random_number, extra=SAMPLED)
         return random_number
 
     except requests.exceptions.Timeout:
@@ -2,8 +2,15 @@ import pytest
 
 from app import create_app
 from config import TestConfig
+from meal_max.clients.cache_backends import MemoryCache
+from meal_max.clients.cache_client import cache_client
 from meal_max.db import db
 
+@pytest.fixture(autouse=True)
+def memory_cache():
+    """Back the cache with a fresh in-process store, so no test needs a Redis server."""
+    cache_client.use(MemoryCache())
+
 @pytest.fixture
 def app():
     app = create_app(TestConfig)
@@ -20,4 +27,18 @@ def client(app):
 @pytest.fixture
 def session(app):
     with app.app_context():
-        yield db.session
\ No newline at end of file
+        yield db.session
+
+@pytest.fixture
+def file_db(tmp_path):
+    """An app on a database file, so a second connection can try to write while a transaction is open."""
+    path = tmp_path / "app.db"
+
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        yield str(path)
+        db.session.remove()
+        db.drop_all()
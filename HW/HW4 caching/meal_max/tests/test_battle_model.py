@@ -126,7 +126,7 @@ def test_battle(battle_model, sample_combatants, sample_meal1, sample_meal2, cap
     # Mock the battle functions
     mocker.patch("meal_max.models.battle_model.BattleModel.get_battle_score", side_effect=[85.5, 102.0])
     mocker.patch("meal_max.models.battle_model.get_random", return_value=0.42)
-    mock_update_stats = mocker.patch("meal_max.models.battle_model.Meals.update_meal_stats")
+    mock_record_battle = mocker.patch("meal_max.models.battle_model.Meals.record_battle")
 
     # Mock the TTLs to simulate unexpired cache
     battle_model.combatant_ttls = {
@@ -142,9 +142,8 @@ def test_battle(battle_model, sample_combatants, sample_meal1, sample_meal2, cap
     # Ensure the winner is combatant_2 since score_2 > score_1
     assert winner_meal == "Pizza", f"Expected combatant 2 to win, but got {winner_meal}"
 
-    # Ensure update_stats was called correctly for both winner and loser
-    mock_update_stats.assert_any_call(1, 'loss')  # combatant_1 is the loser
-    mock_update_stats.assert_any_call(2, 'win')   # combatant_2 is the winner
+    # Ensure the battle was recorded with combatant_2 as the winner and combatant_1 as the loser
+    mock_record_battle.assert_called_once_with(2, 1)
 
     # Check that combatant_1 was removed from the combatants list
     assert len(battle_model.combatants) == 1, "Losing combatant was not removed from the list."
@@ -169,4 +168,50 @@ def test_battle_with_one_combatant(battle_model, sample_meal1):
 
     # Call the battle method and expect a ValueError
     with pytest.raises(ValueError, match="Two combatants must be prepped for a battle."):
-        battle_model.battle()
\ No newline at end of file
+        battle_model.battle()
+
+##########################################################
+# Cache invalidation
+##########################################################
+
+def test_handle_meal_update_marks_cached_combatant(battle_model, sample_meal1):
+    """Test that a change event only marks combatants that are cached."""
+    battle_model.prep_combatant(sample_meal1)
+
+    battle_model.handle_meal_update(b"1")
+    battle_model.handle_meal_update(b"99")
+
+    assert battle_model.stale_combatants == {1}
+    assert battle_model.refresh_counts["events"] == 1
+
+def test_battle_refreshes_only_changed_combatants(battle_model, sample_meal1, sample_meal2, mocker):
+    """Test that only combatants with a change event are refetched before a battle."""
+    battle_model.prep_combatant(sample_meal1)
+    battle_model.prep_combatant(sample_meal2)
+    updated_meal1 = dict(sample_meal1, price=20.0)
+    mock_get_meal = mocker.patch("meal_max.models.battle_model.Meals.get_meal_by_id", return_value=updated_meal1)
+    mocker.patch("meal_max.models.battle_model.get_random", return_value=0.42)
+    mocker.patch("meal_max.models.battle_model.Meals.record_battle")
+
+    battle_model.handle_meal_update(1)
+    battle_model.battle()
+
+    mock_get_meal.assert_called_once_with(1)
+    assert battle_model.meals_cache[1]["price"] == 20.0
+    assert battle_model.refresh_counts == {"events": 1, "event_refreshes": 1, "ttl_refreshes": 0}
+    assert battle_model.stale_combatants == set()
+
+def test_battle_refreshes_on_ttl_expiry(sample_meal1, sample_meal2, mocker):
+    """Test that the TTL still refreshes combatants when no event arrives."""
+    battle_model = BattleModel(ttl=0)
+    battle_model.prep_combatant(sample_meal1)
+    battle_model.prep_combatant(sample_meal2)
+    mock_get_meal = mocker.patch("meal_max.models.battle_model.Meals.get_meal_by_id", side_effect=[sample_meal1, sample_meal2])
+    mocker.patch("meal_max.models.battle_model.get_random", return_value=0.42)
+    mocker.patch("meal_max.models.battle_model.Meals.record_battle")
+
+    time.sleep(0.01)
+    battle_model.battle()
+
+    assert mock_get_meal.call_count == 2
+    assert battle_model.refresh_counts["ttl_refreshes"] == 2
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from meal_max.clients.cache_backends import MemoryCache, RedisCache
+from meal_max.clients.cache_client import CacheClient, create_backend
+
+
+def test_memory_cache_returns_bytes_like_redis():
+    """Test that strings and hashes come back as bytes, as from the Redis client."""
+    cache = MemoryCache()
+    cache.set("meal_name:Pizza", 2)
+    cache.hset("meal_2", mapping={"meal": "Pizza", b"price": 15.0})
+
+    assert cache.get("meal_name:Pizza") == b"2"
+    assert cache.hgetall("meal_2") == {b"meal": b"Pizza", b"price": b"15.0"}
+    assert cache.get("missing") is None
+    assert cache.hgetall("missing") == {}
+
+def test_memory_cache_delete_and_expiry():
+    """Test that deleted and expired keys are gone."""
+    cache = MemoryCache()
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("short", "3", ex=0)
+
+    assert cache.unlink("a", "missing") == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+    assert cache.get("short") is None
+
+def test_memory_cache_incr_and_set_nx():
+    """Test counters and set-if-absent, as used for the catalog version."""
+    cache = MemoryCache()
+    assert cache.incr("version") == 1
+    assert cache.incr("version", 5) == 6
+    assert cache.get("version") == b"6"
+
+    assert cache.set("version", 100, nx=True) is None
+    assert cache.set("other", 100, nx=True) is True
+    assert cache.get("version") == b"6"
+    assert cache.get("other") == b"100"
+
+def test_memory_cache_pipeline():
+    """Test that a pipeline applies its queued calls in order and returns their results."""
+    cache = MemoryCache()
+    pipe = cache.pipeline()
+    pipe.set("a", "1")
+    pipe.get("a")
+    pipe.delete("a")
+
+    assert cache.get("a") is None  # Nothing is applied before execute
+    assert pipe.execute() == [True, b"1", 1]
+    assert cache.get("a") is None
+
+def test_memory_cache_pubsub():
+    """Test that published messages reach the handler on the subscriber thread."""
+    cache = MemoryCache()
+    received = []
+    delivered = threading.Event()
+
+    def handler(message):
+        received.append(message["data"])
+        delivered.set()
+
+    pubsub = cache.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(meal_updates=handler)
+    thread = pubsub.run_in_thread(daemon=True)
+
+    assert cache.publish("meal_updates", 7) == 1
+    assert delivered.wait(1)
+    assert received == [b"7"]
+
+    thread.stop()
+    thread.join(1)
+    assert cache.publish("meal_updates", 8) == 0
+
+def test_memory_cache_thread_safe():
+    """Test that concurrent writers to one hash do not lose fields."""
+    cache = MemoryCache()
+
+    def write(worker):
+        for i in range(500):
+            cache.hset("shared", mapping={f"{worker}:{i}": i})
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache.hgetall("shared")) == 2000
+
+def test_create_backend():
+    """Test selecting backends by name."""
+    assert isinstance(create_backend("memory"), MemoryCache)
+    assert isinstance(create_backend("redis"), RedisCache)
+    with pytest.raises(ValueError, match="Invalid cache backend: memcached"):
+        create_backend("memcached")
+
+def test_cache_client_follows_app_config(app):
+    """Test that the app's CACHE_BACKEND selects the backend calls are forwarded to."""
+    client = CacheClient()
+    client.init_app(app)
+    client.set("key", "value")
+
+    assert isinstance(client.backend, MemoryCache)
+    assert client.backend.get("key") == b"value"
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from meal_max.utils.elo_utils import expected_score, replay_ratings, update_ratings
+
+
+def test_expected_score_equal_ratings():
+    """Test that evenly rated meals are expected to draw."""
+    assert expected_score(1500, 1500) == 0.5
+
+def test_update_ratings_zero_sum():
+    """Test that the winner gains exactly what the loser gives up."""
+    winner, loser = update_ratings(1500, 1500, 32)
+    assert winner == pytest.approx(1516)
+    assert loser == pytest.approx(1484)
+
+def test_update_ratings_upset_moves_more():
+    """Test that an underdog win moves the ratings more than an expected win."""
+    upset, _ = update_ratings(1400, 1600, 32)
+    expected, _ = update_ratings(1600, 1400, 32)
+    assert upset - 1400 > expected - 1600
+
+def test_replay_ratings_matches_incremental():
+    """Test that the batch replay matches applying each battle incrementally."""
+    winners = np.array([0, 0, 1, 2, 0])
+    losers = np.array([1, 2, 2, 1, 1])
+    ratings, log_loss = replay_ratings(winners, losers, 3, [16, 32])
+
+    incremental = [1500.0, 1500.0, 1500.0]
+    for winner, loser in zip(winners, losers):
+        incremental[winner], incremental[loser] = update_ratings(incremental[winner], incremental[loser], 32)
+    assert ratings[1] == pytest.approx(incremental)
+    assert ratings.shape == (2, 3)
+    assert log_loss.shape == (2,)
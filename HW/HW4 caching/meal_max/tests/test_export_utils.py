@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+import pytest
+
+from meal_max.models.kitchen_model import Meals
+from meal_max.utils.export_utils import export_meals
+
+
+@pytest.fixture
+def sample_meals(session, mocker):
+    mocker.patch('meal_max.models.kitchen_model.cache_client')
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW", battles=2, wins=1)
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+    Meals.create_meal("Gruel", "British", 1.0, "LOW")
+    Meals.delete_meal(4)
+
+
+def test_export_csv_includes_unbattled(sample_meals):
+    """Test that the CSV export includes meals that have never battled."""
+    rows = list(csv.DictReader(io.StringIO(b"".join(export_meals("csv", batch_size=2)).decode())))
+    assert [row["meal"] for row in rows] == ["Spaghetti", "Pizza", "Tacos"]
+    assert rows[0]["wins"] == "7"
+
+def test_export_ndjson_filters(sample_meals):
+    """Test the deleted and min_battles filters."""
+    rows = [json.loads(line) for line in b"".join(export_meals("ndjson", min_battles=5)).splitlines()]
+    assert [row["meal"] for row in rows] == ["Spaghetti"]
+
+    rows = [json.loads(line) for line in b"".join(export_meals("ndjson", deleted=True)).splitlines()]
+    assert [row["meal"] for row in rows] == ["Gruel"]
+    assert rows[0]["deleted"] is True
+
+    rows = [json.loads(line) for line in b"".join(export_meals("ndjson", deleted=None)).splitlines()]
+    assert len(rows) == 4
+
+def test_export_parquet(sample_meals):
+    """Test that the streamed Parquet chunks form a readable file."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    parquet_file = pq.ParquetFile(io.BytesIO(b"".join(export_meals("parquet", batch_size=2))))
+    assert parquet_file.read().column("meal").to_pylist() == ["Spaghetti", "Pizza", "Tacos"]
+    assert parquet_file.num_row_groups == 2
+
+def test_export_csv_empty(session):
+    """Test that an empty export still has a header row."""
+    assert b"".join(export_meals("csv")) == b"id,meal,cuisine,price,difficulty,battles,wins,deleted\r\n"
+
+def test_export_bad_format():
+    """Test exporting with an invalid format."""
+    with pytest.raises(ValueError, match="Invalid format: xml"):
+        export_meals("xml")
+
+def test_export_route(client, sample_meals):
+    """Test the streaming export route and its parameter validation."""
+    response = client.get('/api/export/meals?format=ndjson&deleted=all')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert len(response.get_data().splitlines()) == 4
+
+    assert client.get('/api/export/meals?deleted=maybe').status_code == 400
+    assert client.get('/api/export/meals?min_battles=-1').status_code == 400
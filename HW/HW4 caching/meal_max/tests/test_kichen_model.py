@@ -1,12 +1,22 @@
 from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+import json
+import sqlite3
 
 import pytest
+from sqlalchemy import event, text
 
-from meal_max.models.kitchen_model import Meals
+from meal_max.clients.cache_client import cache_client
+from meal_max.db import db
+from meal_max.models.kitchen_model import MEAL_UPDATES_CHANNEL, BattleResults, Meals, MealsArchive, upgrade_meals_schema
 
 @pytest.fixture
 def mock_redis_client(mocker):
-    return mocker.patch('meal_max.models.kitchen_model.redis_client')
+    mock_client = mocker.patch('meal_max.models.kitchen_model.cache_client')
+    # Start from an empty cache
+    mock_client.get.return_value = None
+    mock_client.hgetall.return_value = {}
+    return mock_client
 
 ######################################################
 #
@@ -180,7 +190,7 @@ def test_get_meal_by_name_cache_miss(session, mock_redis_client):
     # Retrieve meal by name; expect DB lookup and caching of both ID and meal data
     result = Meals.get_meal_by_name("Spaghetti")
     mock_redis_client.get.assert_called_once_with("meal_name:Spaghetti")
-    mock_redis_client.set.assert_called_once_with("meal_name:Spaghetti", str(meal.id))
+    mock_redis_client.set.assert_any_call("meal_name:Spaghetti", str(meal.id))
     mock_redis_client.hset.assert_called_once_with(f"meal_{meal.id}", mapping={k: str(v) for k, v in asdict(meal).items()})
     assert result["meal"] == "Spaghetti"
 
@@ -331,3 +341,569 @@ def test_get_leaderboard_bad_sort():
     """Test retrieving the leaderboard with an invalid sort option."""
     with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid_sort"):
         Meals.get_leaderboard(sort_by="invalid_sort")
+
+def test_get_leaderboard_cached_until_meal_written(session):
+    """Test that the leaderboard is served from the cache until a meal change commits."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    assert [meal["wins"] for meal in Meals.get_leaderboard()] == [7]
+    assert cache_client.get(f"leaderboard:wins:{Meals.get_catalog_version()}")
+
+    session.execute(Meals.__table__.update().values(wins=8))  # Bypasses the listeners
+    session.commit()
+    assert [meal["wins"] for meal in Meals.get_leaderboard()] == [7]
+
+    Meals.update_meal_stats(1, 'win')
+    assert cache_client.get(f"leaderboard:wins:{Meals.get_catalog_version()}") is None
+    assert [meal["wins"] for meal in Meals.get_leaderboard()] == [9]
+
+def test_get_leaderboard_computed_before_write_not_served(session, mocker):
+    """Test that a leaderboard cached after a write committed under the old version is never served."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    version = Meals.get_catalog_version()
+    stale = Meals.get_leaderboard()
+
+    Meals.update_meal_stats(1, 'win')
+    cache_client.set(f"leaderboard:wins:{version}", json.dumps(stale))  # The slow reader's late write
+
+    assert [meal["wins"] for meal in Meals.get_leaderboard()] == [8]
+
+######################################################
+#
+#    Search
+#
+######################################################
+
+def test_search_meals_prefix(session, mock_redis_client):
+    """Test that every search term is matched as a prefix of the name or cuisine."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+
+    results = Meals.search_meals("spag")
+    assert [meal["meal"] for meal in results] == ["Spaghetti"]
+
+    results = Meals.search_meals("mex")
+    assert [meal["meal"] for meal in results] == ["Tacos"]
+
+def test_search_meals_ranked(session, mock_redis_client):
+    """Test that meals matching on more terms are ranked first."""
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.create_meal("Pizza Italiana", "Italian", 18.0, "MED")
+
+    results = Meals.search_meals("pizza ital")
+    assert results[0]["meal"] == "Pizza Italiana"
+
+def test_search_meals_index_follows_updates(session, mock_redis_client):
+    """Test that updates and soft deletes keep the search index in sync."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+
+    Meals.update_meal(meal.id, cuisine="Fusion")
+    assert Meals.search_meals("ital") == []
+    assert Meals.search_meals("fus")[0]["meal"] == "Spaghetti"
+
+    Meals.delete_meal(meal.id)
+    assert Meals.search_meals("spag") == []
+
+def test_search_index_untouched_by_stats_update(session, mock_redis_client):
+    """Test that a battle stats update does not rewrite the meal's search index entry."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_statement)
+    try:
+        Meals.update_meal_stats(meal.id, "win")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_statement)
+
+    assert statements and not any("meals_fts" in statement for statement in statements)
+    assert Meals.search_meals("spag")[0]["meal"] == "Spaghetti"
+
+def test_upgrade_creates_and_backfills_search_index(session, mock_redis_client):
+    """Test that a database created before the search index gets one, holding its existing meals."""
+    session.execute(text("DROP TABLE meals_fts"))
+    session.execute(text(
+        "INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins, deleted, elo) "
+        "VALUES ('Spaghetti', 'Italian', 12.5, 'MED', 0, 0, 0, 1500), ('Tacos', 'Mexican', 8.0, 'LOW', 0, 0, 1, 1500)"
+    ))
+    session.commit()
+
+    upgrade_meals_schema()
+    upgrade_meals_schema()
+
+    assert [meal["meal"] for meal in Meals.search_meals("spag")] == ["Spaghetti"]
+    assert Meals.search_meals("tac") == []
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    assert len(Meals.search_meals("ital")) == 2
+
+def test_upgrade_adds_missing_columns(session, mock_redis_client):
+    """Test that a meals table created before Elo ratings and deletion times gains both columns."""
+    session.execute(text("DROP TABLE meals"))
+    session.execute(text(
+        "CREATE TABLE meals (id INTEGER PRIMARY KEY, meal VARCHAR(80) NOT NULL UNIQUE, cuisine VARCHAR(50), "
+        "price FLOAT NOT NULL, difficulty VARCHAR(10) NOT NULL, battles INTEGER, wins INTEGER, deleted BOOLEAN)"
+    ))
+    session.execute(text("INSERT INTO meals VALUES (1, 'Spaghetti', 'Italian', 12.5, 'MED', 3, 2, 0)"))
+    session.commit()
+
+    upgrade_meals_schema()
+    upgrade_meals_schema()
+
+    meal = session.get(Meals, 1)
+    assert (meal.battles, meal.elo, meal.deleted_at) == (3, 1500.0, None)
+    indexes = {row[0] for row in session.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert {"ix_meals_elo", "ix_meals_live_wins"} <= indexes
+    Meals.delete_meal(1)
+    assert session.get(Meals, 1).deleted_at is not None
+
+def test_search_meals_empty_query():
+    """Test searching with a query that contains no terms."""
+    with pytest.raises(ValueError, match="Search query must contain at least one term"):
+        Meals.search_meals("   ")
+
+######################################################
+#
+#    Response cache
+#
+######################################################
+
+@pytest.fixture
+def dict_redis_client(mock_redis_client):
+    """Back the mocked Redis client's string and hash commands with dicts."""
+    strings, hashes = {}, {}
+    mock_redis_client.get.side_effect = strings.get
+    def set_string(key, value, ex=None, nx=False):
+        if not (nx and key in strings):
+            strings[key] = value if isinstance(value, bytes) else str(value).encode()
+    mock_redis_client.set.side_effect = set_string
+    mock_redis_client.incr.side_effect = lambda key: set_string(key, int(strings.get(key, 0)) + 1)
+    mock_redis_client.pipeline.return_value = mock_redis_client
+    mock_redis_client.hgetall.side_effect = lambda key: hashes.get(key, {})
+    mock_redis_client.hset.side_effect = lambda key, mapping: hashes.__setitem__(
+        key, {str(k).encode(): str(v).encode() for k, v in mapping.items()})
+    mock_redis_client.unlink.side_effect = lambda *keys: [(strings.pop(key, None), hashes.pop(key, None)) for key in keys]
+    return strings
+
+def test_meal_response_cache_matches_uncached(client, session, dict_redis_client):
+    """Test that cached response bytes are identical to the uncached response."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+
+    uncached = client.get('/api/get-meal-by-id/1')
+    assert f"meal_response:1:{Meals.get_meal_version(1)}" in dict_redis_client
+    cached = client.get('/api/get-meal-by-id/1')
+    assert cached.status_code == 200
+    assert cached.mimetype == 'application/json'
+    assert cached.get_data() == uncached.get_data()
+
+    by_name = client.get('/api/get-meal-by-name/Spaghetti')
+    assert by_name.get_data() == uncached.get_data()
+
+def test_meal_response_cache_invalidated_on_write(client, session, dict_redis_client):
+    """Test that writes to a meal drop its cached responses."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    client.get('/api/get-meal-by-id/1')
+    client.get('/api/get-meal-by-name/Spaghetti')
+
+    Meals.update_meal_stats(1, 'win')
+    assert client.get('/api/get-meal-by-id/1').get_json()['meal']['wins'] == 1
+    assert client.get('/api/get-meal-by-name/Spaghetti').get_json()['meal']['wins'] == 1
+
+    Meals.delete_meal(1)
+    assert client.get('/api/get-meal-by-id/1').status_code == 500
+
+def test_meal_response_cache_ignores_late_write(client, session, dict_redis_client):
+    """Test that a response built before a write and cached after it is never served."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    version = Meals.get_meal_version(1)
+    stale = Meals.get_meal_by_id(1)
+
+    Meals.update_meal_stats(1, 'win')
+    Meals.cache_response(stale, b'stale', version)
+
+    assert client.get('/api/get-meal-by-id/1').get_json()['meal']['wins'] == 1
+
+def test_meal_hash_recached_before_commit_not_served(client, session, mock_redis_client, dict_redis_client):
+    """Test that a meal hash cached from the old row between the flush and the commit is dropped."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = session.get(Meals, 1)
+    stale = {k: str(v) for k, v in asdict(meal).items()}
+
+    meal.battles += 1
+    meal.wins += 1
+    session.flush()
+    # A reader on another connection still sees the committed row and caches it
+    mock_redis_client.hset("meal_1", mapping=stale)
+    session.commit()
+
+    assert client.get('/api/get-meal-by-id/1').get_json()['meal']['wins'] == 1
+    assert int(Meals.get_meal_by_id(1)['wins']) == 1  # Hash fields come back as strings
+
+######################################################
+#
+#    Elo ratings
+#
+######################################################
+
+def test_record_battle(session, mock_redis_client):
+    """Test that a battle updates both meals' stats, their ratings and the history together."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+
+    Meals.record_battle(1, 2)
+    winner, loser = session.get(Meals, 1), session.get(Meals, 2)
+    assert (winner.battles, winner.wins, winner.elo) == (1, 1, pytest.approx(1516))
+    assert (loser.battles, loser.wins, loser.elo) == (1, 0, pytest.approx(1484))
+    assert BattleResults.query.count() == 1
+
+def test_record_battle_is_atomic(session, mock_redis_client):
+    """Test that a battle against a deleted meal records nothing for the winner."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal 2 has been deleted"):
+        Meals.record_battle(1, 2)
+    session.expire_all()
+    winner = session.get(Meals, 1)
+    assert (winner.battles, winner.wins, winner.elo) == (0, 0, 1500.0)
+    assert BattleResults.query.count() == 0
+
+def test_recompute_ratings(session, mock_redis_client):
+    """Test that recomputing from history reproduces the incremental ratings."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    for winner, loser in [(1, 2), (1, 2), (2, 1)]:
+        Meals.record_battle(winner, loser)
+    incremental = [session.get(Meals, meal_id).elo for meal_id in (1, 2)]
+
+    Meals.recompute_ratings(k_factor=16)
+    session.expire_all()
+    assert session.get(Meals, 1).elo != pytest.approx(incremental[0])
+
+    Meals.recompute_ratings()
+    session.expire_all()
+    assert [session.get(Meals, meal_id).elo for meal_id in (1, 2)] == pytest.approx(incremental)
+
+def test_tune_k_factor(session, mock_redis_client):
+    """Test that tuning reports a log loss for each candidate K-factor."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    for _ in range(5):
+        Meals.record_battle(1, 2)
+
+    scores = Meals.tune_k_factor([8, 64])
+    assert scores[64] < scores[8]
+
+def test_get_leaderboard_sort_elo(session):
+    """Test that a veteran with a higher rating outranks a single lucky win."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+    for _ in range(5):
+        Meals.record_battle(1, 2)
+    Meals.record_battle(3, 1)
+
+    leaderboard = Meals.get_leaderboard(sort_by="elo")
+    assert [meal["meal"] for meal in leaderboard] == ["Spaghetti", "Tacos", "Pizza"]
+
+def test_meal_change_published_after_commit(session, mock_redis_client):
+    """Test that changed meal IDs are published once the change is committed."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    mock_redis_client.publish.assert_not_called()
+
+    Meals.update_meal_stats(1, 'win')
+    mock_redis_client.publish.assert_called_once_with(MEAL_UPDATES_CHANNEL, 1)
+
+def test_meal_change_not_published_on_rollback(session, mock_redis_client):
+    """Test that changes that are rolled back are not published."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = session.get(Meals, 1)
+    meal.price = 20.0
+    session.flush()
+    session.rollback()
+    session.commit()
+
+    mock_redis_client.publish.assert_not_called()
+
+######################################################
+#
+#    Batched results
+#
+######################################################
+
+def test_apply_results_matches_incremental(session, mock_redis_client):
+    """Test that a batch produces the same stats and ratings as applying results one at a time."""
+    for name in ("Spaghetti", "Pizza", "Tacos"):
+        Meals.create_meal(name, "Italian", 12.5, "MED")
+    results = [(1, 2), (1, 3), (3, 2), (2, 1)]
+    for winner, loser in results:
+        Meals.record_battle(winner, loser)
+    expected = [(meal.battles, meal.wins, meal.elo) for meal in Meals.query.order_by(Meals.id)]
+
+    for meal in Meals.query.all():
+        meal.battles, meal.wins, meal.elo = 0, 0, 1500.0
+    session.commit()
+
+    applied = Meals.apply_results([{"winner_id": w, "loser_id": l} for w, l in results], chunk_size=2)
+    assert applied == {"results": 4, "meals": 3}
+    actual = [(meal.battles, meal.wins, meal.elo) for meal in Meals.query.order_by(Meals.id)]
+    assert [row[:2] for row in actual] == [row[:2] for row in expected]
+    assert [row[2] for row in actual] == pytest.approx([row[2] for row in expected])
+    assert BattleResults.query.count() == 8
+
+def test_apply_results_refreshes_cache(session, mock_redis_client):
+    """Test that applied results refresh the cached meals in one pipeline and are published."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    mock_redis_client.reset_mock()
+
+    Meals.apply_results([{"winner_id": 1, "loser_id": 2}, {"winner_id": 1, "loser_id": 2}])
+
+    pipe = mock_redis_client.pipeline.return_value
+    pipe.execute.assert_called_once()
+    pipe.unlink.assert_any_call("meal_1")
+    pipe.hset.assert_any_call("meal:1", mapping={
+        b"id": b"1", b"meal": b"Spaghetti", b"cuisine": b"Italian", b"price": b"12.5",
+        b"difficulty": b"MED", b"battles": b"2", b"wins": b"2", b"deleted": b"False"
+    })
+    published = {call.args[1] for call in mock_redis_client.publish.call_args_list}
+    assert published == {1, 2}
+
+def test_apply_results_deleted_meal(session, mock_redis_client):
+    """Test that a batch referencing a deleted meal is rejected without applying anything."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal 2 not found"):
+        Meals.apply_results([{"winner_id": 1, "loser_id": 2}])
+    assert session.get(Meals, 1).battles == 0
+    assert BattleResults.query.count() == 0
+
+def test_apply_results_meal_deleted_while_writing(session, mock_redis_client):
+    """Test that a meal deleted after the batch was checked fails the whole batch."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+
+    def delete_before_write(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("UPDATE meals"):
+            cursor.connection.execute("UPDATE meals SET deleted = 1 WHERE id = 2")
+
+    event.listen(db.engine, "before_cursor_execute", delete_before_write)
+    try:
+        with pytest.raises(ValueError, match="Meals were deleted while applying results"):
+            Meals.apply_results([{"winner_id": 1, "loser_id": 2}])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", delete_before_write)
+    session.expire_all()
+    assert (session.get(Meals, 1).battles, session.get(Meals, 2).battles) == (0, 0)
+    assert BattleResults.query.count() == 0
+
+def test_apply_results_holds_write_lock(file_db, mock_redis_client):
+    """Test that no battle can commit between reading the meals' ratings and writing them back."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    blocked = []
+
+    def write_before_write_back(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("UPDATE meals"):
+            other = sqlite3.connect(file_db, timeout=0)
+            try:
+                other.execute("UPDATE meals SET elo = elo + 100")
+                other.commit()
+                blocked.append(False)
+            except sqlite3.OperationalError:
+                blocked.append(True)
+            finally:
+                other.close()
+
+    event.listen(db.engine, "before_cursor_execute", write_before_write_back)
+    try:
+        Meals.apply_results([{"winner_id": 1, "loser_id": 2}])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", write_before_write_back)
+    assert blocked == [True]
+    assert db.session.get(Meals, 1).elo == pytest.approx(1516)
+
+def test_apply_results_invalid_result():
+    """Test error when a result is malformed."""
+    with pytest.raises(ValueError, match="Invalid result at index 1"):
+        Meals.apply_results([{"winner_id": 1, "loser_id": 2}, {"winner_id": 1}])
+    with pytest.raises(ValueError, match="a meal cannot battle itself"):
+        Meals.apply_results([{"winner_id": 1, "loser_id": 1}])
+
+def test_apply_results_route(client, session, mock_redis_client):
+    """Test applying results through the API."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+
+    response = client.post("/api/apply-results", json={"results": [{"winner_id": 2, "loser_id": 1}]})
+    assert response.status_code == 200
+    assert response.json == {"status": "results applied", "results": 1, "meals": 2}
+
+    response = client.post("/api/apply-results", json={"results": [{"winner_id": 2, "loser_id": 9}]})
+    assert response.status_code == 400
+
+######################################################
+#
+#    Archival
+#
+######################################################
+
+def test_delete_meal_records_deleted_at(session, mock_redis_client):
+    """Test that soft deleting a meal records when it was deleted."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.delete_meal(1)
+    assert session.get(Meals, 1).deleted_at is not None
+
+def test_archive_deleted_meals(session, mock_redis_client):
+    """Test that only deleted meals past the retention window are moved to the archive."""
+    for name in ("Spaghetti", "Pizza", "Tacos"):
+        Meals.create_meal(name, "Italian", 12.5, "MED")
+    Meals.update_meal_stats(1, 'win')
+    Meals.delete_meal(1)
+    Meals.delete_meal(2)
+    session.get(Meals, 1).deleted_at = datetime.now(timezone.utc) - timedelta(days=31)
+    session.commit()
+
+    assert Meals.archive_deleted_meals(retention_days=30) == 1
+
+    assert [meal.meal for meal in Meals.query.order_by(Meals.id)] == ["Pizza", "Tacos"]
+    archived = session.get(MealsArchive, 1)
+    assert (archived.meal, archived.wins, archived.battles) == ("Spaghetti", 1, 1)
+    assert archived.archived_at is not None
+    mock_redis_client.pipeline.return_value.unlink.assert_called_once_with(
+        "meal_1", "meal:1", "meal_name:Spaghetti"
+    )
+    mock_redis_client.pipeline.return_value.incr.assert_called_once_with("meal_version:1")
+
+def test_archive_deleted_meals_batches(session, mock_redis_client):
+    """Test that archiving in small batches moves every eligible meal and frees their names."""
+    for i in range(5):
+        Meals.create_meal(f"Meal {i}", "Italian", 12.5, "MED")
+        Meals.delete_meal(i + 1)
+
+    assert Meals.archive_deleted_meals(retention_days=0, batch_size=2) == 5
+    assert Meals.query.count() == 0
+    assert MealsArchive.query.count() == 5
+    assert mock_redis_client.pipeline.return_value.execute.call_count == 3
+
+    Meals.create_meal("Meal 0", "Italian", 12.5, "MED")
+
+def test_archive_deleted_meals_invalid_args():
+    """Test error when archiving with an invalid retention window or batch size."""
+    with pytest.raises(ValueError, match="Invalid retention_days: -1"):
+        Meals.archive_deleted_meals(retention_days=-1)
+    with pytest.raises(ValueError, match="Invalid batch_size: 0"):
+        Meals.archive_deleted_meals(batch_size=0)
+
+def test_recompute_ratings_after_archive(session, mock_redis_client):
+    """Test that battles against archived meals still count toward their opponents' ratings."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.record_battle(1, 2)
+    rating = session.get(Meals, 1).elo
+    Meals.delete_meal(2)
+    Meals.archive_deleted_meals(retention_days=0)
+
+    Meals.recompute_ratings()
+    session.expire_all()
+    assert session.get(Meals, 1).elo == pytest.approx(rating)
+
+def test_leaderboard_uses_live_meals_index(session):
+    """Test that the leaderboard query is served by the partial index over live meals."""
+    query = Meals.query.filter_by(deleted=False).filter(Meals.battles > 0).order_by(Meals.wins.desc())
+    compiled = query.statement.compile(dialect=session.connection().dialect)
+    plan = session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[key] for key in compiled.positiontup)
+    ).all()
+    assert any("ix_meals_live_wins" in row[-1] for row in plan)
+
+######################################################
+#
+#    Catalog listing
+#
+######################################################
+
+def test_list_meals_filters_and_pages(session):
+    """Test filtering the catalog by cuisine, difficulty and price, cheapest first, one page at a time."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.create_meal("Risotto", "Italian", 18.0, "MED")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "MED")
+    Meals.create_meal("Lasagna", "Italian", 11.0, "MED")
+    Meals.delete_meal(5)
+
+    page = Meals.list_meals(cuisine="Italian", difficulty="MED", min_price=10, page=1, per_page=1)
+    assert [meal["meal"] for meal in page["meals"]] == ["Spaghetti"]
+    assert page["total"] == 2
+    assert [meal["meal"] for meal in Meals.list_meals(cuisine="Italian", difficulty="MED", page=2, per_page=1)["meals"]] == ["Risotto"]
+    assert [meal["meal"] for meal in Meals.list_meals(max_price=15.0)["meals"]] == ["Tacos", "Spaghetti", "Pizza"]
+    assert Meals.list_meals(page=3, per_page=2)["meals"] == []
+
+def test_list_meals_invalid_params():
+    """Test error when listing the catalog with an invalid filter or page."""
+    with pytest.raises(ValueError, match="Invalid difficulty level: HARD"):
+        Meals.list_meals(difficulty="HARD")
+    with pytest.raises(ValueError, match="Invalid price range"):
+        Meals.list_meals(min_price=20, max_price=10)
+    with pytest.raises(ValueError, match="Invalid page: 0"):
+        Meals.list_meals(page=0)
+    with pytest.raises(ValueError, match="Invalid per_page: 101"):
+        Meals.list_meals(per_page=101)
+
+def test_meals_route_revalidates_with_etag(client, session):
+    """Test that a current ETag gets a 304, and that a meal write changes the ETag."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+
+    first = client.get('/api/meals?cuisine=Italian')
+    assert first.status_code == 200
+    assert first.json["meals"][0]["meal"] == "Spaghetti"
+    etag = first.headers["ETag"]
+
+    cached = client.get('/api/meals?cuisine=Italian')
+    assert cached.get_data() == first.get_data()
+    assert client.get('/api/meals?cuisine=Italian', headers={"If-None-Match": etag}).status_code == 304
+    assert client.get('/api/meals?cuisine=Mexican', headers={"If-None-Match": etag}).status_code == 200
+
+    Meals.update_meal_stats(1, 'win')
+    changed = client.get('/api/meals?cuisine=Italian', headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json["meals"][0]["wins"] == 1
+
+def test_meals_route_invalid_params(client, session):
+    """Test that invalid listing parameters are rejected."""
+    response = client.get('/api/meals?per_page=500')
+    assert response.status_code == 400
+    assert "Invalid per_page: 500" in response.json["error"]
+
+def test_catalog_version_survives_cache_flush(session):
+    """Test that a flushed catalog version restarts at a value not issued before."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    version = Meals.get_catalog_version()
+    cache_client.flushall()
+    assert Meals.get_catalog_version() > version
+
+def test_catalog_version_survives_cache_flush_before_write(session):
+    """Test that a write right after a flush does not restart the catalog version at 1."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    version = Meals.get_catalog_version()
+    cache_client.flushall()
+
+    Meals.update_meal_stats(1, 'win')
+    assert Meals.get_catalog_version() > version
+
+def test_list_meals_uses_catalog_index(session):
+    """Test that a filtered listing is served by the composite catalog index."""
+    query = (Meals.query.filter_by(deleted=False)
+             .filter(Meals.cuisine == "Italian", Meals.difficulty == "MED", Meals.price >= 10)
+             .order_by(Meals.price, Meals.id))
+    compiled = query.statement.compile(dialect=session.connection().dialect)
+    plan = session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[key] for key in compiled.positiontup)
+    ).all()
+    assert any("ix_meals_live_cuisine_difficulty_price" in row[-1] for row in plan)
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from config import TestConfig
+from meal_max.db import db
+from meal_max.models.kitchen_model import Meals
+from meal_max.models.leaderboard_model import LeaderboardSnapshot
+
+
+def test_snapshot_served_until_stale(session):
+    """Test that a snapshot is served, with its age, until it is older than the maximum staleness."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    snapshot = LeaderboardSnapshot(max_staleness=0.2)
+
+    leaderboard, age = snapshot.get("wins")
+    assert [meal["wins"] for meal in leaderboard] == [7]
+    assert age < 0.2
+
+    Meals.update_meal_stats(1, 'win')
+    leaderboard, age = snapshot.get("wins")
+    assert [meal["wins"] for meal in leaderboard] == [7]
+    assert snapshot.rebuilds == 1
+
+    time.sleep(0.25)
+    leaderboard, age = snapshot.get("wins")
+    assert [meal["wins"] for meal in leaderboard] == [8]
+    assert age < 0.2
+    assert snapshot.rebuilds == 2
+
+def test_snapshot_refresh(session):
+    """Test that refreshing rebuilds only the sort orders that have been read."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    snapshot = LeaderboardSnapshot(max_staleness=60)
+    snapshot.get("elo")
+
+    Meals.update_meal_stats(1, 'win')
+    snapshot.refresh()
+
+    leaderboard, _ = snapshot.get("elo")
+    assert leaderboard[0]["wins"] == 8
+    assert snapshot.rebuilds == 2
+
+def test_snapshot_disabled(session):
+    """Test that a maximum staleness of 0 reads the current leaderboard every time."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    snapshot = LeaderboardSnapshot(max_staleness=0)
+    snapshot.get("wins")
+    Meals.update_meal_stats(1, 'win')
+
+    leaderboard, age = snapshot.get("wins")
+    assert leaderboard[0]["wins"] == 8
+    assert age == 0.0
+
+def test_snapshot_bad_sort():
+    """Test error when requesting a snapshot with an invalid sort order."""
+    with pytest.raises(ValueError, match="Invalid sort_by parameter: invalid_sort"):
+        LeaderboardSnapshot(max_staleness=5).get("invalid_sort")
+
+def test_leaderboard_route_reports_snapshot_age(client, session):
+    """Test that the leaderboard response includes the snapshot age."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+
+    response = client.get("/api/leaderboard?sort=win_pct")
+    assert response.status_code == 200
+    assert response.json["leaderboard"][0]["meal"] == "Spaghetti"
+    assert response.json["snapshot_age_s"] == 0.0
+
+def test_sqlite_pragmas_applied(tmp_path):
+    """Test that the configured pragmas are set on every database connection."""
+    config = type("WALConfig", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'wal.db'}",
+        "SQLITE_PRAGMAS": {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 2500},
+    })
+    app = create_app(config)
+    with app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db.session.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert db.session.execute(text("PRAGMA busy_timeout")).scalar() == 2500
+        db.session.remove()
+        db.engine.dispose()
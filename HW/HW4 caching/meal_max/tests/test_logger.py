@@ -0,0 +1,68 @@
+import logging
+import os
+
+from meal_max.utils import logger as logging_utils
+from meal_max.utils.logger import SAMPLED, SamplingFilter, configure_logger, restart_log_writer
+
+
+def make_record(msg, sampled=False):
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, (), None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_configure_logger_no_duplicate_handlers():
+    """Test that configuring a logger twice does not attach a second handler."""
+    logger = logging.getLogger("test_configure_logger_twice")
+    configure_logger(logger)
+    configure_logger(logger)
+    assert len(logger.handlers) == 1
+    assert len(logger.filters) == 1
+
+def test_configured_loggers_share_handler():
+    """Test that every configured logger writes through the same queue handler."""
+    first = logging.getLogger("test_shared_handler_1")
+    second = logging.getLogger("test_shared_handler_2")
+    configure_logger(first)
+    configure_logger(second)
+    assert first.handlers == second.handlers
+
+def test_sampling_filter_rate_limits_sampled_records():
+    """Test that sampled records are limited per statement while others pass."""
+    sampling_filter = SamplingFilter(rate=3)
+
+    assert sum(sampling_filter.filter(make_record("hot %s", sampled=True)) for _ in range(10)) == 3
+    assert sampling_filter.suppressed == 7
+    # A different statement has its own budget
+    assert sampling_filter.filter(make_record("other %s", sampled=True))
+    # Unsampled records are never dropped
+    assert all(sampling_filter.filter(make_record("hot %s")) for _ in range(10))
+
+def test_sampled_extra_marks_record(caplog):
+    """Test that extra=SAMPLED marks the emitted record."""
+    logger = logging.getLogger("test_sampled_extra")
+    with caplog.at_level(logging.INFO, logger="test_sampled_extra"):
+        logger.info("hot path", extra=SAMPLED)
+    assert caplog.records[0].sampled is True
+
+def test_restart_log_writer_in_forked_child(tmp_path):
+    """Test that a forked child writes its records once the log writer is restarted."""
+    logger = logging.getLogger("test_restart_log_writer")
+    configure_logger(logger)
+    output = tmp_path / "child.log"
+    handler = logging_utils._listener.handlers[0]
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            handler.setStream(open(output, "w"))
+            restart_log_writer()
+            logger.warning("written by the child")
+            logging_utils._listener.stop()
+            handler.stream.flush()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+    assert "written by the child" in output.read_text()
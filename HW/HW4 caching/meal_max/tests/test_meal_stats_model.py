@@ -0,0 +1,145 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql, postgresql
+
+from meal_max.db import db
+from meal_max.models.kitchen_model import Meals
+from meal_max.models.meal_stats_model import MealStats, _upsert_statement
+
+
+@pytest.fixture(autouse=True)
+def mock_redis_client(mocker):
+    return mocker.patch('meal_max.models.kitchen_model.cache_client')
+
+def stats_by(dimension):
+    return {row[dimension]: row for row in MealStats.get_stats(dimension)}
+
+
+def test_stats_follow_create(session):
+    """Test that creating meals increments the cuisine and difficulty totals."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW", battles=8, wins=5)
+
+    italian = stats_by("cuisine")["Italian"]
+    assert italian["meals"] == 2
+    assert italian["battles"] == 18
+    assert italian["wins"] == 12
+    assert italian["avg_price"] == 13.75
+
+    difficulties = stats_by("difficulty")
+    assert difficulties["MED"]["battles"] == 10
+    assert difficulties["LOW"]["wins"] == 5
+
+def test_stats_follow_battle_results(session):
+    """Test that stat updates are reflected in the totals."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = Meals.query.one()
+
+    Meals.update_meal_stats(meal.id, 'win')
+    Meals.update_meal_stats(meal.id, 'loss')
+
+    italian = stats_by("cuisine")["Italian"]
+    assert italian["battles"] == 2
+    assert italian["wins"] == 1
+    assert italian["win_pct"] == 50.0
+
+def test_stats_follow_update_and_delete(session):
+    """Test that changing a meal's cuisine moves it, and soft deleting removes it."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=4, wins=2)
+    meal = Meals.query.one()
+
+    Meals.update_meal(meal.id, cuisine="Fusion", price=20.0)
+    cuisines = stats_by("cuisine")
+    assert "Italian" not in cuisines
+    assert cuisines["Fusion"]["avg_price"] == 20.0
+    assert cuisines["Fusion"]["battles"] == 4
+
+    Meals.delete_meal(meal.id)
+    assert MealStats.get_stats("cuisine") == []
+    assert MealStats.get_stats("difficulty") == []
+
+def test_stats_follow_applied_results(session):
+    """Test that batched results update the totals in the same transaction."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED")
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW")
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+
+    Meals.apply_results([{"winner_id": 1, "loser_id": 3}, {"winner_id": 3, "loser_id": 2}])
+
+    cuisines = stats_by("cuisine")
+    assert (cuisines["Italian"]["battles"], cuisines["Italian"]["wins"]) == (2, 1)
+    assert (cuisines["Mexican"]["battles"], cuisines["Mexican"]["wins"]) == (2, 1)
+    assert stats_by("difficulty")["LOW"]["battles"] == 3
+    assert MealStats.reconcile() == 0
+
+def test_reconcile_no_drift(session):
+    """Test that reconciling consistent totals makes no corrections."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    Meals.create_meal("Tacos", "Mexican", 8.0, "LOW")
+
+    assert MealStats.reconcile() == 0
+
+def test_reconcile_fixes_drift(session):
+    """Test that reconciling rewrites totals that drifted from the meals table."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    db.session.execute(MealStats.__table__.update().values(wins=0))
+    db.session.execute(MealStats.__table__.delete().where(MealStats.dimension == "difficulty"))
+    db.session.commit()
+
+    assert MealStats.reconcile() == 2
+    assert stats_by("cuisine")["Italian"]["wins"] == 7
+    assert stats_by("difficulty")["MED"]["wins"] == 7
+
+def test_reconcile_holds_write_lock(file_db):
+    """Test that no write can commit between reconcile's aggregate and its rewrite of the totals."""
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    blocked = []
+
+    def write_during_aggregate(conn, cursor, statement, parameters, context, executemany):
+        if "GROUP BY" in statement:
+            other = sqlite3.connect(file_db, timeout=0)
+            try:
+                other.execute("UPDATE meals SET wins = wins + 1")
+                other.commit()
+                blocked.append(False)
+            except sqlite3.OperationalError:
+                blocked.append(True)
+            finally:
+                other.close()
+
+    event.listen(db.engine, "before_cursor_execute", write_during_aggregate)
+    try:
+        assert MealStats.reconcile() == 0
+    finally:
+        event.remove(db.engine, "before_cursor_execute", write_during_aggregate)
+    assert blocked == [True, True]
+
+@pytest.mark.parametrize("dialect, clause", [
+    (postgresql.dialect(), "ON CONFLICT (dimension, value) DO UPDATE"),
+    (mysql.dialect(), "ON DUPLICATE KEY UPDATE")
+])
+def test_upsert_statement_per_dialect(dialect, clause):
+    """Test that the totals upsert is built with the construct of each database."""
+    stmt = _upsert_statement(dialect.name, "cuisine", "Italian", {"meals": 1, "battles": 0, "wins": 0, "price_total": 12.5})
+    assert clause in str(stmt.compile(dialect=dialect))
+
+def test_upsert_statement_unsupported_dialect():
+    """Test that a database without an upsert construct gets none."""
+    assert _upsert_statement("oracle", "cuisine", "Italian", {"meals": 1}) is None
+
+def test_stats_follow_create_without_upsert(session, monkeypatch):
+    """Test that the totals are kept without an upsert construct."""
+    monkeypatch.setattr("meal_max.models.meal_stats_model._upsert_statement", lambda *args: None)
+    Meals.create_meal("Spaghetti", "Italian", 12.5, "MED", battles=10, wins=7)
+    Meals.create_meal("Pizza", "Italian", 15.0, "LOW", battles=8, wins=5)
+
+    assert stats_by("cuisine")["Italian"]["meals"] == 2
+    assert stats_by("difficulty")["LOW"]["wins"] == 5
+    assert MealStats.reconcile() == 0
+
+def test_get_stats_bad_dimension():
+    """Test retrieving stats with an invalid dimension."""
+    with pytest.raises(ValueError, match="Invalid dimension: price"):
+        MealStats.get_stats("price")
@@ -1,6 +1,6 @@
 import pytest
 
-from meal_max.models.mongo_session_model import login_user, logout_user
+from meal_max.models.mongo_session_model import cache_session, login_user, logout_user
 
 @pytest.fixture
 def sample_user_id():
@@ -67,4 +67,28 @@ def test_logout_user_raises_value_error_if_no_user(mocker, sample_user_id, sampl
         {"user_id": sample_user_id},
         {"$set": {"combatants": sample_combatants}},
         upsert=False
-    )
\ No newline at end of file
+    )
+
+def test_login_user_uses_cached_session(mocker, sample_user_id, sample_combatants):
+    """Test login_user loads combatants from the session cache without querying MongoDB."""
+    cache_session(sample_user_id, sample_combatants)
+    mock_find = mocker.patch("meal_max.clients.mongo_client.sessions_collection.find_one")
+    mock_battle_model = mocker.Mock()
+
+    login_user(sample_user_id, mock_battle_model)
+
+    mock_find.assert_not_called()
+    mock_battle_model.prep_combatant.assert_has_calls([mocker.call(combatant) for combatant in sample_combatants])
+
+def test_logout_user_refreshes_cached_session(mocker, sample_user_id, sample_combatants):
+    """Test that the combatants saved at logout are what the next login loads."""
+    mocker.patch("meal_max.clients.mongo_client.sessions_collection.update_one", return_value=mocker.Mock(matched_count=1))
+    mock_find = mocker.patch("meal_max.clients.mongo_client.sessions_collection.find_one")
+    mock_battle_model = mocker.Mock()
+    mock_battle_model.get_combatants.return_value = sample_combatants
+
+    logout_user(sample_user_id, mock_battle_model)
+    login_user(sample_user_id, mock_battle_model)
+
+    mock_find.assert_not_called()
+    mock_battle_model.prep_combatant.assert_has_calls([mocker.call(combatant) for combatant in sample_combatants])
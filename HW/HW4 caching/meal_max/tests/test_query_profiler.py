@@ -0,0 +1,65 @@
+import pytest
+
+from app import create_app
+from config import TestConfig
+from meal_max.db import db
+from meal_max.utils.query_profiler import normalize_sql
+
+
+class ProfilingConfig(TestConfig):
+    SQL_PROFILING = True
+    SQL_SLOW_QUERY_MS = 0.0  # Treat every statement as slow so plans are captured
+    SQL_N_PLUS_ONE_THRESHOLD = 2
+
+@pytest.fixture
+def profiled_client():
+    app = create_app(ProfilingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def test_normalize_sql():
+    """Test that literals and whitespace are normalized away."""
+    assert normalize_sql("SELECT *\n  FROM meals WHERE id = 12 AND meal = 'Pizza'") == \
+        "SELECT * FROM meals WHERE id = ? AND meal = ?"
+
+def test_debug_route_disabled_by_default(client):
+    """Test that the debug route is not registered without SQL_PROFILING."""
+    assert client.get('/api/debug/queries').status_code == 404
+
+def test_profiles_record_statements(profiled_client):
+    """Test that each request records its statement count and slow query plans."""
+    profiled_client.post('/api/create-meal', json={
+        'meal': 'Spaghetti', 'cuisine': 'Italian', 'price': 12.5, 'difficulty': 'MED'
+    })
+    profiled_client.get('/api/leaderboard')
+
+    profiles = profiled_client.get('/api/debug/queries').get_json()['requests']
+    leaderboard, create = profiles[0], profiles[1]
+    assert create['path'] == '/api/create-meal'
+    assert create['statement_count'] > 0
+    assert leaderboard['path'] == '/api/leaderboard'
+    assert leaderboard['statement_count'] == 1
+    assert leaderboard['slow_queries'][0]['plan']
+
+def test_profiles_flag_n_plus_one(profiled_client, mocker):
+    """Test that repeated identical statements are flagged as N+1 candidates."""
+    mock_redis_client = mocker.patch('meal_max.models.kitchen_model.cache_client')
+    mock_redis_client.get.return_value = None
+    mock_redis_client.hgetall.return_value = {}
+    mocker.patch('meal_max.models.battle_model.get_random', return_value=0.42)
+    for name in ('Spaghetti', 'Pizza'):
+        profiled_client.post('/api/create-meal', json={
+            'meal': name, 'cuisine': 'Italian', 'price': 12.5, 'difficulty': 'MED'
+        })
+        profiled_client.post('/api/prep-combatant', json={'meal': name})
+    profiled_client.delete('/api/debug/queries')
+
+    # The battle loads each combatant's row separately to update its stats
+    profiled_client.get('/api/battle')
+    profile = profiled_client.get('/api/debug/queries').get_json()['requests'][0]
+    assert profile['path'] == '/api/battle'
+    assert any(sql.startswith('SELECT') and 'FROM meals' in sql for sql in profile['n_plus_one'])
@@ -0,0 +1,12 @@
+"""
+WSGI entry point for serving meal_max in production.
+
+    gunicorn wsgi:app
+
+The app is built without its background threads; the hooks in gunicorn.conf.py
+start them in each worker after the preloaded app is forked.
+"""
+from app import create_app
+
+
+app = create_app(background_tasks=False)
@@ -1,9 +1,19 @@
+import atexit
+import os
+import signal
+import sys
+from typing import Optional
+
 from dotenv import load_dotenv
 from flask import Flask, jsonify, make_response, Response, request
 # from flask_cors import CORS
 
 from meal_max.models import kitchen_model
 from meal_max.models.battle_model import BattleModel
+from meal_max.models.stat_writer import STAT_WRITE_BEHIND, start_stat_writer, stop_stat_writer
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.migrations import migrate
+from meal_max.utils.read_replica import READ_REPLICA, get_read_replica, start_read_replica, stop_read_replica
 from meal_max.utils.sql_utils import check_database_connection, check_table_exists
 
 
@@ -19,6 +29,22 @@ app = Flask(__name__)
 # Initialize the BattleModel
 battle_model = BattleModel()
 
+# Bring the database schema up to date once, before serving any request
+migrate()
+
+# Optionally queue battle stats for a background writer. Queued stats are written
+# at exit, so turn SIGTERM (docker stop) into a normal exit that runs atexit handlers.
+if STAT_WRITE_BEHIND:
+    start_stat_writer()
+    atexit.register(stop_stat_writer)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+# Optionally serve meal lookups and the leaderboard from an in-memory copy of the
+# database, refreshed in the background and never more than a few seconds stale
+if READ_REPLICA:
+    start_read_replica()
+    atexit.register(stop_read_replica)
+
 ####################################################
 #
 # Healthchecks
@@ -58,6 +84,21 @@ def db_check() -> Response:
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 404)
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics() -> Response:
+    """
+    Route to get the meal cache's hit, miss, eviction and invalidation counts, and the read replica's.
+
+    Returns:
+        JSON response with the cache statistics, and the replica statistics in replica mode.
+    """
+    app.logger.info('Retrieving metrics')
+    stats = {'status': 'success', 'meal_cache': meal_cache.stats()}
+    replica = get_read_replica()
+    if replica is not None:
+        stats['read_replica'] = replica.stats()
+    return make_response(jsonify(stats), 200)
+
 
 ##########################################################
 #
@@ -195,6 +236,27 @@ def get_meal_by_name(meal_name: str) -> Response:
         return make_response(jsonify({'error': str(e)}), 500)
 
 
+@app.route('/api/meal-stats/<int:meal_id>', methods=['GET'])
+def get_meal_stats(meal_id: int) -> Response:
+    """
+    Route to get a meal's battle stats, including any not yet written by the background writer.
+
+    Path Parameter:
+        - meal_id (int): The ID of the meal.
+
+    Returns:
+        JSON response with the meal's battles, wins and win percentage, or error message.
+    """
+    try:
+        app.logger.info(f"Retrieving stats for meal ID: {meal_id}")
+
+        stats = kitchen_model.get_meal_stats(meal_id)
+        return make_response(jsonify({'status': 'success', 'stats': stats}), 200)
+    except Exception as e:
+        app.logger.error(f"Error retrieving meal stats: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
 ############################################################
 #
 # Battle
@@ -299,24 +361,57 @@ def prep_combatant() -> Response:
 ############################################################
 
 
+def int_arg(name: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    Get an integer query parameter.
+
+    Args:
+        name (str): The parameter's name.
+        default (int, optional): The value when the parameter is missing or empty.
+
+    Returns:
+        int: The parameter's value, or the default.
+
+    Raises:
+        ValueError: If the parameter is not an integer.
+    """
+    value = request.args.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
 @app.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard() -> Response:
     """
-    Route to get the leaderboard of meals sorted by wins, battles, or win percentage.
+    Route to get the leaderboard of meals sorted by wins or win percentage.
 
     Query Parameters:
-        - sort (str): The field to sort by ('wins', 'battles', or 'win_pct'). Default is 'wins'.
+        - sort (str): The field to sort by ('wins' or 'win_pct'). Default is 'wins'.
+        - limit (int): The maximum number of meals to return. Default is all of them.
+        - offset (int): The number of top-ranked meals to skip. Default is 0.
+        - min_battles (int): The fewest battles a ranked meal may have. Default is 1.
 
     Returns:
         JSON response with a sorted leaderboard of meals.
     Raises:
+        400 error if a parameter is invalid.
         500 error if there is an issue generating the leaderboard.
     """
     try:
         sort_by = request.args.get('sort', 'wins')  # Default sort by wins
         app.logger.info("Generating leaderboard sorted by %s", sort_by)
 
-        leaderboard_data = kitchen_model.get_leaderboard(sort_by)
+        try:
+            limit = int_arg('limit')
+            offset = int_arg('offset', 0)
+            min_battles = int_arg('min_battles', 1)
+            leaderboard_data = kitchen_model.get_leaderboard(sort_by, limit=limit, offset=offset, min_battles=min_battles)
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
 
         return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
     except Exception as e:
@@ -324,6 +419,7 @@ def get_leaderboard() -> Response:
         return make_response(jsonify({'error': str(e)}), 500)
 
 
-
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # The reloader serves requests from a child process that never sees SIGTERM,
+    # so its queued stats would be lost; serve from this process in write-behind mode
+    app.run(debug=True, host='0.0.0.0', port=int(os.getenv('PORT', 5000)), use_reloader=not STAT_WRITE_BEHIND)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Connection overhead of the kitchen model: a new connection per call versus the pool.
+
+Runs get_meal_by_id and a battle's worth of model calls (two get_meal_by_name
+and two update_meal_stats) against a temporary database, first with a fresh
+sqlite3 connection opened and closed per call (how get_db_connection used to
+work) and then with the pooled connections, and reports microseconds per
+operation as JSON.
+
+Usage:
+    python benchmarks/connection_overhead.py --iterations 2000
+"""
+import argparse
+from contextlib import contextmanager
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meal_max.models import kitchen_model  # noqa: E402
+from meal_max.utils import sql_utils  # noqa: E402
+from meal_max.utils.migrations import migrate  # noqa: E402
+
+
+@contextmanager
+def connection_per_call():
+    """The unpooled connection provider: open on entry, close on exit."""
+    conn = sqlite3.connect(sql_utils.DB_PATH)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def time_calls(call, iterations: int) -> float:
+    """
+    Times repeated calls.
+
+    Args:
+        call (Callable): The call to time.
+        iterations (int): The number of calls.
+
+    Returns:
+        float: Microseconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def battle():
+    winner = kitchen_model.get_meal_by_name("Spaghetti")
+    loser = kitchen_model.get_meal_by_name("Pizza")
+    kitchen_model.update_meal_stats(winner.id, "win")
+    kitchen_model.update_meal_stats(loser.id, "loss")
+
+def run(iterations: int) -> dict[str, float]:
+    return {
+        "get_meal_by_id_us": time_calls(lambda: kitchen_model.get_meal_by_id(1), iterations),
+        "battle_us": time_calls(battle, iterations),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    report = {"iterations": args.iterations}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sql_utils.DB_PATH = os.path.join(tmpdir, "bench.db")
+        migrate()
+        kitchen_model.create_meal("Spaghetti", "Italian", 12.5, "MED")
+        kitchen_model.create_meal("Pizza", "Italian", 15.0, "LOW")
+
+        with mock.patch.object(kitchen_model, "get_db_connection", connection_per_call):
+            report["connection_per_call"] = run(args.iterations)
+        report["pooled"] = run(args.iterations)
+        sql_utils.close_db_connections()
+
+    print(json.dumps({key: {k: round(v, 1) for k, v in value.items()} if isinstance(value, dict) else value
+                      for key, value in report.items()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
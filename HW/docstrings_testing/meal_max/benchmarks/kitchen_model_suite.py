@@ -0,0 +1,199 @@
+"""
+Times every kitchen_model function against large synthetic catalogs.
+
+For each catalog size, a temporary database is filled with synthetic meals
+(meal_max.utils.synthetic_data, fixed seed) and every function is called
+repeatedly with live meal IDs and names drawn from a seeded RNG. Each case
+runs for at least --min-rounds calls and until --max-time seconds have passed
+(clear_meals runs once, last), and reports the min, median and mean time per
+call in microseconds. The meal cache is disabled, so lookups measure the
+database.
+
+Results are compared with a JSON baseline: a case whose median is more than
+the baseline's threshold times its baseline median is reported as a
+regression, and the exit status is 1. --save writes the results as the new
+baseline instead.
+
+Usage:
+    python benchmarks/kitchen_model_suite.py --sizes 10000 100000 1000000
+    python benchmarks/kitchen_model_suite.py --sizes 10000 --save
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meal_max.models import kitchen_model  # noqa: E402
+from meal_max.utils import sql_utils  # noqa: E402
+from meal_max.utils.meal_cache import meal_cache  # noqa: E402
+from meal_max.utils.migrations import migrate  # noqa: E402
+from meal_max.utils.sql_utils import get_db_connection  # noqa: E402
+from meal_max.utils.synthetic_data import populate_meals  # noqa: E402
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kitchen_model_baseline.json")
+DEFAULT_THRESHOLD = 1.5  # A median more than 1.5x the baseline's is a regression
+SEED = 0
+
+
+def time_case(call: Callable[[], object], min_rounds: int, max_time: float) -> dict[str, float]:
+    """
+    Times repeated calls, pytest-benchmark style.
+
+    Args:
+        call (Callable): The call to time.
+        min_rounds (int): The fewest calls.
+        max_time (float): Seconds after which no more calls are started once min_rounds is reached.
+
+    Returns:
+        dict: The rounds and the min, median and mean microseconds per call.
+    """
+    timings = []
+    deadline = time.perf_counter() + max_time
+    while len(timings) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return {
+        "rounds": len(timings),
+        "min_us": round(min(timings) * 1e6, 1),
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "mean_us": round(statistics.fmean(timings) * 1e6, 1),
+    }
+
+def build_cases(rng: random.Random) -> dict[str, tuple[Callable[[], object], bool]]:
+    """
+    Builds the calls to time against the current database.
+
+    Args:
+        rng (random.Random): Picks the meals each call uses.
+
+    Returns:
+        dict: Case name -> (call, whether it should run only a few times because it reads the whole table).
+    """
+    with get_db_connection() as conn:
+        live = conn.execute("SELECT id, meal FROM meals WHERE deleted = false").fetchall()
+    ids = [row[0] for row in live]
+    names = [row[1] for row in live]
+    new_names = (f"Benchmark Meal {i}" for i in range(10 ** 9))
+
+    def delete_live_meal():
+        meal_id = ids.pop(rng.randrange(len(ids)))
+        kitchen_model.delete_meal(meal_id)
+
+    return {
+        "create_meal": (lambda: kitchen_model.create_meal(next(new_names), "Italian", 12.5, "MED"), False),
+        "get_meal_by_id": (lambda: kitchen_model.get_meal_by_id(rng.choice(ids)), False),
+        "get_meal_by_name": (lambda: kitchen_model.get_meal_by_name(rng.choice(names)), False),
+        "get_meals_100": (lambda: kitchen_model.get_meals(rng.sample(ids, 100)), False),
+        "get_meal_stats": (lambda: kitchen_model.get_meal_stats(rng.choice(ids)), False),
+        "get_leaderboard_top10_wins": (lambda: kitchen_model.get_leaderboard("wins", limit=10), False),
+        "get_leaderboard_top10_win_pct": (lambda: kitchen_model.get_leaderboard("win_pct", limit=10, min_battles=10), False),
+        "get_leaderboard_full": (lambda: kitchen_model.get_leaderboard("wins"), True),
+        "iter_meals": (lambda: sum(1 for _ in kitchen_model.iter_meals()), True),
+        "update_meal_stats": (lambda: kitchen_model.update_meal_stats(rng.choice(ids), rng.choice(["win", "loss"])), False),
+        "record_battle": (lambda: kitchen_model.record_battle(*rng.sample(ids, 2)), False),
+        "delete_meal": (delete_live_meal, False),
+    }
+
+def run_size(size: int, min_rounds: int, max_time: float) -> dict[str, dict[str, float]]:
+    """
+    Times every case against a catalog of the given size.
+
+    Args:
+        size (int): The number of synthetic meals.
+        min_rounds (int): The fewest calls per case.
+        max_time (float): Seconds per case.
+
+    Returns:
+        dict: Case name -> timings.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sql_utils.DB_PATH = os.path.join(tmpdir, "bench.db")
+        migrate()
+        populate_meals(size, seed=SEED)
+
+        rng = random.Random(SEED)
+        results = {}
+        for name, (call, full_scan) in build_cases(rng).items():
+            results[name] = time_case(call, 3 if full_scan else min_rounds, 0 if full_scan else max_time)
+            print(f"{size:>9} {name:<32} {results[name]['median_us']:>12.1f} us", file=sys.stderr)
+        results["clear_meals"] = time_case(kitchen_model.clear_meals, 1, 0)
+        sql_utils.close_db_connections()
+    return results
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """
+    Lists the cases whose median regressed past the baseline's threshold.
+
+    Args:
+        results (dict): Size -> case name -> timings, as produced by this run.
+        baseline (dict): The saved baseline.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    regressions = []
+    for size, cases in results.items():
+        for name, timings in cases.items():
+            expected = baseline["results"].get(size, {}).get(name)
+            if expected and timings["median_us"] > expected["median_us"] * threshold:
+                regressions.append(
+                    f"{name} at {size} rows: {timings['median_us']} us vs baseline {expected['median_us']} us "
+                    f"({timings['median_us'] / expected['median_us']:.2f}x > {threshold}x)"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--min-rounds", type=int, default=50)
+    parser.add_argument("--max-time", type=float, default=1.0, help="Seconds per case")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"Regression threshold to save with --save (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    meal_cache.maxsize = 0  # Measure the database, not the cache
+    results = {str(size): run_size(size, args.min_rounds, args.max_time) for size in args.sizes}
+
+    if args.save:
+        baseline = {
+            "threshold": args.threshold or DEFAULT_THRESHOLD,
+            "machine": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": results,
+        }
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    print(json.dumps(results, indent=2))
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to create one", file=sys.stderr)
+        return 0
+    with open(args.baseline) as fh:
+        regressions = compare(results, json.load(fh))
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Rows per second materialized as Meal records by the kitchen model.
+
+Fills a temporary database with each requested number of meals and reads
+them all back three ways:
+
+    validated   fetchall() and Meal(...) per row, as the model used to build meals
+    iter_meals  the streaming API with the row factory, which skips revalidation
+    get_meals   the bulk lookup by ID
+
+Results are reported as JSON.
+
+Usage:
+    python benchmarks/meal_materialization.py --rows 100000 1000000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meal_max.models.kitchen_model import Meal, get_meals, iter_meals  # noqa: E402
+from meal_max.utils import sql_utils  # noqa: E402
+from meal_max.utils.migrations import migrate  # noqa: E402
+from meal_max.utils.sql_utils import get_db_connection  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    with get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO meals (meal, cuisine, price, difficulty) VALUES (?, ?, ?, ?)",
+            ((f"Meal {i}", "Italian", 5.0 + i % 40, ("LOW", "MED", "HIGH")[i % 3]) for i in range(rows))
+        )
+        conn.commit()
+
+def read_validated() -> int:
+    with get_db_connection() as conn:
+        rows = conn.execute("SELECT id, meal, cuisine, price, difficulty FROM meals WHERE deleted = false ORDER BY id").fetchall()
+    return len([Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4]) for row in rows])
+
+def rows_per_second(read, rows: int) -> float:
+    start = time.perf_counter()
+    count = read()
+    elapsed = time.perf_counter() - start
+    assert count == rows, f"Read {count} of {rows} meals"
+    return rows / elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    report = {}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sql_utils.DB_PATH = os.path.join(tmpdir, "bench.db")
+            migrate()
+            seed(rows)
+            report[rows] = {
+                "validated_rows_per_s": round(rows_per_second(read_validated, rows)),
+                "iter_meals_rows_per_s": round(rows_per_second(lambda: sum(1 for _ in iter_meals()), rows)),
+                "get_meals_rows_per_s": round(rows_per_second(lambda: len(get_meals(range(1, rows + 1))), rows)),
+            }
+            sql_utils.close_db_connections()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
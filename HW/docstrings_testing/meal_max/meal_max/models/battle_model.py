@@ -1,7 +1,9 @@
 import logging
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from meal_max.models.kitchen_model import Meal, update_meal_stats
+import numpy as np
+
+from meal_max.models.kitchen_model import Meal, get_meals, record_battle, record_battle_stats
 from meal_max.utils.logger import configure_logger
 from meal_max.utils.random_utils import get_random
 
@@ -10,6 +12,9 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+DIFFICULTY_MODIFIERS = {"HIGH": 1, "MED": 2, "LOW": 3}
+
+
 class BattleModel:
 
     def __init__(self):
@@ -59,9 +64,8 @@ class BattleModel:
         # Log the winner
         logger.info("The winner is: %s", winner.meal)
 
-        # Update stats for both combatants
-        update_meal_stats(winner.id, 'win')
-        update_meal_stats(loser.id, 'loss')
+        # Update stats for both combatants in one transaction
+        record_battle(winner.id, loser.id)
 
         # Remove the losing combatant from combatants
         self.combatants.remove(loser)
@@ -73,20 +77,84 @@ class BattleModel:
         self.combatants.clear()
 
     def get_battle_score(self, combatant: Meal) -> float:
-        difficulty_modifier = {"HIGH": 1, "MED": 2, "LOW": 3}
-
         # Log the calculation process
         logger.info("Calculating battle score for %s: price=%.3f, cuisine=%s, difficulty=%s",
                     combatant.meal, combatant.price, combatant.cuisine, combatant.difficulty)
 
         # Calculate score
-        score = (combatant.price * len(combatant.cuisine)) - difficulty_modifier[combatant.difficulty]
+        score = (combatant.price * len(combatant.cuisine)) - DIFFICULTY_MODIFIERS[combatant.difficulty]
 
         # Log the calculated score
         logger.info("Battle score for %s: %.3f", combatant.meal, score)
 
         return score
 
+    def simulate(self, meal_ids: Iterable[int], rounds: int, seed: Optional[int] = None,
+                 persist: bool = False) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Simulate `rounds` battles between every pair of the given meals, without random.org.
+
+        The combatants are fetched in one query and scored together with
+        NumPy, using the same score as `get_battle_score`. Each pair battles
+        as if the meal listed first had been prepped first: it wins a battle
+        when the normalized score delta beats a uniform random draw, so its
+        wins over `rounds` battles are drawn at once from the matching
+        binomial distribution using a local, seedable generator.
+
+        Args:
+            meal_ids (Iterable[int]): The IDs of at least two distinct meals.
+            rounds (int): The number of battles each pair fights.
+            seed (int, optional): The random seed. Defaults to fresh entropy.
+            persist (bool, optional): Whether to add the results to the meals' stats, in one transaction. Defaults to False.
+
+        Returns:
+            dict: (meal_id_1, meal_id_2) -> (wins_1, wins_2) for each pair, in the order the IDs were given.
+
+        Raises:
+            ValueError: If fewer than two distinct meals are given, an ID repeats, a meal is missing or deleted, or rounds is not positive.
+            sqlite3.Error: If any database error occurs.
+        """
+        meal_ids = list(meal_ids)
+        if rounds < 1:
+            logger.error("Invalid number of rounds: %s", rounds)
+            raise ValueError(f"Invalid rounds: {rounds}. Must be a positive number.")
+        if len(meal_ids) < 2:
+            logger.error("Not enough meals to simulate: %s", meal_ids)
+            raise ValueError("At least two meals are needed to simulate battles.")
+        if len(set(meal_ids)) < len(meal_ids):
+            logger.error("Duplicate meal IDs in simulation: %s", meal_ids)
+            raise ValueError("Each meal can only be listed once.")
+
+        meals = get_meals(meal_ids)
+        if len(meals) < len(meal_ids):
+            missing = sorted(set(meal_ids) - {meal.id for meal in meals})
+            logger.error("Meals not available for simulation: %s", missing)
+            raise ValueError(f"Meals not found or deleted: {missing}")
+
+        prices = np.fromiter((meal.price for meal in meals), dtype=float, count=len(meals))
+        cuisine_lengths = np.fromiter((len(meal.cuisine) for meal in meals), dtype=float, count=len(meals))
+        modifiers = np.fromiter((DIFFICULTY_MODIFIERS[meal.difficulty] for meal in meals), dtype=float, count=len(meals))
+        scores = prices * cuisine_lengths - modifiers
+
+        first, second = np.triu_indices(len(meals), k=1)
+        win_probability = np.minimum(np.abs(scores[first] - scores[second]) / 100, 1.0)
+        first_wins = np.random.default_rng(seed).binomial(rounds, win_probability)
+        second_wins = rounds - first_wins
+
+        logger.info("Simulated %d battles between %d meals", len(first) * rounds, len(meals))
+
+        if persist:
+            wins = np.bincount(first, weights=first_wins, minlength=len(meals)) \
+                + np.bincount(second, weights=second_wins, minlength=len(meals))
+            battles = rounds * (len(meals) - 1)
+            record_battle_stats((meal.id, battles, int(meal_wins)) for meal, meal_wins in zip(meals, wins))
+
+        ids = np.array(meal_ids)
+        return dict(zip(
+            zip(ids[first].tolist(), ids[second].tolist()),
+            zip(first_wins.tolist(), second_wins.tolist())
+        ))
+
     def get_combatants(self) -> List[Meal]:
         logger.info("Retrieving current list of combatants.")
         return self.combatants
@@ -1,19 +1,28 @@
 from dataclasses import dataclass
 import logging
-import os
 import sqlite3
-from typing import Any
+from typing import Any, Iterable, Iterator, List, Optional
 
-from meal_max.utils.sql_utils import get_db_connection
+from meal_max.models.stat_writer import get_stat_writer
+from meal_max.utils.sql_utils import get_db_connection, get_dedicated_db_connection
 from meal_max.utils.logger import configure_logger
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.read_replica import invalidate_replica, note_writes, read_meals
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+MEAL_FETCH_SIZE = 1000  # Rows fetched at a time when streaming meals
+MEAL_IDS_PER_QUERY = 500  # Bound parameters per IN list, well under SQLite's limit
+
+
 @dataclass
 class Meal:
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("id", "meal", "cuisine", "price", "difficulty")
+
     id: int
     meal: str
     cuisine: str
@@ -27,6 +36,27 @@ class Meal:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
 
+_new_meal = object.__new__
+
+def meal_row_factory(cursor: sqlite3.Cursor, row: tuple) -> Meal:
+    """
+    sqlite3 row factory building a Meal from an (id, meal, cuisine, price, difficulty) row.
+
+    Rows from the meals table were validated when they were written, so
+    `__post_init__` is skipped.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor the row came from (unused).
+        row (tuple): The row.
+
+    Returns:
+        Meal: The meal.
+    """
+    meal = _new_meal(Meal)
+    meal.id, meal.meal, meal.cuisine, meal.price, meal.difficulty = row
+    return meal
+
+
 def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
     if not isinstance(price, (int, float)) or price <= 0:
         raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
@@ -41,6 +71,7 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
                 VALUES (?, ?, ?, ?)
             """, (meal, cuisine, price, difficulty))
             conn.commit()
+            note_writes()
 
             logger.info("Meal successfully added to the database: %s", meal)
 
@@ -54,18 +85,20 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
 
 def clear_meals() -> None:
     """
-    Recreates the meals table, effectively deleting all meals.
+    Deletes all meals and restarts their IDs at 1, keeping the table and its indexes.
 
     Raises:
         sqlite3.Error: If any database error occurs.
     """
     try:
-        with open(os.getenv("SQL_CREATE_TABLE_PATH", "/app/sql/create_meal_table.sql"), "r") as fh:
-            create_table_script = fh.read()
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.executescript(create_table_script)
+            # Without a WHERE clause SQLite drops the table's pages wholesale rather than row by row
+            cursor.execute("DELETE FROM meals")
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'meals'")
             conn.commit()
+            meal_cache.clear()
+            invalidate_replica()  # A stale copy would serve the old meals under reused IDs
 
             logger.info("Meals cleared successfully.")
 
@@ -73,22 +106,37 @@ def clear_meals() -> None:
         logger.error("Database error while clearing meals: %s", str(e))
         raise e
 
+def _raise_meal_unavailable(cursor: sqlite3.Cursor, meal_id: int) -> None:
+    """
+    Raise the error for a meal that a conditional update did not match.
+
+    Only runs after the update matched no row, so the common path stays a single statement.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor of the failed update's connection.
+        meal_id (int): The ID of the meal.
+
+    Raises:
+        ValueError: If the meal has been deleted or does not exist.
+    """
+    cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
+    row = cursor.fetchone()
+    if row is None:
+        logger.info("Meal with ID %s not found", meal_id)
+        raise ValueError(f"Meal with ID {meal_id} not found")
+    logger.info("Meal with ID %s has been deleted", meal_id)
+    raise ValueError(f"Meal with ID {meal_id} has been deleted")
+
 def delete_meal(meal_id: int) -> None:
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
-            try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has already been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
-
-            cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ?", (meal_id,))
+            cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ? AND deleted = FALSE", (meal_id,))
+            if cursor.rowcount == 0:
+                _raise_meal_unavailable(cursor, meal_id)
             conn.commit()
+            meal_cache.invalidate(meal_id)
+            invalidate_replica()  # A stale copy would serve the meal as if it were not deleted
 
             logger.info("Meal with ID %s marked as deleted.", meal_id)
 
@@ -96,25 +144,53 @@ def delete_meal(meal_id: int) -> None:
         logger.error("Database error: %s", str(e))
         raise e
 
-def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
-    query = """
-        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
-        FROM meals WHERE deleted = false AND battles > 0
+def _leaderboard_query(sort_by: str, limit: Optional[int], offset: int, min_battles: int) -> tuple[str, tuple]:
     """
+    Build the leaderboard query and its parameters.
+
+    The WHERE and ORDER BY clauses match the covering leaderboard indexes on
+    (deleted, wins, ...) and (deleted, win_pct, ...), so SQLite reads meals in
+    rank order from the index alone and stops after `limit + offset` of them.
 
-    if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
-    elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
-    else:
+    Args:
+        sort_by (str): 'wins' or 'win_pct'.
+        limit (int, optional): The maximum number of meals, or None for all of them.
+        offset (int): The number of top-ranked meals to skip.
+        min_battles (int): The fewest battles a ranked meal may have.
+
+    Returns:
+        tuple: The SQL and its parameters.
+
+    Raises:
+        ValueError: If any parameter is invalid.
+    """
+    if sort_by not in ("wins", "win_pct"):
         logger.error("Invalid sort_by parameter: %s", sort_by)
         raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+    if limit is not None and limit < 1:
+        logger.error("Invalid limit: %s", limit)
+        raise ValueError(f"Invalid limit: {limit}. Must be a positive number.")
+    if offset < 0:
+        logger.error("Invalid offset: %s", offset)
+        raise ValueError(f"Invalid offset: {offset}. Must be zero or greater.")
+    if min_battles < 1:
+        logger.error("Invalid min_battles: %s", min_battles)
+        raise ValueError(f"Invalid min_battles: {min_battles}. Must be at least 1.")
+
+    query = f"""
+        SELECT id, meal, cuisine, price, difficulty, battles, wins, win_pct
+        FROM meals WHERE deleted = false AND battles >= ?
+        ORDER BY {sort_by} DESC
+        LIMIT ? OFFSET ?
+    """
+    # A negative LIMIT means no limit in SQLite
+    return query, (min_battles, -1 if limit is None else limit, offset)
+
+def get_leaderboard(sort_by: str="wins", limit: Optional[int] = None, offset: int = 0, min_battles: int = 1) -> dict[str, Any]:
+    query, params = _leaderboard_query(sort_by, limit, offset, min_battles)
 
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
+        rows, _ = read_meals(lambda conn: conn.execute(query, params).fetchall())
 
         leaderboard = []
         for row in rows:
@@ -138,20 +214,29 @@ def get_leaderboard(sort_by: str="wins") -> dict[str, Any]:
         raise e
 
 def get_meal_by_id(meal_id: int) -> Meal:
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?", (meal_id,))
-            row = cursor.fetchone()
+    meal = meal_cache.get_by_id(meal_id)
+    if meal is not None:
+        return meal
+    token = meal_cache.begin_read()
 
-            if row:
-                if row[5]:
-                    logger.info("Meal with ID %s has been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
-            else:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
+    try:
+        row, token = read_meals(
+            lambda conn: conn.execute(
+                "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id = ?", (meal_id,)
+            ).fetchone(),
+            token
+        )
+
+        if row:
+            if row[5]:
+                logger.info("Meal with ID %s has been deleted", meal_id)
+                raise ValueError(f"Meal with ID {meal_id} has been deleted")
+            meal = meal_row_factory(None, row[:5])
+            meal_cache.put(meal, token)
+            return meal
+        else:
+            logger.info("Meal with ID %s not found", meal_id)
+            raise ValueError(f"Meal with ID {meal_id} not found")
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
@@ -159,48 +244,289 @@ def get_meal_by_id(meal_id: int) -> Meal:
 
 
 def get_meal_by_name(meal_name: str) -> Meal:
+    meal = meal_cache.get_by_name(meal_name)
+    if meal is not None:
+        return meal
+    token = meal_cache.begin_read()
+
+    try:
+        row, token = read_meals(
+            lambda conn: conn.execute(
+                "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?", (meal_name,)
+            ).fetchone(),
+            token
+        )
+
+        if row:
+            if row[5]:
+                logger.info("Meal with name %s has been deleted", meal_name)
+                raise ValueError(f"Meal with name {meal_name} has been deleted")
+            meal = meal_row_factory(None, row[:5])
+            meal_cache.put(meal, token)
+            return meal
+        else:
+            logger.info("Meal with name %s not found", meal_name)
+            raise ValueError(f"Meal with name {meal_name} not found")
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def get_meals(meal_ids: Iterable[int]) -> List[Meal]:
+    """
+    Get several meals by ID in as few queries as possible.
+
+    Args:
+        meal_ids (Iterable[int]): The IDs of the meals.
+
+    Returns:
+        List[Meal]: The meals, in the order their IDs were given. Missing and deleted meals are left out.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    meal_ids = list(meal_ids)
+    found = {}
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal = ?", (meal_name,))
-            row = cursor.fetchone()
+            cursor.row_factory = meal_row_factory
+            for start in range(0, len(meal_ids), MEAL_IDS_PER_QUERY):
+                chunk = meal_ids[start:start + MEAL_IDS_PER_QUERY]
+                # NOT INDEXED keeps the planner on rowid lookups; otherwise the deleted
+                # filter tempts it into scanning a leaderboard index for every chunk
+                cursor.execute(
+                    f"SELECT id, meal, cuisine, price, difficulty FROM meals NOT INDEXED "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))}) AND deleted = false",
+                    chunk
+                )
+                for meal in cursor:
+                    found[meal.id] = meal
+
+        logger.info("Retrieved %d of %d requested meals", len(found), len(meal_ids))
+        return [found[meal_id] for meal_id in meal_ids if meal_id in found]
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def iter_meals(batch_size: int = MEAL_FETCH_SIZE) -> Iterator[Meal]:
+    """
+    Stream every live meal, ordered by ID, without loading the whole table.
+
+    The generator holds a pooled connection of its own until it is exhausted
+    or closed, so the thread's other database calls while it is paused do not
+    run on its connection.
 
-            if row:
-                if row[5]:
-                    logger.info("Meal with name %s has been deleted", meal_name)
-                    raise ValueError(f"Meal with name {meal_name} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
-            else:
-                logger.info("Meal with name %s not found", meal_name)
-                raise ValueError(f"Meal with name {meal_name} not found")
+    Args:
+        batch_size (int, optional): The number of rows fetched at a time. Defaults to MEAL_FETCH_SIZE.
+
+    Yields:
+        Meal: Each meal that has not been deleted.
+
+    Raises:
+        ValueError: If batch_size is not positive.
+        sqlite3.Error: If any database error occurs.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"Invalid batch_size: {batch_size}. Must be a positive number.")
+
+    try:
+        with get_dedicated_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = meal_row_factory
+            cursor.arraysize = batch_size
+            cursor.execute("SELECT id, meal, cuisine, price, difficulty FROM meals WHERE deleted = false ORDER BY id")
+            while True:
+                batch = cursor.fetchmany()
+                if not batch:
+                    break
+                yield from batch
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
 
+def _increment_meal_stats(cursor: sqlite3.Cursor, meal_id: int, result: str) -> None:
+    """
+    Count one battle for a meal in a single conditional UPDATE, without committing.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor to run the update on.
+        meal_id (int): The ID of the meal.
+        result (str): 'win' or 'loss'.
+
+    Raises:
+        ValueError: If the meal has been deleted or does not exist, or the result is invalid.
+    """
+    if result not in ('win', 'loss'):
+        # Missing and deleted meals are reported ahead of the bad result
+        cursor.execute("SELECT 1 FROM meals WHERE id = ? AND deleted = FALSE", (meal_id,))
+        if cursor.fetchone() is None:
+            _raise_meal_unavailable(cursor, meal_id)
+        raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+
+    cursor.execute(
+        "UPDATE meals SET battles = battles + 1, wins = wins + ? WHERE id = ? AND deleted = FALSE",
+        (1 if result == 'win' else 0, meal_id)
+    )
+    if cursor.rowcount == 0:
+        _raise_meal_unavailable(cursor, meal_id)
+
+def _enqueue_meal_stats(*results: tuple[int, str]) -> None:
+    """
+    Queue stat updates with the write-behind writer, after the checks a synchronous update makes.
+
+    Args:
+        results (tuple): (meal_id, 'win' or 'loss') for each meal, written in the same batch.
+
+    Raises:
+        ValueError: If a meal has been deleted or does not exist, or a result is invalid.
+    """
+    for meal_id, result in results:
+        get_meal_by_id(meal_id)  # Raises the same errors as the conditional UPDATE, usually from the cache
+        if result not in ('win', 'loss'):
+            raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+    get_stat_writer().enqueue(*((meal_id, 1, 1 if result == 'win' else 0) for meal_id, result in results))
 
 def update_meal_stats(meal_id: int, result: str) -> None:
+    if get_stat_writer() is not None:
+        _enqueue_meal_stats((meal_id, result))
+        return
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            _increment_meal_stats(cursor, meal_id, result)
+            conn.commit()
+            meal_cache.invalidate(meal_id)
+            note_writes()
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def record_battle(winner_id: int, loser_id: int) -> None:
+    """
+    Record a battle's outcome for both meals in one transaction.
+
+    Either both meals' stats are updated or, if either meal is missing or
+    deleted, neither is. In write-behind mode both updates are queued for the
+    same batch.
+
+    Args:
+        winner_id (int): The ID of the winning meal.
+        loser_id (int): The ID of the losing meal.
+
+    Raises:
+        ValueError: If either meal has been deleted or does not exist (the winner is checked first).
+        sqlite3.Error: If any database error occurs.
+    """
+    if get_stat_writer() is not None:
+        _enqueue_meal_stats((winner_id, 'win'), (loser_id, 'loss'))
+        logger.info("Battle queued: meal %s beat meal %s", winner_id, loser_id)
+        return
+
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
             try:
-                deleted = cursor.fetchone()[0]
-                if deleted:
-                    logger.info("Meal with ID %s has been deleted", meal_id)
-                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
-            except TypeError:
-                logger.info("Meal with ID %s not found", meal_id)
-                raise ValueError(f"Meal with ID {meal_id} not found")
-
-            if result == 'win':
-                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (meal_id,))
-            elif result == 'loss':
-                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?", (meal_id,))
-            else:
-                raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+                _increment_meal_stats(cursor, winner_id, 'win')
+                _increment_meal_stats(cursor, loser_id, 'loss')
+            except ValueError:
+                conn.rollback()
+                raise
+            conn.commit()
+            meal_cache.invalidate(winner_id, loser_id)
+            note_writes(2)
+
+            logger.info("Battle recorded: meal %s beat meal %s", winner_id, loser_id)
 
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def record_battle_stats(deltas: Iterable[tuple[int, int, int]]) -> None:
+    """
+    Add many meals' battle and win counts in one transaction.
+
+    Either every meal's stats are updated or, if any meal is missing or
+    deleted, none are. In write-behind mode the deltas are queued for the
+    same batch.
+
+    Args:
+        deltas (Iterable[tuple]): (meal_id, battles, wins) for each meal.
+
+    Raises:
+        ValueError: If a meal has been deleted or does not exist, or a delta is invalid.
+        sqlite3.Error: If any database error occurs.
+    """
+    deltas = list(deltas)
+    for meal_id, battles, wins in deltas:
+        if battles < 0 or not 0 <= wins <= battles:
+            raise ValueError(f"Invalid stats for meal {meal_id}: {wins} wins in {battles} battles.")
+
+    if get_stat_writer() is not None:
+        for meal_id, _, _ in deltas:
+            get_meal_by_id(meal_id)  # Raises the same errors as the conditional UPDATE, usually from the cache
+        get_stat_writer().enqueue(*deltas)
+        logger.info("Stats queued for %d meals", len(deltas))
+        return
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for meal_id, battles, wins in deltas:
+                cursor.execute(
+                    "UPDATE meals SET battles = battles + ?, wins = wins + ? WHERE id = ? AND deleted = FALSE",
+                    (battles, wins, meal_id)
+                )
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    _raise_meal_unavailable(cursor, meal_id)
             conn.commit()
+            meal_cache.invalidate(*(meal_id for meal_id, _, _ in deltas))
+            note_writes(len(deltas))
+
+            logger.info("Stats recorded for %d meals", len(deltas))
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+def get_meal_stats(meal_id: int) -> dict[str, Any]:
+    """
+    Get a meal's battle stats, including updates still queued in write-behind mode.
+
+    Args:
+        meal_id (int): The ID of the meal.
+
+    Returns:
+        dict: The meal's ID, battles, wins and win percentage.
+
+    Raises:
+        ValueError: If the meal has been deleted or does not exist.
+        sqlite3.Error: If any database error occurs.
+    """
+    def read() -> tuple[int, int]:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT battles, wins FROM meals WHERE id = ? AND deleted = FALSE", (meal_id,))
+            row = cursor.fetchone()
+            if row is None:
+                _raise_meal_unavailable(cursor, meal_id)
+            return row
+
+    try:
+        writer = get_stat_writer()
+        battles, wins = writer.read_with_pending(meal_id, read) if writer is not None else read()
+        return {
+            'id': meal_id,
+            'battles': battles,
+            'wins': wins,
+            'win_pct': round(wins * 100 / battles, 1) if battles else 0.0
+        }
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
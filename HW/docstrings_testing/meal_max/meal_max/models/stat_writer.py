@@ -0,0 +1,236 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.read_replica import note_writes
+from meal_max.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+STAT_WRITE_BEHIND = os.getenv("STAT_WRITE_BEHIND", "false").lower() == "true"
+STAT_FLUSH_INTERVAL_MS = int(os.getenv("STAT_FLUSH_INTERVAL_MS", 200))  # Longest a delta waits before it is written
+STAT_FLUSH_MAX_ITEMS = int(os.getenv("STAT_FLUSH_MAX_ITEMS", 500))  # Deltas that trigger an early write
+
+
+class StatWriter:
+    """
+    Write-behind for battle stats: deltas are queued in memory and written by one background thread.
+
+    Deltas for the same meal are coalesced, and each batch is one transaction
+    of one UPDATE per meal. A batch is written `interval_ms` after its first
+    delta, or as soon as `max_items` deltas are waiting, whichever is first.
+    Deltas queued together (such as both sides of a battle) are always written
+    in the same batch. `stop()` writes everything still queued.
+
+    Until their batch commits, deltas are visible through `pending()`, and
+    `read_with_pending()` adds them to stats read from the database.
+
+    Attributes:
+        interval_ms (int): The longest a delta waits before it is written.
+        max_items (int): The number of queued deltas that triggers an early write.
+        batches (int): The number of batches written.
+    """
+
+    def __init__(self, interval_ms: int = STAT_FLUSH_INTERVAL_MS, max_items: int = STAT_FLUSH_MAX_ITEMS):
+        self.interval_ms = interval_ms
+        self.max_items = max_items
+        self.batches = 0
+        self._pending: dict[int, list[int]] = {}  # meal ID -> [battles, wins], queued
+        self._writing: dict[int, list[int]] = {}  # meal ID -> [battles, wins], in the batch being written
+        self._queued = 0
+        self._first_queued_at: Optional[float] = None
+        self._condition = threading.Condition()
+        self._commit_lock = threading.Lock()  # Held across a commit and the release of its deltas
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the writer thread.
+        """
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="stat-writer", daemon=True)
+        self._thread.start()
+        logger.info("Stat writer started (every %d ms or %d deltas).", self.interval_ms, self.max_items)
+
+    def enqueue(self, *deltas: tuple[int, int, int]) -> None:
+        """
+        Queue stat deltas to be written together.
+
+        Args:
+            deltas (tuple): (meal_id, battles, wins) for each meal.
+
+        Raises:
+            RuntimeError: If the writer has been stopped.
+        """
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("Stat writer is stopped")
+            for meal_id, battles, wins in deltas:
+                totals = self._pending.setdefault(meal_id, [0, 0])
+                totals[0] += battles
+                totals[1] += wins
+            self._queued += len(deltas)
+            if self._first_queued_at is None:
+                self._first_queued_at = time.monotonic()
+                self._condition.notify()
+            elif self._queued >= self.max_items:
+                self._condition.notify()
+
+    def pending(self, meal_id: int) -> tuple[int, int]:
+        """
+        Get the stat deltas for a meal that have not been committed yet.
+
+        Args:
+            meal_id (int): The ID of the meal.
+
+        Returns:
+            tuple: The pending (battles, wins).
+        """
+        with self._condition:
+            queued = self._pending.get(meal_id, (0, 0))
+            writing = self._writing.get(meal_id, (0, 0))
+            return queued[0] + writing[0], queued[1] + writing[1]
+
+    def read_with_pending(self, meal_id: int, read: Callable[[], tuple[int, int]]) -> tuple[int, int]:
+        """
+        Read a meal's persisted stats and add its pending deltas, counting each delta exactly once.
+
+        No batch can commit between the read and the lookup of pending deltas.
+
+        Args:
+            meal_id (int): The ID of the meal.
+            read (Callable): Reads the persisted (battles, wins) from the database.
+
+        Returns:
+            tuple: The (battles, wins) including pending deltas.
+        """
+        with self._commit_lock:
+            battles, wins = read()
+            pending_battles, pending_wins = self.pending(meal_id)
+        return battles + pending_battles, wins + pending_wins
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._first_queued_at is not None:
+                        remaining = self._first_queued_at + self.interval_ms / 1000 - time.monotonic()
+                        if remaining <= 0 or self._queued >= self.max_items or self._stopping:
+                            break
+                    elif self._stopping:
+                        return
+                    else:
+                        remaining = None
+                    self._condition.wait(remaining)
+                batch, self._pending, self._writing = self._pending, {}, self._pending
+                self._queued = 0
+                self._first_queued_at = None
+            try:
+                self._write(batch)
+            except sqlite3.Error as e:
+                # Requeue so a transient failure (such as a locked database) is retried
+                logger.error("Failed to write stat batch of %d meals: %s", len(batch), str(e))
+                with self._condition:
+                    for meal_id, (battles, wins) in batch.items():
+                        totals = self._pending.setdefault(meal_id, [0, 0])
+                        totals[0] += battles
+                        totals[1] += wins
+                    self._queued += len(batch)
+                    if self._first_queued_at is None:
+                        self._first_queued_at = time.monotonic()
+                    self._writing = {}
+                    if self._stopping:
+                        return
+
+    def _write(self, batch: dict[int, list[int]]) -> None:
+        """
+        Write one batch of coalesced deltas in a single transaction.
+
+        Args:
+            batch (dict): meal ID -> [battles, wins].
+
+        Raises:
+            sqlite3.Error: If the batch could not be written. Nothing is written.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(
+                    "UPDATE meals SET battles = battles + ?, wins = wins + ? WHERE id = ? AND deleted = FALSE",
+                    [(battles, wins, meal_id) for meal_id, (battles, wins) in batch.items()]
+                )
+                with self._commit_lock:
+                    conn.commit()
+                    with self._condition:
+                        self._writing = {}
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        meal_cache.invalidate(*batch)
+        note_writes(len(batch))
+        self.batches += 1
+        if cursor.rowcount < len(batch):
+            logger.warning("%d meals in the stat batch were deleted before it was written", len(batch) - cursor.rowcount)
+        logger.debug("Stat batch written for %d meals", len(batch))
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Write every queued delta and stop the writer thread.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the final write. Defaults to no limit.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        logger.info("Stat writer stopped.")
+
+
+stat_writer: Optional[StatWriter] = None
+
+
+def get_stat_writer() -> Optional[StatWriter]:
+    """
+    Get the shared writer if stat updates are in write-behind mode.
+
+    Returns:
+        StatWriter: The writer, or None if stat updates are written synchronously.
+    """
+    return stat_writer
+
+def start_stat_writer(interval_ms: int = STAT_FLUSH_INTERVAL_MS, max_items: int = STAT_FLUSH_MAX_ITEMS) -> StatWriter:
+    """
+    Switch stat updates to write-behind, starting the shared writer.
+
+    Args:
+        interval_ms (int, optional): The longest a delta waits before it is written.
+        max_items (int, optional): The number of queued deltas that triggers an early write.
+
+    Returns:
+        StatWriter: The started writer.
+    """
+    global stat_writer
+    if stat_writer is None:
+        stat_writer = StatWriter(interval_ms, max_items)
+        stat_writer.start()
+    return stat_writer
+
+def stop_stat_writer() -> None:
+    """
+    Write every queued delta and switch stat updates back to synchronous writes.
+    """
+    global stat_writer
+    writer, stat_writer = stat_writer, None
+    if writer is not None:
+        writer.stop()
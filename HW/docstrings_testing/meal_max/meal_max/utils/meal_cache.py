@@ -0,0 +1,171 @@
+from collections import OrderedDict
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+MEAL_CACHE_SIZE = int(os.getenv("MEAL_CACHE_SIZE", 1024))  # Meals kept; 0 disables the cache
+MEAL_CACHE_TTL = float(os.getenv("MEAL_CACHE_TTL", 60.0))  # Seconds a cached meal is served for
+
+
+class MealCache:
+    """
+    A process-local, size-bounded LRU cache of meals, readable by ID or by name.
+
+    Each meal is stored once under its ID, with a name index kept in step, so
+    evicting or invalidating a meal removes it under both keys. Entries expire
+    `ttl` seconds after they were cached.
+
+    A reader that misses takes a token from `begin_read()` before querying
+    the database and hands it back to `put()`. If anything was invalidated in
+    between, the possibly stale meal is not cached.
+
+    Attributes:
+        maxsize (int): The number of meals kept.
+        ttl (float): Seconds a cached meal is served for.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to go to the database.
+        evictions (int): Meals dropped to stay within maxsize.
+        invalidations (int): Meals dropped because they changed, counting a clear as one.
+    """
+
+    def __init__(self, maxsize: int = MEAL_CACHE_SIZE, ttl: float = MEAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._meals: "OrderedDict[int, tuple[Any, float]]" = OrderedDict()
+        self._ids_by_name: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, meal_id: Optional[int]) -> Optional[Any]:
+        """Look up a meal by ID, counting the hit or miss. The lock must be held."""
+        entry = self._meals.get(meal_id) if meal_id is not None else None
+        if entry is not None and entry[1] <= time.monotonic():
+            self._remove(meal_id)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._meals.move_to_end(meal_id)
+        self.hits += 1
+        return entry[0]
+
+    def _remove(self, meal_id: int) -> bool:
+        """Drop a meal under both keys. The lock must be held."""
+        entry = self._meals.pop(meal_id, None)
+        if entry is None:
+            return False
+        self._ids_by_name.pop(entry[0].meal, None)
+        return True
+
+    def get_by_id(self, meal_id: int) -> Optional[Any]:
+        """
+        Get a cached meal by ID.
+
+        Args:
+            meal_id (int): The ID of the meal.
+
+        Returns:
+            Meal: The cached meal, or None on a miss.
+        """
+        with self._lock:
+            return self._get(meal_id)
+
+    def get_by_name(self, meal_name: str) -> Optional[Any]:
+        """
+        Get a cached meal by name.
+
+        Args:
+            meal_name (str): The name of the meal.
+
+        Returns:
+            Meal: The cached meal, or None on a miss.
+        """
+        with self._lock:
+            return self._get(self._ids_by_name.get(meal_name))
+
+    def begin_read(self) -> int:
+        """
+        Get a token to pass to `put()` for a meal about to be read from the database.
+
+        Returns:
+            int: The token.
+        """
+        return self.invalidations
+
+    def put(self, meal: Any, token: int) -> None:
+        """
+        Cache a meal read from the database, unless something was invalidated since the read began.
+
+        Args:
+            meal (Meal): The meal.
+            token (int): The token from `begin_read()`.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if token != self.invalidations:
+                return
+            self._remove(meal.id)
+            self._meals[meal.id] = (meal, time.monotonic() + self.ttl)
+            self._ids_by_name[meal.meal] = meal.id
+            while len(self._meals) > self.maxsize:
+                oldest = next(iter(self._meals))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *meal_ids: int) -> None:
+        """
+        Drop meals that have changed.
+
+        Args:
+            meal_ids (int): The IDs of the meals.
+        """
+        with self._lock:
+            self.invalidations += 1
+            for meal_id in meal_ids:
+                self._remove(meal_id)
+
+    def clear(self) -> None:
+        """
+        Drop every cached meal.
+        """
+        with self._lock:
+            self.invalidations += 1
+            self._meals.clear()
+            self._ids_by_name.clear()
+        logger.info("Meal cache cleared.")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the cache's counters.
+
+        Returns:
+            dict: The size, limits, hits, misses, hit rate, evictions and invalidations.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._meals),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+meal_cache = MealCache()
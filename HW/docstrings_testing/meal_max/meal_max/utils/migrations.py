@@ -0,0 +1,166 @@
+from datetime import datetime, timezone
+import logging
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# The columns every version of the meals table has, in order
+MEAL_COLUMNS = "id, meal, cuisine, price, difficulty, battles, wins, deleted"
+
+
+def _create_meals_table(conn: sqlite3.Connection) -> None:
+    """Version 1: the original meals table. A no-op on databases created before migrations."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meal TEXT NOT NULL UNIQUE,
+            cuisine TEXT NOT NULL,
+            price REAL NOT NULL,
+            difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+            battles INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            deleted BOOLEAN DEFAULT FALSE
+        )
+    """)
+
+def _add_win_pct(conn: sqlite3.Connection) -> None:
+    """
+    Version 2: a stored win_pct column for the leaderboard.
+
+    SQLite cannot add a stored generated column in place, so the table is
+    rebuilt and its rows copied over, keeping their IDs.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(meals)")}
+    if "win_pct" in columns:
+        return
+    conn.execute("""
+        CREATE TABLE meals_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            meal TEXT NOT NULL UNIQUE,
+            cuisine TEXT NOT NULL,
+            price REAL NOT NULL,
+            difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+            battles INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            deleted BOOLEAN DEFAULT FALSE,
+            win_pct REAL GENERATED ALWAYS AS (CASE WHEN battles > 0 THEN wins * 1.0 / battles END) STORED
+        )
+    """)
+    conn.execute(f"INSERT INTO meals_new ({MEAL_COLUMNS}) SELECT {MEAL_COLUMNS} FROM meals")
+    conn.execute("DROP TABLE meals")
+    conn.execute("ALTER TABLE meals_new RENAME TO meals")
+
+def _add_leaderboard_indexes(conn: sqlite3.Connection) -> None:
+    """Version 3: indexes that let a top-k leaderboard stop after k meals."""
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_meals_deleted_wins ON meals (deleted, wins, battles)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_meals_deleted_win_pct ON meals (deleted, win_pct, battles)")
+
+def _cover_leaderboard_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Version 4: replace the leaderboard indexes with covering ones.
+
+    The version 3 indexes only order the meals, so every ranked meal still
+    needed a table lookup for its name, cuisine, price and difficulty. These
+    hold every column the leaderboard selects (the rowid is the meal ID).
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_meals_leaderboard_wins
+        ON meals (deleted, wins, battles, win_pct, meal, cuisine, price, difficulty)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_meals_leaderboard_win_pct
+        ON meals (deleted, win_pct, battles, wins, meal, cuisine, price, difficulty)
+    """)
+    conn.execute("DROP INDEX IF EXISTS ix_meals_deleted_wins")
+    conn.execute("DROP INDEX IF EXISTS ix_meals_deleted_win_pct")
+
+
+# Append only: a released migration must never change, since databases record that they have run it
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "create meals table", _create_meals_table),
+    (2, "add stored win_pct column", _add_win_pct),
+    (3, "add leaderboard indexes", _add_leaderboard_indexes),
+    (4, "make leaderboard indexes covering", _cover_leaderboard_indexes),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Get the version of the most recent migration applied to a database.
+
+    Args:
+        conn (sqlite3.Connection): A connection to the database.
+
+    Returns:
+        int: The schema version, or 0 if no migration has been applied.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(target: Optional[int] = None) -> int:
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Safe to call on every startup: an up-to-date database costs one query.
+    The write lock is taken before the version is re-read, so processes
+    starting together apply each migration once.
+
+    Args:
+        target (int, optional): The version to stop at. Defaults to the latest.
+
+    Returns:
+        int: The schema version after migrating.
+
+    Raises:
+        sqlite3.Error: If a migration fails. It is rolled back and later ones are not attempted.
+    """
+    target = LATEST_VERSION if target is None else target
+    with get_db_connection() as conn:
+        version = get_schema_version(conn)
+        conn.commit()
+        if version >= target:
+            logger.debug("Database schema is up to date at version %d", version)
+            return version
+
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None  # Manage transactions explicitly so DDL is rolled back too
+        try:
+            for number, description, apply in MIGRATIONS:
+                if number > target:
+                    break
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if number <= get_schema_version(conn):
+                        conn.execute("COMMIT")
+                        continue
+                    logger.info("Applying migration %d: %s", number, description)
+                    apply(conn)
+                    conn.execute(
+                        "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                        (number, description, datetime.now(timezone.utc).isoformat())
+                    )
+                    conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK")
+                    logger.error("Migration %d failed: %s", number, str(e))
+                    raise e
+        finally:
+            conn.isolation_level = isolation_level
+
+        version = get_schema_version(conn)
+        logger.info("Database schema migrated to version %d", version)
+        return version
@@ -0,0 +1,310 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+READ_REPLICA = os.getenv("READ_REPLICA", "false").lower() == "true"
+READ_REPLICA_REFRESH_INTERVAL = float(os.getenv("READ_REPLICA_REFRESH_INTERVAL", 5.0))  # Seconds between refreshes
+READ_REPLICA_REFRESH_WRITES = int(os.getenv("READ_REPLICA_REFRESH_WRITES", 100))  # Writes that trigger an early refresh
+READ_REPLICA_MAX_STALENESS = float(os.getenv("READ_REPLICA_MAX_STALENESS", 10.0))  # Oldest snapshot served, in seconds
+
+T = TypeVar("T")
+
+
+class Snapshot(NamedTuple):
+    conn: sqlite3.Connection
+    taken_at: float  # time.monotonic() when the copy began
+    cache_token: int  # The meal cache token from when the copy began
+
+
+class ReadReplica:
+    """
+    An in-memory copy of the database for reads that can tolerate bounded staleness.
+
+    The on-disk database is copied into a fresh `:memory:` connection with
+    SQLite's backup API, which reads a consistent snapshot, and the new
+    copy replaces the old one in a single assignment, so readers never see
+    a partial copy. A background thread refreshes the copy every
+    `refresh_interval` seconds, or as soon as `refresh_writes` writes have
+    been reported through `note_writes()`. Writes that a stale copy must
+    never serve, such as deletes, drop the copy through `invalidate()`.
+
+    `read()` runs a query on the copy while it is at most `max_staleness`
+    seconds old, and on the primary database otherwise, including before
+    the first copy and whenever the copy fails.
+
+    Attributes:
+        refresh_interval (float): Seconds between refreshes.
+        refresh_writes (int): The number of writes that triggers an early refresh.
+        max_staleness (float): The age in seconds past which reads go to the primary.
+        refreshes (int): The number of copies taken.
+        replica_reads (int): Reads served from the copy.
+        primary_reads (int): Reads that fell back to the primary.
+    """
+
+    def __init__(self, refresh_interval: float = READ_REPLICA_REFRESH_INTERVAL,
+                 refresh_writes: int = READ_REPLICA_REFRESH_WRITES,
+                 max_staleness: float = READ_REPLICA_MAX_STALENESS):
+        self.refresh_interval = refresh_interval
+        self.refresh_writes = refresh_writes
+        self.max_staleness = max_staleness
+        self.refreshes = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self._snapshot: Optional[Snapshot] = None
+        self._writes = 0  # Writes reported since the current copy began
+        self._invalidated = False  # Whether the copy in progress predates an invalidation
+        self._condition = threading.Condition()
+        self._refresh_lock = threading.Lock()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Take the first copy and start the refresh thread.
+
+        Raises:
+            sqlite3.Error: If the first copy could not be taken.
+        """
+        self.refresh()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="read-replica", daemon=True)
+        self._thread.start()
+        logger.info("Read replica started (every %.1f s or %d writes, at most %.1f s stale).",
+                    self.refresh_interval, self.refresh_writes, self.max_staleness)
+
+    def refresh(self) -> None:
+        """
+        Copy the database into a new in-memory connection and start serving reads from it.
+
+        Raises:
+            sqlite3.Error: If the copy failed. The previous copy keeps being served.
+        """
+        with self._refresh_lock:
+            with self._condition:
+                self._writes = 0
+                self._invalidated = False
+            taken_at = time.monotonic()
+            cache_token = meal_cache.begin_read()
+            replica = sqlite3.connect(":memory:", check_same_thread=False)
+            try:
+                with get_db_connection() as conn:
+                    conn.backup(replica)
+            except sqlite3.Error:
+                replica.close()
+                raise
+            with self._condition:
+                if self._invalidated:
+                    # The copy may predate the invalidating write; the refresh thread takes another
+                    replica.close()
+                    return
+                # The old copy is closed by garbage collection once no reader holds it
+                self._snapshot = Snapshot(replica, taken_at, cache_token)
+                self.refreshes += 1
+        logger.debug("Read replica refreshed in %.1f ms", (time.monotonic() - taken_at) * 1000)
+
+    def note_writes(self, count: int = 1) -> None:
+        """
+        Report writes committed to the primary, refreshing early once enough have accumulated.
+
+        Args:
+            count (int, optional): The number of writes. Defaults to 1.
+        """
+        with self._condition:
+            self._writes += count
+            if self._writes >= self.refresh_writes:
+                self._condition.notify()
+
+    def invalidate(self) -> None:
+        """
+        Drop the copy and refresh it right away, sending reads to the primary until the new copy is taken.
+
+        A refresh already in progress is discarded, since its copy may predate the write.
+        """
+        with self._condition:
+            self._snapshot = None
+            self._invalidated = True
+            self._condition.notify()
+
+    def staleness(self) -> Optional[float]:
+        """
+        Get the age of the copy being served.
+
+        Returns:
+            float: Seconds since the copy began, or None if there is no copy.
+        """
+        snapshot = self._snapshot
+        return None if snapshot is None else time.monotonic() - snapshot.taken_at
+
+    def read(self, query: Callable[[sqlite3.Connection], T], token: Optional[int] = None) -> tuple[T, Optional[int]]:
+        """
+        Run a read-only query on the copy if it is fresh enough, and on the primary otherwise.
+
+        A query that finds nothing on the copy (returns None) is retried on the
+        primary, since what it looked for may be newer than the copy.
+
+        Args:
+            query (Callable): Runs the query on the connection it is given and returns the result.
+            token (int, optional): A meal cache token from `begin_read()`.
+
+        Returns:
+            tuple: The query's result, and the cache token to cache meals it read under: the older of
+            `token` and the copy's, so a meal changed since the copy began is not cached.
+
+        Raises:
+            sqlite3.Error: If the query failed on the primary.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.taken_at <= self.max_staleness:
+            try:
+                result = query(snapshot.conn)
+                if result is not None:
+                    self.replica_reads += 1
+                    return result, None if token is None else min(token, snapshot.cache_token)
+            except sqlite3.Error as e:
+                logger.warning("Read replica query failed, reading from the primary: %s", str(e))
+
+        with get_db_connection() as conn:
+            result = query(conn)
+        self.primary_reads += 1
+        return result, token
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._writes < self.refresh_writes and not self._invalidated and not self._stopping:
+                    self._condition.wait(self.refresh_interval)
+                if self._stopping:
+                    return
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                # Keep serving the previous copy; reads fall back to the primary once it is too stale
+                logger.error("Failed to refresh read replica: %s", str(e))
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the replica's counters.
+
+        Returns:
+            dict: The limits, staleness, refreshes, pending writes and reads per source.
+        """
+        staleness = self.staleness()
+        return {
+            'refresh_interval': self.refresh_interval,
+            'refresh_writes': self.refresh_writes,
+            'max_staleness': self.max_staleness,
+            'staleness': None if staleness is None else round(staleness, 3),
+            'refreshes': self.refreshes,
+            'pending_writes': self._writes,
+            'replica_reads': self.replica_reads,
+            'primary_reads': self.primary_reads
+        }
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the refresh thread and drop the copy, sending reads to the primary.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a refresh in progress. Defaults to no limit.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._snapshot = None
+        logger.info("Read replica stopped.")
+
+
+read_replica: Optional[ReadReplica] = None
+
+
+def get_read_replica() -> Optional[ReadReplica]:
+    """
+    Get the shared replica if replica mode is on.
+
+    Returns:
+        ReadReplica: The replica, or None if every read goes to the primary.
+    """
+    return read_replica
+
+def start_read_replica(refresh_interval: float = READ_REPLICA_REFRESH_INTERVAL,
+                       refresh_writes: int = READ_REPLICA_REFRESH_WRITES,
+                       max_staleness: float = READ_REPLICA_MAX_STALENESS) -> ReadReplica:
+    """
+    Turn replica mode on, taking the first copy and starting the shared replica.
+
+    Args:
+        refresh_interval (float, optional): Seconds between refreshes.
+        refresh_writes (int, optional): The number of writes that triggers an early refresh.
+        max_staleness (float, optional): The age in seconds past which reads go to the primary.
+
+    Returns:
+        ReadReplica: The started replica.
+
+    Raises:
+        sqlite3.Error: If the first copy could not be taken.
+    """
+    global read_replica
+    if read_replica is None:
+        replica = ReadReplica(refresh_interval, refresh_writes, max_staleness)
+        replica.start()
+        read_replica = replica
+    return read_replica
+
+def stop_read_replica() -> None:
+    """
+    Turn replica mode off, sending every read to the primary.
+    """
+    global read_replica
+    replica, read_replica = read_replica, None
+    if replica is not None:
+        replica.stop()
+
+def read_meals(query: Callable[[sqlite3.Connection], T], token: Optional[int] = None) -> tuple[T, Optional[int]]:
+    """
+    Run a read-only query on the replica in replica mode, and on the primary otherwise.
+
+    Args:
+        query (Callable): Runs the query on the connection it is given and returns the result.
+        token (int, optional): A meal cache token from `begin_read()`.
+
+    Returns:
+        tuple: The query's result and the cache token to cache meals it read under.
+    """
+    replica = read_replica
+    if replica is not None:
+        return replica.read(query, token)
+    with get_db_connection() as conn:
+        return query(conn), token
+
+def note_writes(count: int = 1) -> None:
+    """
+    Report writes committed to the primary to the replica, if replica mode is on.
+
+    Args:
+        count (int, optional): The number of writes. Defaults to 1.
+    """
+    replica = read_replica
+    if replica is not None:
+        replica.note_writes(count)
+
+def invalidate_replica() -> None:
+    """
+    Drop the replica's copy after a write a stale copy must never serve, if replica mode is on.
+    """
+    replica = read_replica
+    if replica is not None:
+        replica.invalidate()
@@ -2,6 +2,9 @@ from contextlib import contextmanager
 import logging
 import os
 import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
 
 from meal_max.utils.logger import configure_logger
 
@@ -13,6 +16,20 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/meal_max.db")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))  # Idle connections kept open for reuse
+DB_BUSY_TIMEOUT = float(os.getenv("DB_BUSY_TIMEOUT", 5.0))  # Seconds to wait on a locked database
+DB_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_HEALTH_CHECK_INTERVAL", 30.0))  # Idle seconds before a reused connection is pinged
+
+# Applied to every new connection. WAL lets readers run alongside the writer,
+# and NORMAL sync is durable in WAL mode except against power loss.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,  # Negative values are KiB, so 16 MB of page cache per connection
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
 
 def check_database_connection():
     try:
@@ -37,6 +54,207 @@ def check_table_exists(tablename: str):
         logger.error(error_message)
         raise Exception(error_message) from e
 
+
+class ConnectionPool:
+    """
+    Reusable SQLite connections for one database file.
+
+    A thread borrows a connection for the duration of the outermost
+    `connection()` block and gets the same one back in any nested block, so a
+    model call that runs several statements uses one connection. Returned
+    connections are kept, most recently used first, for the next thread to
+    borrow, which also covers servers that start a new thread per request.
+
+    Attributes:
+        path (str): The database file.
+        size (int): The number of idle connections kept open.
+        created (int): The number of connections opened so far.
+    """
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE, timeout: float = DB_BUSY_TIMEOUT,
+                 health_check_interval: float = DB_HEALTH_CHECK_INTERVAL, pragmas: Optional[dict] = None):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+        self.created = 0
+        self._idle: list[tuple[sqlite3.Connection, float]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a new connection and apply the pragmas.
+
+        Returns:
+            sqlite3.Connection: The new connection.
+        """
+        # Connections move between threads, but only ever serve one at a time
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self.created += 1
+            created = self.created
+        logger.info("Database connection opened (%d so far).", created)
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """
+        Check that a connection can still run a statement.
+
+        Args:
+            conn (sqlite3.Connection): The connection to check.
+
+        Returns:
+            bool: True if the connection is usable.
+        """
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning("Discarding unhealthy database connection: %s", str(e))
+            return False
+
+    def _checkout(self) -> sqlite3.Connection:
+        """
+        Borrow an idle connection, or open one if none is idle and healthy.
+
+        Connections idle for longer than the health check interval are pinged first.
+
+        Returns:
+            sqlite3.Connection: The borrowed connection.
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+        return self._connect()
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        """
+        Return a borrowed connection, closing it if the pool is full.
+
+        Anything left uncommitted is rolled back, as closing the connection would.
+
+        Args:
+            conn (sqlite3.Connection): The connection to return.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning("Discarding database connection that failed to roll back: %s", str(e))
+            self._discard(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        logger.debug("Database connection closed.")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager lending the calling thread its connection.
+
+        Yields:
+            sqlite3.Connection: The thread's connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Nested block: the outer block returns the connection
+            yield conn
+            return
+
+        with self.dedicated_connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+
+    @contextmanager
+    def dedicated_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager lending a connection that is not bound to the calling thread.
+
+        For blocks that can be suspended, such as generators: `connection()`
+        blocks the thread runs while this one is open borrow a connection of
+        their own instead of nesting on this one, so they are still returned
+        (and rolled back) when they end and never share its cursors.
+
+        Yields:
+            sqlite3.Connection: The borrowed connection.
+        """
+        conn = self._checkout()
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.Error:
+            healthy = self._is_healthy(conn)
+            raise
+        finally:
+            if healthy:
+                self._checkin(conn)
+            else:
+                self._discard(conn)
+
+    def close(self) -> None:
+        """
+        Close every idle connection. Borrowed connections are closed when they are returned.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.size = 0
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """
+    Get the connection pool for the current DB_PATH, creating it on first use.
+
+    Returns:
+        ConnectionPool: The shared pool.
+    """
+    global _pool
+    pool = _pool
+    if pool is None or pool.path != DB_PATH:
+        with _pool_lock:
+            if _pool is None or _pool.path != DB_PATH:
+                if _pool is not None:
+                    _pool.close()
+                _pool = ConnectionPool(DB_PATH)
+            pool = _pool
+    return pool
+
+def close_db_connections() -> None:
+    """
+    Close the pooled connections, e.g. before the database file is replaced or the process exits.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
 ###################################################
 #
 # This one yields rather than returns.
@@ -45,14 +263,23 @@ def check_table_exists(tablename: str):
 ###################################################
 @contextmanager
 def get_db_connection():
-    conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
-        yield conn
+        with get_connection_pool().connection() as conn:
+            yield conn
+    except sqlite3.Error as e:
+        logger.error("Database connection error: %s", str(e))
+        raise e
+
+@contextmanager
+def get_dedicated_db_connection():
+    """
+    Borrow a pooled connection that is not shared with the calling thread's other blocks.
+
+    Use it in generators, which can be paused between the statements of other calls.
+    """
+    try:
+        with get_connection_pool().dedicated_connection() as conn:
+            yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
         raise e
-    finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
@@ -0,0 +1,75 @@
+import logging
+import random
+from typing import Iterator
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+CUISINES = ["Italian", "Mexican", "Japanese", "Indian", "French", "Thai", "Chinese",
+            "Greek", "Spanish", "Korean", "Ethiopian", "Lebanese", "Peruvian", "American"]
+DISHES = ["Stew", "Curry", "Noodles", "Tacos", "Salad", "Soup", "Dumplings",
+          "Roast", "Pie", "Skewers", "Rice Bowl", "Flatbread", "Pasta", "Burger"]
+DIFFICULTIES = ["LOW", "MED", "HIGH"]
+DELETED_FRACTION = 0.02
+
+
+def generate_meals(count: int, seed: int = 0) -> Iterator[tuple]:
+    """
+    Generate synthetic meals, the same ones for the same seed.
+
+    Names are unique. Prices span 3.00 to 60.00, cheaper for LOW difficulty.
+    Battle counts are heavy-tailed, so most meals have few battles and a few
+    have thousands, and about a fifth have never battled. Wins are drawn
+    around a per-meal strength, and about 2% of meals are deleted.
+
+    Args:
+        count (int): The number of meals.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Yields:
+        tuple: (meal, cuisine, price, difficulty, battles, wins, deleted) for each meal.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        cuisine = rng.choice(CUISINES)
+        difficulty = rng.choice(DIFFICULTIES)
+        base = {"LOW": 3.0, "MED": 8.0, "HIGH": 15.0}[difficulty]
+        price = round(min(60.0, base + rng.expovariate(1 / 10)), 2)
+        battles = 0 if rng.random() < 0.2 else min(5000, int(rng.paretovariate(1.2)))
+        strength = rng.betavariate(2, 2)
+        wins = sum(rng.random() < strength for _ in range(battles)) if battles <= 50 else round(battles * strength)
+        yield (f"{cuisine} {rng.choice(DISHES)} {i}", cuisine, price, difficulty,
+               battles, wins, rng.random() < DELETED_FRACTION)
+
+def populate_meals(count: int, seed: int = 0, batch_size: int = 10000) -> None:
+    """
+    Insert synthetic meals into the meals table, committing every batch.
+
+    Args:
+        count (int): The number of meals.
+        seed (int, optional): The random seed. Defaults to 0.
+        batch_size (int, optional): The number of meals per transaction. Defaults to 10000.
+
+    Raises:
+        ValueError: If count is negative or batch_size is not positive.
+        sqlite3.Error: If any database error occurs, including a meal name that already exists.
+    """
+    if count < 0:
+        raise ValueError(f"Invalid count: {count}. Must be zero or greater.")
+    if batch_size <= 0:
+        raise ValueError(f"Invalid batch_size: {batch_size}. Must be a positive number.")
+
+    meals = generate_meals(count, seed)
+    with get_db_connection() as conn:
+        for start in range(0, count, batch_size):
+            conn.executemany(
+                "INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins, deleted) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (next(meals) for _ in range(min(batch_size, count - start)))
+            )
+            conn.commit()
+    logger.info("Inserted %d synthetic meals (seed %d)", count, seed)
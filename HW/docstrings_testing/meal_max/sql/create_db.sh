@@ -1,14 +1,11 @@
 #!/bin/bash
 
-# Check if the database file already exists
+# The schema itself is created and upgraded by the app's migrations at startup
 if [ -f "$DB_PATH" ]; then
     echo "Recreating database at $DB_PATH."
-    # Drop and recreate the tables
-    sqlite3 "$DB_PATH" < /app/sql/create_meal_table.sql
-    echo "Database recreated successfully."
+    # Remove the old database so the migrations start from an empty one
+    rm -f "$DB_PATH" "$DB_PATH-wal" "$DB_PATH-shm"
+    echo "Database removed; it will be recreated when the app starts."
 else
-    echo "Creating database at $DB_PATH."
-    # Create the database for the first time
-    sqlite3 "$DB_PATH" < /app/sql/create_meal_table.sql
-    echo "Database created successfully."
-fi
\ No newline at end of file
+    echo "Database at $DB_PATH will be created when the app starts."
+fi
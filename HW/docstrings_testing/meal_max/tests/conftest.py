@@ -0,0 +1,20 @@
+import pytest
+
+from meal_max.utils import sql_utils
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.migrations import migrate
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the connection pool at a fresh, fully migrated database."""
+    path = str(tmp_path / "meal_max.db")
+    monkeypatch.setattr(sql_utils, "DB_PATH", path)
+    migrate()
+    yield path
+    sql_utils.close_db_connections()
+
+@pytest.fixture(autouse=True)
+def clear_meal_cache():
+    """Start every test with an empty meal cache, since meal IDs repeat across test databases."""
+    meal_cache.clear()
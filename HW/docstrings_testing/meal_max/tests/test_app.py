@@ -0,0 +1,101 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from meal_max.models.kitchen_model import create_meal, record_battle
+from meal_max.utils.sql_utils import get_db_connection
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def client(db_path):
+    """A test client for the app, serving the test database."""
+    from app import app
+    return app.test_client()
+
+######################################################
+#
+#    Leaderboard
+#
+######################################################
+
+def test_leaderboard_parameters(client):
+    """Test that integer parameters are applied and empty ones fall back to the defaults."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Sushi", "Japanese", 20.0, "HIGH")
+    record_battle(1, 2)
+
+    response = client.get("/api/leaderboard?limit=1&offset=&min_battles=1")
+    assert response.status_code == 200
+    assert [meal["meal"] for meal in response.get_json()["leaderboard"]] == ["Spaghetti"]
+
+@pytest.mark.parametrize("parameter", ["limit", "offset", "min_battles"])
+def test_leaderboard_non_integer_parameter(client, parameter):
+    """Test that a non-integer parameter is rejected instead of ignored."""
+    response = client.get(f"/api/leaderboard?{parameter}=ten")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == f"{parameter} must be an integer, got 'ten'"
+
+######################################################
+#
+#    Shutdown
+#
+######################################################
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def call(port: int, method: str, path: str, body: dict = None) -> dict:
+    data = None if body is None else json.dumps(body).encode()
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+def test_sigterm_flushes_queued_stats(db_path):
+    """Test that SIGTERM to the server process writes the stats still queued for the background writer."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Sushi", "Japanese", 20.0, "HIGH")
+    port = free_port()
+    env = dict(os.environ, DB_PATH=db_path, PORT=str(port), STAT_WRITE_BEHIND="true",
+               STAT_FLUSH_INTERVAL_MS="600000", READ_REPLICA="false")
+    # Run app.py as a script, as the container does, without the network call for the battle's random number
+    script = ("import runpy; from meal_max.utils import random_utils; random_utils.get_random = lambda: 0.5; "
+              "runpy.run_path('app.py', run_name='__main__')")
+    server = subprocess.Popen([sys.executable, "-c", script], cwd=APP_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                call(port, "GET", "/api/health")
+                break
+            except OSError:
+                assert server.poll() is None and time.monotonic() < deadline, "server did not start"
+                time.sleep(0.1)
+
+        call(port, "POST", "/api/prep-combatant", {"meal": "Spaghetti"})
+        call(port, "POST", "/api/prep-combatant", {"meal": "Sushi"})
+        call(port, "GET", "/api/battle")
+        with get_db_connection() as conn:
+            assert conn.execute("SELECT SUM(battles) FROM meals").fetchone()[0] == 0
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(30) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT battles, wins FROM meals ORDER BY id").fetchall() in ([(1, 1), (1, 0)], [(1, 0), (1, 1)])
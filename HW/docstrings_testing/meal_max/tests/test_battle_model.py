@@ -0,0 +1,72 @@
+import pytest
+
+from meal_max.models.battle_model import BattleModel
+from meal_max.models.kitchen_model import Meal, create_meal, delete_meal, get_meal_stats
+
+
+@pytest.fixture
+def meals(db_path):
+    """Three meals with scores 68.0, 102.0 and 159.0."""
+    create_meal("Spaghetti", "Italian", 10.0, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    create_meal("Sushi", "Japanese", 20.0, "HIGH")
+    return [1, 2, 3]
+
+######################################################
+#
+#    Simulation
+#
+######################################################
+
+def test_simulate_pairs_and_counts(meals):
+    """Test that every pair fights every round and the first listed meal wins by score delta."""
+    results = BattleModel().simulate(meals, rounds=100000, seed=1)
+
+    assert list(results) == [(1, 2), (1, 3), (2, 3)]
+    for wins_1, wins_2 in results.values():
+        assert wins_1 + wins_2 == 100000
+    # Win probabilities for the first meal are 0.34, 0.91 and 0.57
+    assert results[(1, 2)][0] == pytest.approx(34000, rel=0.02)
+    assert results[(1, 3)][0] == pytest.approx(91000, rel=0.02)
+    assert results[(2, 3)][0] == pytest.approx(57000, rel=0.02)
+
+def test_simulate_matches_battle_score(meals):
+    """Test that the vectorized scores agree with get_battle_score."""
+    model = BattleModel()
+    scores = [model.get_battle_score(Meal(1, "Spaghetti", "Italian", 10.0, "MED")),
+              model.get_battle_score(Meal(3, "Sushi", "Japanese", 20.0, "HIGH"))]
+    results = model.simulate([1, 3], rounds=100000, seed=2)
+    assert results[(1, 3)][0] / 100000 == pytest.approx(abs(scores[0] - scores[1]) / 100, abs=0.01)
+
+def test_simulate_seeded(meals):
+    """Test that the same seed gives the same results."""
+    model = BattleModel()
+    assert model.simulate(meals, 1000, seed=7) == model.simulate(meals, 1000, seed=7)
+
+def test_simulate_persist(meals):
+    """Test that persisting adds every simulated battle to the meals' stats."""
+    results = BattleModel().simulate(meals, rounds=50, seed=3, persist=True)
+
+    for meal_id in meals:
+        wins = sum(pair_wins[pair.index(meal_id)] for pair, pair_wins in results.items() if meal_id in pair)
+        assert get_meal_stats(meal_id)["battles"] == 100
+        assert get_meal_stats(meal_id)["wins"] == wins
+
+def test_simulate_not_persisted_by_default(meals):
+    """Test that stats are left unchanged unless asked to persist."""
+    BattleModel().simulate(meals, rounds=50, seed=3)
+    assert get_meal_stats(1)["battles"] == 0
+
+def test_simulate_invalid(meals):
+    """Test errors for invalid simulations."""
+    model = BattleModel()
+    delete_meal(3)
+
+    with pytest.raises(ValueError, match="Invalid rounds: 0"):
+        model.simulate(meals, rounds=0)
+    with pytest.raises(ValueError, match="At least two meals"):
+        model.simulate([1], rounds=10)
+    with pytest.raises(ValueError, match="Each meal can only be listed once"):
+        model.simulate([1, 1], rounds=10)
+    with pytest.raises(ValueError, match=r"Meals not found or deleted: \[3, 99\]"):
+        model.simulate([1, 3, 99], rounds=10)
@@ -0,0 +1,198 @@
+import pytest
+
+from meal_max.models.kitchen_model import (
+    _leaderboard_query,
+    create_meal,
+    delete_meal,
+    Meal,
+    get_leaderboard,
+    get_meal_by_id,
+    get_meal_by_name,
+    get_meals,
+    iter_meals,
+    record_battle,
+    record_battle_stats,
+    update_meal_stats
+)
+from meal_max.utils.sql_utils import get_db_connection
+
+
+def get_stats(meal_id: int) -> tuple:
+    with get_db_connection() as conn:
+        return conn.execute("SELECT battles, wins, deleted FROM meals WHERE id = ?", (meal_id,)).fetchone()
+
+######################################################
+#
+#    Delete
+#
+######################################################
+
+def test_delete_meal(db_path):
+    """Test soft deleting a meal."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    delete_meal(1)
+    assert get_stats(1)[2] == 1
+
+def test_delete_meal_already_deleted(db_path):
+    """Test error when deleting a meal that has already been deleted."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    delete_meal(1)
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        delete_meal(1)
+
+def test_delete_meal_not_found(db_path):
+    """Test error when deleting a meal that does not exist."""
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        delete_meal(99)
+
+######################################################
+#
+#    Reads
+#
+######################################################
+
+def test_get_meal_returns_slotted_meal(db_path):
+    """Test that meals read back are slotted records equal to the ones written."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = get_meal_by_name("Spaghetti")
+
+    assert meal == Meal(id=1, meal="Spaghetti", cuisine="Italian", price=12.5, difficulty="MED")
+    assert get_meal_by_id(1) == meal
+    assert not hasattr(meal, "__dict__")
+
+def test_get_meals(db_path, monkeypatch):
+    """Test fetching meals in bulk, in request order, skipping missing and deleted meals."""
+    monkeypatch.setattr("meal_max.models.kitchen_model.MEAL_IDS_PER_QUERY", 2)
+    for name in ("Spaghetti", "Pizza", "Tacos", "Sushi"):
+        create_meal(name, "Any", 10.0, "MED")
+    delete_meal(2)
+
+    assert [meal.meal for meal in get_meals([4, 99, 2, 1, 3])] == ["Sushi", "Spaghetti", "Tacos"]
+    assert get_meals([]) == []
+
+def test_iter_meals(db_path):
+    """Test streaming every live meal in ID order across several fetches."""
+    for i in range(5):
+        create_meal(f"Meal {i}", "Any", 10.0, "MED")
+    delete_meal(3)
+
+    assert [meal.id for meal in iter_meals(batch_size=2)] == [1, 2, 4, 5]
+    with pytest.raises(ValueError, match="Invalid batch_size: 0"):
+        list(iter_meals(batch_size=0))
+
+def test_paused_iter_meals_keeps_connection_to_itself(db_path):
+    """Test that calls made while iter_meals is paused neither share nor keep its connection."""
+    for i in range(3):
+        create_meal(f"Meal {i}", "Any", 10.0, "MED")
+    meals = iter_meals(batch_size=1)
+    assert next(meals).id == 1
+
+    with get_db_connection() as conn:
+        conn.execute("UPDATE meals SET battles = 5 WHERE id = 1")  # Left uncommitted
+    assert get_stats(1)[0] == 0
+    assert [meal.id for meal in meals] == [2, 3]
+
+######################################################
+#
+#    Battle stats
+#
+######################################################
+
+def test_update_meal_stats(db_path):
+    """Test counting a win and a loss."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    update_meal_stats(1, "win")
+    update_meal_stats(1, "loss")
+    assert get_stats(1)[:2] == (2, 1)
+
+def test_update_meal_stats_errors(db_path):
+    """Test that missing and deleted meals are reported ahead of an invalid result."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        update_meal_stats(99, "win")
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        update_meal_stats(99, "draw")
+    with pytest.raises(ValueError, match="Meal with ID 2 has been deleted"):
+        update_meal_stats(2, "draw")
+    with pytest.raises(ValueError, match="Invalid result: draw. Expected 'win' or 'loss'."):
+        update_meal_stats(1, "draw")
+    assert get_stats(1)[:2] == (0, 0)
+
+def test_record_battle(db_path):
+    """Test that a battle updates the winner and the loser."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    record_battle(1, 2)
+    assert get_stats(1)[:2] == (1, 1)
+    assert get_stats(2)[:2] == (1, 0)
+
+def test_record_battle_is_atomic(db_path):
+    """Test that a battle against a deleted meal leaves the winner's stats unchanged."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal with ID 2 has been deleted"):
+        record_battle(1, 2)
+    assert get_stats(1)[:2] == (0, 0)
+    assert get_meal_by_id(1).meal == "Spaghetti"
+
+def test_record_battle_stats(db_path):
+    """Test adding several meals' stats at once, all or nothing."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    create_meal("Sushi", "Japanese", 20.0, "HIGH")
+    delete_meal(3)
+
+    record_battle_stats([(1, 10, 7), (2, 10, 3)])
+    assert get_stats(1)[:2] == (10, 7)
+    assert get_stats(2)[:2] == (10, 3)
+
+    with pytest.raises(ValueError, match="Meal with ID 3 has been deleted"):
+        record_battle_stats([(1, 5, 5), (3, 5, 0)])
+    with pytest.raises(ValueError, match="Invalid stats for meal 2: 6 wins in 5 battles."):
+        record_battle_stats([(1, 5, 5), (2, 5, 6)])
+    assert get_stats(1)[:2] == (10, 7)
+
+######################################################
+#
+#    Leaderboard
+#
+######################################################
+
+def test_get_leaderboard_top_k(db_path):
+    """Test limiting, paging and filtering the leaderboard."""
+    for name, battles, wins in [("Spaghetti", 4, 3), ("Pizza", 10, 5), ("Tacos", 1, 1), ("Sushi", 0, 0)]:
+        create_meal(name, "Any", 10.0, "MED")
+        with get_db_connection() as conn:
+            conn.execute("UPDATE meals SET battles = ?, wins = ? WHERE meal = ?", (battles, wins, name))
+            conn.commit()
+
+    assert [meal["meal"] for meal in get_leaderboard("wins")] == ["Pizza", "Spaghetti", "Tacos"]
+    assert [meal["meal"] for meal in get_leaderboard("wins", limit=1, offset=1)] == ["Spaghetti"]
+    top = get_leaderboard("win_pct", limit=2, min_battles=2)
+    assert [(meal["meal"], meal["win_pct"]) for meal in top] == [("Spaghetti", 75.0), ("Pizza", 50.0)]
+
+def test_get_leaderboard_invalid_params():
+    """Test error when requesting the leaderboard with invalid parameters."""
+    with pytest.raises(ValueError, match="Invalid sort_by parameter: battles"):
+        get_leaderboard("battles")
+    with pytest.raises(ValueError, match="Invalid limit: 0"):
+        get_leaderboard(limit=0)
+    with pytest.raises(ValueError, match="Invalid offset: -1"):
+        get_leaderboard(offset=-1)
+    with pytest.raises(ValueError, match="Invalid min_battles: 0"):
+        get_leaderboard(min_battles=0)
+
+@pytest.mark.parametrize("sort_by, index", [("wins", "ix_meals_leaderboard_wins"), ("win_pct", "ix_meals_leaderboard_win_pct")])
+def test_leaderboard_uses_index(db_path, sort_by, index):
+    """Test that a top-10 leaderboard is a range scan of the matching covering index, with no sort step."""
+    query, params = _leaderboard_query(sort_by, limit=10, offset=0, min_battles=1)
+    with get_db_connection() as conn:
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    assert any(f"COVERING INDEX {index}" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from meal_max.models.kitchen_model import (
+    Meal,
+    clear_meals,
+    create_meal,
+    delete_meal,
+    get_meal_by_id,
+    get_meal_by_name,
+    record_battle
+)
+from meal_max.utils.meal_cache import MealCache, meal_cache
+
+
+def make_meal(meal_id: int, name: str) -> Meal:
+    return Meal(id=meal_id, meal=name, cuisine="Italian", price=12.5, difficulty="MED")
+
+######################################################
+#
+#    Cache
+#
+######################################################
+
+def test_cache_lru_eviction():
+    """Test that the least recently used meal is evicted under both of its keys."""
+    cache = MealCache(maxsize=2, ttl=60)
+    for meal_id, name in [(1, "Spaghetti"), (2, "Pizza")]:
+        cache.put(make_meal(meal_id, name), cache.begin_read())
+    cache.get_by_id(1)
+    cache.put(make_meal(3, "Tacos"), cache.begin_read())
+
+    assert cache.get_by_id(2) is None
+    assert cache.get_by_name("Pizza") is None
+    assert cache.get_by_name("Spaghetti").id == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_ttl():
+    """Test that meals expire after the TTL."""
+    cache = MealCache(maxsize=10, ttl=0.05)
+    cache.put(make_meal(1, "Spaghetti"), cache.begin_read())
+    assert cache.get_by_id(1) is not None
+    time.sleep(0.06)
+    assert cache.get_by_name("Spaghetti") is None
+    assert cache.stats()["size"] == 0
+
+def test_cache_skips_put_after_invalidation():
+    """Test that a meal read before an invalidation is not cached."""
+    cache = MealCache(maxsize=10, ttl=60)
+    token = cache.begin_read()
+    cache.invalidate(1)
+    cache.put(make_meal(1, "Spaghetti"), token)
+    assert cache.get_by_id(1) is None
+
+def test_cache_stats():
+    """Test the hit and miss counters."""
+    cache = MealCache(maxsize=10, ttl=60)
+    cache.get_by_id(1)
+    cache.put(make_meal(1, "Spaghetti"), cache.begin_read())
+    cache.get_by_id(1)
+    cache.get_by_name("Spaghetti")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.667)
+
+######################################################
+#
+#    Read-through
+#
+######################################################
+
+def test_get_meal_read_through(db_path, mocker):
+    """Test that a meal read by name is then served from the cache by ID and name."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    meal = get_meal_by_name("Spaghetti")
+
+    connection = mocker.patch("meal_max.models.kitchen_model.get_db_connection")
+    assert get_meal_by_id(1) == meal
+    assert get_meal_by_name("Spaghetti") == meal
+    connection.assert_not_called()
+
+def test_delete_meal_invalidates(db_path):
+    """Test that a deleted meal is no longer served from the cache."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    get_meal_by_id(1)
+    delete_meal(1)
+
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+    with pytest.raises(ValueError, match="Meal with name Spaghetti has been deleted"):
+        get_meal_by_name("Spaghetti")
+
+def test_writes_invalidate(db_path):
+    """Test that battles and clearing the meals drop cached meals."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    get_meal_by_id(1)
+    get_meal_by_id(2)
+    record_battle(1, 2)
+    assert meal_cache.stats()["size"] == 0
+
+    get_meal_by_id(1)
+    clear_meals()
+    with pytest.raises(ValueError, match="Meal with ID 1 not found"):
+        get_meal_by_id(1)
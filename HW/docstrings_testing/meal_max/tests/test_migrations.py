@@ -0,0 +1,91 @@
+import sqlite3
+
+import pytest
+
+from meal_max.models.kitchen_model import clear_meals, create_meal, get_leaderboard, update_meal_stats
+from meal_max.utils import sql_utils
+from meal_max.utils.migrations import LATEST_VERSION, MIGRATIONS, get_schema_version, migrate
+from meal_max.utils.sql_utils import get_db_connection
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE meals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meal TEXT NOT NULL UNIQUE,
+        cuisine TEXT NOT NULL,
+        price REAL NOT NULL,
+        difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+        battles INTEGER DEFAULT 0,
+        wins INTEGER DEFAULT 0,
+        deleted BOOLEAN DEFAULT FALSE
+    );
+    INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins) VALUES ('Spaghetti', 'Italian', 12.5, 'MED', 4, 3);
+"""
+
+######################################################
+#
+#    Migrations
+#
+######################################################
+
+def test_migrate_fresh_database(db_path):
+    """Test that a new database is brought to the latest schema with every version recorded."""
+    with get_db_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(meals)")}
+    assert versions == [number for number, _, _ in MIGRATIONS]
+    assert {"ix_meals_leaderboard_wins", "ix_meals_leaderboard_win_pct"} <= indexes
+    assert not {"ix_meals_deleted_wins", "ix_meals_deleted_win_pct"} & indexes
+
+def test_migrate_is_idempotent(db_path):
+    """Test that migrating an up-to-date database changes nothing."""
+    assert migrate() == LATEST_VERSION
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == len(MIGRATIONS)
+
+def test_migrate_legacy_database(tmp_path, monkeypatch):
+    """Test upgrading a database created before migrations, keeping its meals and IDs."""
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+    monkeypatch.setattr(sql_utils, "DB_PATH", path)
+
+    try:
+        assert migrate(target=1) == 1
+        assert migrate() == LATEST_VERSION
+        assert get_leaderboard("win_pct")[0] == {
+            'id': 1, 'meal': 'Spaghetti', 'cuisine': 'Italian', 'price': 12.5,
+            'difficulty': 'MED', 'battles': 4, 'wins': 3, 'win_pct': 75.0
+        }
+        create_meal("Pizza", "Italian", 15.0, "LOW")
+        update_meal_stats(2, "win")
+        assert [meal["id"] for meal in get_leaderboard("win_pct")] == [2, 1]
+    finally:
+        sql_utils.close_db_connections()
+
+def test_failed_migration_rolled_back(db_path, monkeypatch):
+    """Test that a failing migration leaves neither its changes nor its version behind."""
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        conn.execute("SELECT * FROM missing_table")
+
+    monkeypatch.setattr("meal_max.utils.migrations.MIGRATIONS", MIGRATIONS + [(LATEST_VERSION + 1, "broken", broken)])
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(target=LATEST_VERSION + 1)
+
+    with get_db_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+
+def test_clear_meals_restarts_ids(db_path):
+    """Test that clearing meals keeps the schema and restarts IDs at 1."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    clear_meals()
+    create_meal("Tacos", "Mexican", 8.0, "LOW")
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT id, meal FROM meals").fetchall() == [(1, "Tacos")]
+        assert get_schema_version(conn) == LATEST_VERSION
@@ -0,0 +1,183 @@
+import sqlite3
+import time
+
+import pytest
+
+from meal_max.models.kitchen_model import (
+    clear_meals,
+    create_meal,
+    delete_meal,
+    get_leaderboard,
+    get_meal_by_id,
+    get_meal_by_name,
+    record_battle
+)
+from meal_max.utils import sql_utils
+from meal_max.utils.meal_cache import meal_cache
+from meal_max.utils.read_replica import ReadReplica, get_read_replica, start_read_replica, stop_read_replica
+
+
+@pytest.fixture
+def replica(db_path):
+    """Turn replica mode on with a replica that only refreshes when asked to."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    replica = start_read_replica(refresh_interval=3600, refresh_writes=1000, max_staleness=3600)
+    yield replica
+    stop_read_replica()
+
+######################################################
+#
+#    Routing
+#
+######################################################
+
+def test_reads_served_from_replica(replica):
+    """Test that meal lookups and the leaderboard read the copy, not the primary."""
+    record_battle(1, 2)
+    meal_cache.clear()
+
+    assert get_meal_by_id(1).meal == "Spaghetti"
+    assert get_meal_by_name("Pizza").id == 2
+    assert get_leaderboard() == []  # The battle is newer than the copy
+    assert replica.replica_reads == 3
+
+    replica.refresh()
+    assert [meal["id"] for meal in get_leaderboard()] == [1, 2]
+
+def test_missing_meal_read_from_primary(replica):
+    """Test that a meal newer than the copy is found on the primary."""
+    create_meal("Sushi", "Japanese", 20.0, "HIGH")
+
+    assert get_meal_by_name("Sushi").id == 3
+    assert replica.primary_reads == 1
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        get_meal_by_id(99)
+
+def test_stale_replica_falls_back(replica):
+    """Test that reads go to the primary once the copy is older than max_staleness."""
+    record_battle(1, 2)
+    replica.max_staleness = 0.01
+    time.sleep(0.02)
+
+    assert [meal["id"] for meal in get_leaderboard()] == [1, 2]
+    assert replica.primary_reads == 1 and replica.replica_reads == 0
+
+def test_deleted_meal_not_served(replica):
+    """Test that a meal deleted after the copy was taken is never served from the copy."""
+    delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal with ID 2 has been deleted"):
+        get_meal_by_id(2)
+    with pytest.raises(ValueError, match="Meal with name Pizza has been deleted"):
+        get_meal_by_name("Pizza")
+    with pytest.raises(ValueError, match="Meal with ID 2 has been deleted"):
+        record_battle(1, 2)
+
+def test_clear_then_create_not_served_old_meals(replica):
+    """Test that meals re-created under reused IDs after a clear are not served from the old copy."""
+    clear_meals()
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+
+    assert get_meal_by_id(1).meal == "Pizza"
+    spaghetti = get_meal_by_name("Spaghetti")
+    assert spaghetti.id == 2
+    with pytest.raises(ValueError, match="Meal with name Sushi not found"):
+        get_meal_by_name("Sushi")
+
+    record_battle(spaghetti.id, 1)
+    replica.refresh()
+    assert [(meal["meal"], meal["wins"]) for meal in get_leaderboard()] == [("Spaghetti", 1), ("Pizza", 0)]
+
+def test_refresh_started_before_invalidation_discarded(db_path, monkeypatch):
+    """Test that a copy begun before an invalidating write is not served."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    replica = ReadReplica()
+    begin_read = meal_cache.begin_read
+
+    def invalidate_during_refresh():
+        replica.invalidate()
+        return begin_read()
+
+    monkeypatch.setattr(meal_cache, "begin_read", invalidate_during_refresh)
+    replica.refresh()
+    assert replica.staleness() is None and replica.refreshes == 0
+
+    monkeypatch.setattr(meal_cache, "begin_read", begin_read)
+
+    replica.refresh()
+    assert replica.refreshes == 1
+
+def test_failed_query_falls_back(db_path):
+    """Test that a query that fails on the copy is retried on the primary."""
+    replica = ReadReplica()
+    replica.refresh()
+    replica._snapshot.conn.execute("DROP TABLE meals")
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+
+    row, _ = replica.read(lambda conn: conn.execute("SELECT meal FROM meals").fetchone())
+    assert row == ("Spaghetti",)
+    assert replica.primary_reads == 1
+
+def test_stale_meal_not_cached(replica):
+    """Test that a meal read from a copy taken before it changed is not cached."""
+    record_battle(1, 2)  # Invalidates both meals after the copy was taken
+    get_meal_by_id(1)
+    assert meal_cache.get_by_id(1) is None
+
+    replica.refresh()
+    get_meal_by_id(1)
+    assert meal_cache.get_by_id(1) is not None
+
+######################################################
+#
+#    Refresh
+#
+######################################################
+
+def test_refresh_after_writes(db_path):
+    """Test that enough writes refresh the copy without waiting for the interval."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    replica = start_read_replica(refresh_interval=3600, refresh_writes=4, max_staleness=3600)
+    try:
+        record_battle(1, 2)
+        record_battle(1, 2)
+        deadline = time.monotonic() + 5
+        while replica.refreshes < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert replica.refreshes == 2
+        assert get_leaderboard()[0]["wins"] == 2
+    finally:
+        stop_read_replica()
+
+def test_refresh_on_interval(db_path):
+    """Test that the copy is refreshed on its interval."""
+    replica = start_read_replica(refresh_interval=0.01, refresh_writes=1000, max_staleness=3600)
+    try:
+        time.sleep(0.2)
+        assert replica.refreshes > 2
+        assert replica.staleness() < 0.2
+    finally:
+        stop_read_replica()
+
+def test_stop_sends_reads_to_primary(replica):
+    """Test that stopping the replica turns replica mode off."""
+    stop_read_replica()
+    assert get_read_replica() is None
+    assert replica.staleness() is None
+
+    delete_meal(1)
+    with pytest.raises(ValueError, match="Meal with ID 1 has been deleted"):
+        get_meal_by_id(1)
+
+def test_start_fails_without_database(tmp_path, monkeypatch):
+    """Test that replica mode is left off when the first copy fails."""
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "missing" / "meal_max.db"))
+
+    with pytest.raises(sqlite3.Error):
+        start_read_replica()
+    assert get_read_replica() is None
+    sql_utils.close_db_connections()
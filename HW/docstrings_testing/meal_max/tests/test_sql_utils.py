@@ -0,0 +1,86 @@
+import threading
+
+from meal_max.models.kitchen_model import create_meal, get_meal_by_id, update_meal_stats
+from meal_max.utils import sql_utils
+from meal_max.utils.sql_utils import ConnectionPool, get_connection_pool, get_db_connection
+
+######################################################
+#
+#    Connection pool
+#
+######################################################
+
+def test_connection_reused_across_calls(db_path):
+    """Test that consecutive model calls share one pooled connection."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    get_meal_by_id(1)
+    update_meal_stats(1, "win")
+
+    assert get_connection_pool().created == 1
+
+def test_pragmas_applied(db_path):
+    """Test that pooled connections use WAL mode and the configured pragmas."""
+    with get_db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+def test_nested_blocks_share_connection(db_path):
+    """Test that a nested block in the same thread gets the outer block's connection."""
+    with get_db_connection() as outer:
+        with get_db_connection() as inner:
+            assert inner is outer
+
+def test_dedicated_connection_not_shared(db_path):
+    """Test that blocks opened inside a dedicated connection's block borrow a connection of their own."""
+    with get_connection_pool().dedicated_connection() as dedicated:
+        with get_db_connection() as conn:
+            assert conn is not dedicated
+    assert get_connection_pool().created == 2
+
+def test_uncommitted_changes_rolled_back(db_path):
+    """Test that a connection is returned without the previous borrower's uncommitted writes."""
+    with get_db_connection() as conn:
+        conn.execute("INSERT INTO meals (meal, cuisine, price, difficulty) VALUES ('Pizza', 'Italian', 15.0, 'LOW')")
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0] == 0
+
+def test_threads_get_own_connections(db_path):
+    """Test that threads holding a connection at the same time never share it."""
+    barrier = threading.Barrier(3)
+    seen = []
+
+    def borrow():
+        with get_db_connection() as conn:
+            seen.append(conn)
+            barrier.wait(timeout=5)
+
+    threads = [threading.Thread(target=borrow) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(conn) for conn in seen}) == 3
+    assert get_connection_pool().created == 3
+
+def test_unhealthy_connection_replaced(db_path):
+    """Test that an idle connection failing its health check is replaced."""
+    pool = ConnectionPool(db_path, health_check_interval=0)
+    with pool.connection() as conn:
+        first = conn
+    first.close()
+
+    with pool.connection() as conn:
+        assert conn is not first
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert pool.created == 2
+
+def test_pool_follows_db_path(db_path, tmp_path, monkeypatch):
+    """Test that changing DB_PATH replaces the pool."""
+    pool = get_connection_pool()
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "other.db"))
+
+    assert get_connection_pool() is not pool
+    assert get_connection_pool().path == str(tmp_path / "other.db")
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from meal_max.models.kitchen_model import (
+    create_meal,
+    delete_meal,
+    get_meal_stats,
+    record_battle,
+    update_meal_stats
+)
+from meal_max.models.stat_writer import StatWriter, get_stat_writer, start_stat_writer, stop_stat_writer
+from meal_max.utils.sql_utils import get_db_connection
+
+
+def persisted_stats(meal_id: int) -> tuple:
+    with get_db_connection() as conn:
+        return conn.execute("SELECT battles, wins FROM meals WHERE id = ?", (meal_id,)).fetchone()
+
+@pytest.fixture
+def write_behind(db_path):
+    """Switch stat updates to a writer that only writes when stopped or full."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    writer = start_stat_writer(interval_ms=60000, max_items=1000)
+    yield writer
+    stop_stat_writer()
+
+######################################################
+#
+#    Write-behind
+#
+######################################################
+
+def test_updates_queued_and_merged(write_behind):
+    """Test that queued updates are not yet written but are included in the stats."""
+    record_battle(1, 2)
+    record_battle(1, 2)
+    update_meal_stats(2, "win")
+
+    assert persisted_stats(1) == (0, 0)
+    assert get_meal_stats(1) == {'id': 1, 'battles': 2, 'wins': 2, 'win_pct': 100.0}
+    assert get_meal_stats(2) == {'id': 2, 'battles': 3, 'wins': 1, 'win_pct': 33.3}
+
+def test_stop_flushes(write_behind):
+    """Test that stopping the writer writes every queued update in one batch."""
+    record_battle(1, 2)
+    update_meal_stats(1, "loss")
+    stop_stat_writer()
+
+    assert get_stat_writer() is None
+    assert write_behind.batches == 1
+    assert persisted_stats(1) == (2, 1)
+    assert persisted_stats(2) == (1, 0)
+    assert get_meal_stats(1)["battles"] == 2
+
+def test_batch_written_at_max_items(db_path):
+    """Test that a batch is written as soon as enough updates are queued."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    create_meal("Pizza", "Italian", 15.0, "LOW")
+    writer = StatWriter(interval_ms=60000, max_items=4)
+    written = threading.Event()
+    write = writer._write
+    writer._write = lambda batch: (write(batch), written.set())
+    writer.start()
+    try:
+        writer.enqueue((1, 1, 1), (2, 1, 0))
+        writer.enqueue((1, 1, 0), (2, 1, 1))
+        assert written.wait(5)
+        assert persisted_stats(1) == (2, 1)
+        assert writer.pending(1) == (0, 0)
+    finally:
+        writer.stop()
+
+def test_errors_match_synchronous_updates(write_behind):
+    """Test that queued updates fail the same way synchronous ones do, queuing nothing."""
+    delete_meal(2)
+
+    with pytest.raises(ValueError, match="Meal with ID 2 has been deleted"):
+        record_battle(1, 2)
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        update_meal_stats(99, "win")
+    with pytest.raises(ValueError, match="Invalid result: draw. Expected 'win' or 'loss'."):
+        update_meal_stats(1, "draw")
+    assert write_behind.pending(1) == (0, 0)
+
+def test_get_meal_stats_synchronous(db_path):
+    """Test reading stats when updates are written synchronously."""
+    create_meal("Spaghetti", "Italian", 12.5, "MED")
+    update_meal_stats(1, "win")
+    assert get_meal_stats(1) == {'id': 1, 'battles': 1, 'wins': 1, 'win_pct': 100.0}
+    with pytest.raises(ValueError, match="Meal with ID 99 not found"):
+        get_meal_stats(99)
@@ -0,0 +1,40 @@
+import pytest
+
+from meal_max.models.kitchen_model import get_leaderboard, iter_meals
+from meal_max.utils.sql_utils import get_db_connection
+from meal_max.utils.synthetic_data import CUISINES, generate_meals, populate_meals
+
+
+def test_generate_meals_deterministic():
+    """Test that the same seed generates the same meals and a different seed does not."""
+    assert list(generate_meals(100, seed=7)) == list(generate_meals(100, seed=7))
+    assert list(generate_meals(100, seed=7)) != list(generate_meals(100, seed=8))
+
+def test_generate_meals_valid():
+    """Test that generated meals satisfy the table's constraints and cover the catalog."""
+    meals = list(generate_meals(2000))
+
+    assert len({meal[0] for meal in meals}) == 2000
+    assert {meal[1] for meal in meals} == set(CUISINES)
+    assert {meal[3] for meal in meals} == {"LOW", "MED", "HIGH"}
+    assert all(3.0 <= meal[2] <= 60.0 for meal in meals)
+    assert all(0 <= meal[5] <= meal[4] for meal in meals)
+    assert any(meal[4] == 0 for meal in meals) and any(meal[4] > 100 for meal in meals)
+    assert any(meal[6] for meal in meals)
+
+def test_populate_meals(db_path):
+    """Test that populated meals can be read back through the model."""
+    populate_meals(500, seed=3, batch_size=128)
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0] == 500
+    live = sum(1 for _ in iter_meals())
+    assert live == sum(1 for meal in generate_meals(500, seed=3) if not meal[6])
+    assert len(get_leaderboard("wins", limit=10)) == 10
+
+def test_populate_meals_invalid_args():
+    """Test error when populating with an invalid count or batch size."""
+    with pytest.raises(ValueError, match="Invalid count: -1"):
+        populate_meals(-1)
+    with pytest.raises(ValueError, match="Invalid batch_size: 0"):
+        populate_meals(10, batch_size=0)